@@ -1,5 +1,6 @@
 import requests
 
+from api.utils import http_session
 from api.utils.endpoints import (
     DEBT_POSITIONS_DELETE_URL,
     DEBT_POSITIONS_DELETE_URL_DEV,
@@ -31,7 +32,7 @@ def create_debt_position(
     else:
         url = DEBT_POSITIONS_URL
 
-    return requests.post(
+    return http_session.post(
         url=url.format(organizationId=organization_id),
         headers={
             "ocp-apim-subscription-key": subscription_key,
@@ -65,7 +66,7 @@ def delete_debt_position(
 
     headers = {"ocp-apim-subscription-key": subscription_key, **APPLICATION_JSON_HEADER}
 
-    return requests.delete(url, headers=headers, timeout=HTTP_TIMEOUT)
+    return http_session.delete(url, headers=headers, timeout=HTTP_TIMEOUT)
 
 
 def update_debt_position(
@@ -91,7 +92,7 @@ def update_debt_position(
         url = DEBT_POSITIONS_UPDATE_URL.format(organizationId=organization_id, iupd=iupd)
     headers = {"ocp-apim-subscription-key": subscription_key, **APPLICATION_JSON_HEADER}
 
-    return requests.put(url, headers=headers, json=payload, timeout=HTTP_TIMEOUT, params={"toPublish": to_publish})
+    return http_session.put(url, headers=headers, json=payload, timeout=HTTP_TIMEOUT, params={"toPublish": to_publish})
 
 
 def get_debt_position(
@@ -115,7 +116,7 @@ def get_debt_position(
 
     url = base_url.format(organizationId=organization_id) + f"/{iupd}"
 
-    return requests.get(
+    return http_session.get(
         url=url,
         headers={
             "ocp-apim-subscription-key": subscription_key,
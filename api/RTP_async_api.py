@@ -0,0 +1,104 @@
+"""
+Asyncio counterparts of the main RTP lifecycle clients.
+
+Each coroutine keeps the signature of its synchronous twin and builds the request with the same
+helper, so Version, RequestId and Idempotency-Key headers are identical. Many calls can be kept
+in flight from a single process, e.g. with ``asyncio.gather``; call
+``api.utils.async_http_session.aclose()`` before the event loop shuts down.
+
+Functions:
+    - send_rtp / send_rtp_v2: Post an RTP request (Version v1 / v2).
+    - send_gpd_message: Send an RTP message to the GPD sender service.
+    - get_rtp / get_rtp_by_notice_number: Fetch an RTP by id or by notice number.
+    - cancel_rtp / cancel_rtp_v2: Cancel an RTP request (Version v1 / v2).
+    - activate: Activate a debtor to receive RTP.
+    - srtp_callback / srtp_rfc_callback: Send an RTP or RFC callback over mTLS.
+"""
+
+import httpx
+
+from api.debtor_activation_api import build_activation_request
+from api.RTP_callback_api import build_callback_request, build_rfc_callback_request
+from api.RTP_cancel_api import build_cancel_request
+from api.RTP_get_api import build_get_rtp_by_notice_number_request, build_get_rtp_request
+from api.RTP_process_sender import build_gpd_message_request
+from api.RTP_send_api import build_send_rtp_request
+from api.utils import async_http_session
+from api.utils.api_version import CANCEL_VERSION
+from api.utils.http_utils import HTTP_TIMEOUT
+
+
+async def send_rtp(access_token: str, rtp_payload: dict) -> httpx.Response:
+    """Async API to post a rtp request (Version: v1)."""
+    return await async_http_session.post(
+        **build_send_rtp_request(access_token, rtp_payload, "v1"), timeout=HTTP_TIMEOUT
+    )
+
+
+async def send_rtp_v2(access_token: str, rtp_payload: dict) -> httpx.Response:
+    """Async API to post a rtp request (Version: v2)."""
+    return await async_http_session.post(
+        **build_send_rtp_request(access_token, rtp_payload, "v2"), timeout=HTTP_TIMEOUT
+    )
+
+
+async def send_gpd_message(access_token: str, message_payload: dict) -> httpx.Response:
+    """Async API to send an RTP message to the GPD sender service."""
+    return await async_http_session.post(
+        **build_gpd_message_request(access_token, message_payload), timeout=HTTP_TIMEOUT
+    )
+
+
+async def get_rtp(access_token: str, rtp_id: str) -> httpx.Response:
+    """Async API to retrieve an RTP resource by its unique RTP identifier."""
+    return await async_http_session.get(**build_get_rtp_request(access_token, rtp_id), timeout=HTTP_TIMEOUT)
+
+
+async def get_rtp_by_notice_number(access_token: str, notice_number: str) -> httpx.Response:
+    """Async API to retrieve an RTP resource by its notice number."""
+    return await async_http_session.get(
+        **build_get_rtp_by_notice_number_request(access_token, notice_number), timeout=HTTP_TIMEOUT
+    )
+
+
+async def cancel_rtp(access_token: str, resource_id: str, reason: str) -> httpx.Response:
+    """Async API to cancel an RTP request (Version: v1)."""
+    return await async_http_session.post(
+        **build_cancel_request(access_token, resource_id, reason, CANCEL_VERSION), timeout=HTTP_TIMEOUT
+    )
+
+
+async def cancel_rtp_v2(access_token: str, resource_id: str, reason: str) -> httpx.Response:
+    """Async API to cancel an RTP request (Version: v2)."""
+    return await async_http_session.post(
+        **build_cancel_request(access_token, resource_id, reason, "v2"), timeout=HTTP_TIMEOUT
+    )
+
+
+async def activate(access_token: str, payer_fiscal_code: str, service_provider_id: str) -> httpx.Response:
+    """Async API to activate a debtor to receive RTP."""
+    return await async_http_session.post(
+        **build_activation_request(access_token, payer_fiscal_code, service_provider_id), timeout=HTTP_TIMEOUT
+    )
+
+
+async def srtp_callback(
+    cert_path: str, key_path: str, rtp_payload, include_version_header: bool = False
+) -> httpx.Response:
+    """Async API to send an RTP callback over mTLS."""
+    return await async_http_session.post(
+        cert=(cert_path, key_path),
+        **build_callback_request(rtp_payload, include_version_header),
+        timeout=HTTP_TIMEOUT,
+    )
+
+
+async def srtp_rfc_callback(
+    cert_path: str, key_path: str, rtp_payload, include_version_header: bool = False
+) -> httpx.Response:
+    """Async API to send an RFC (DS12P / DS12N) callback over mTLS."""
+    return await async_http_session.post(
+        cert=(cert_path, key_path),
+        **build_rfc_callback_request(rtp_payload, include_version_header),
+        timeout=HTTP_TIMEOUT,
+    )
@@ -1,17 +1,39 @@
-import requests
-
+from api.utils import http_session
 from api.utils.api_version import CALLBACK_VERSION, RFC_CALLBACK_VERSION
 from api.utils.endpoints import CALLBACK_URL, RFC_CALLBACK_URL
 from api.utils.http_utils import HTTP_TIMEOUT
 
 
+def _callback_request(url: str, version: str, rtp_payload, include_version_header: bool) -> dict:
+    headers = {"Version": version} if include_version_header else {}
+    if isinstance(rtp_payload, str | bytes):
+        # Already serialized, e.g. by utils.callback_factory: sent as-is
+        headers["Content-Type"] = "application/json"
+        body = rtp_payload.encode() if isinstance(rtp_payload, str) else rtp_payload
+        return {"url": url, "headers": headers, "data": body}
+    return {"url": url, "headers": headers, "json": rtp_payload}
+
+
+def build_callback_request(rtp_payload, include_version_header: bool = False) -> dict:
+    """Build the url, headers and body of an RTP callback, shared by the sync and async clients.
+
+    `rtp_payload` is a JSON object, or its serialized text (str or bytes) to be posted unchanged.
+    """
+    return _callback_request(CALLBACK_URL, CALLBACK_VERSION, rtp_payload, include_version_header)
+
+
+def build_rfc_callback_request(rtp_payload, include_version_header: bool = False) -> dict:
+    """Build the url, headers and body of an RFC callback, shared by the sync and async clients.
+
+    `rtp_payload` is a JSON object, or its serialized text (str or bytes) to be posted unchanged.
+    """
+    return _callback_request(RFC_CALLBACK_URL, RFC_CALLBACK_VERSION, rtp_payload, include_version_header)
+
+
 def srtp_callback(cert_path: str, key_path: str, rtp_payload, include_version_header: bool = False):
-    headers = {"Version": CALLBACK_VERSION} if include_version_header else {}
-    return requests.post(
+    return http_session.post(
         cert=(cert_path, key_path),
-        url=CALLBACK_URL,
-        headers=headers,
-        json=rtp_payload,
+        **build_callback_request(rtp_payload, include_version_header),
         timeout=HTTP_TIMEOUT,
     )
 
@@ -26,17 +48,14 @@ def srtp_rfc_callback(cert_path: str, key_path: str, rtp_payload, include_versio
     Args:
         cert_path: Path to the certificate file
         key_path: Path to the key file
-        rtp_payload: The RFC callback payload (DS12P or DS12N)
+        rtp_payload: The RFC callback payload (DS12P or DS12N), as a dict or serialized JSON
         include_version_header: When True, adds the Version header to the request
 
     Returns:
         Response object from the callback request
     """
-    headers = {"Version": RFC_CALLBACK_VERSION} if include_version_header else {}
-    return requests.post(
+    return http_session.post(
         cert=(cert_path, key_path),
-        url=RFC_CALLBACK_URL,
-        headers=headers,
-        json=rtp_payload,
+        **build_rfc_callback_request(rtp_payload, include_version_header),
         timeout=HTTP_TIMEOUT,
     )
@@ -2,22 +2,23 @@ import uuid
 
 import requests
 
+from api.utils import http_session
 from api.utils.api_version import CANCEL_VERSION
 from api.utils.endpoints import CANCEL_RTP_OPERATION, CANCEL_RTP_URL
 from api.utils.http_utils import HTTP_TIMEOUT
 from utils.idempotency_key_utils import generate_idempotency_key
 
 
-def _post_cancel(access_token: str, resource_id: str, reason: str, version: str) -> requests.Response:
+def build_cancel_request(access_token: str, resource_id: str, reason: str, version: str) -> dict:
     """
-    Internal helper: send the cancellation POST request for a given RTP resource and API version.
+    Build the url, headers and body of the cancellation POST, shared by the sync and async clients.
 
     :param access_token: Bearer access token for authorization.
     :param resource_id: UUID of the RTP resource to cancel.
     :param reason: Cancellation reason. Must be one of: PAID, MODT.
     :param version: API version to target (e.g. "v1", "v2"), sent as the Version header.
-    :returns: The HTTP response.
-    :rtype: requests.Response
+    :returns: Keyword arguments for the HTTP client (url, headers, json).
+    :rtype: dict
     """
     idempotency_key = generate_idempotency_key(CANCEL_RTP_OPERATION, resource_id)
 
@@ -33,7 +34,17 @@ def _post_cancel(access_token: str, resource_id: str, reason: str, version: str)
         "reason": reason,
     }
 
-    return requests.post(headers=headers, url=CANCEL_RTP_URL, json=body, timeout=HTTP_TIMEOUT)
+    return {"url": CANCEL_RTP_URL, "headers": headers, "json": body}
+
+
+def _post_cancel(access_token: str, resource_id: str, reason: str, version: str) -> requests.Response:
+    """
+    Internal helper: send the cancellation POST request for a given RTP resource and API version.
+
+    :returns: The HTTP response.
+    :rtype: requests.Response
+    """
+    return http_session.post(**build_cancel_request(access_token, resource_id, reason, version), timeout=HTTP_TIMEOUT)
 
 
 def cancel_rtp(access_token: str, resource_id: str, reason: str) -> requests.Response:
@@ -11,46 +11,48 @@ Functions:
 
 import uuid
 
-import requests
-
+from api.utils import http_session
 from api.utils.api_version import GET_RTP_VERSION
 from api.utils.endpoints import GET_RTP_BY_NOTICE_NUMBER_URL, GET_RTP_DELIVERY_STATUS_URL, GET_RTP_URL
 from api.utils.http_utils import APPLICATION_JSON_HEADER, HTTP_TIMEOUT
 
 
-def get_rtp(access_token: str, rtp_id: str):
+def _get_rtp_headers(access_token: str) -> dict:
+    return {
+        "Authorization": access_token,
+        "Version": GET_RTP_VERSION,
+        "RequestId": str(uuid.uuid4()),
+        **APPLICATION_JSON_HEADER,
+    }
+
+
+def build_get_rtp_request(access_token: str, rtp_id: str) -> dict:
     """
-    Retrieve an RTP resource by its unique RTP identifier.
+    Build the url and headers of a get RTP call, shared by the sync and async clients.
 
     Args:
         access_token (str): The bearer token used for authentication.
         rtp_id (str): The identifier of the RTP resource to fetch.
 
     Returns:
-        requests.Response: The HTTP response object returned by the API.
+        dict: Keyword arguments for the HTTP client (url, headers).
     """
-    url = GET_RTP_URL.format(rtpId=rtp_id)
-    headers = {
-        "Authorization": access_token,
-        "Version": GET_RTP_VERSION,
-        "RequestId": str(uuid.uuid4()),
-        **APPLICATION_JSON_HEADER,
-    }
-
-    resp = requests.get(url=url, headers=headers, timeout=HTTP_TIMEOUT)
-    return resp
+    return {"url": GET_RTP_URL.format(rtpId=rtp_id), "headers": _get_rtp_headers(access_token)}
 
 
-def get_rtp_by_notice_number(access_token: str, notice_number: str):
+def build_get_rtp_by_notice_number_request(access_token: str, notice_number: str) -> dict:
     """
-    Retrieve an RTP resource by its notice number.
+    Build the url, query and headers of a get RTP by notice number call, shared by the sync and async clients.
 
     Args:
         access_token (str): The bearer token used for authentication.
         notice_number (str): The notice number associated with the RTP resource.
 
     Returns:
-        requests.Response: The HTTP response object returned by the API.
+        dict: Keyword arguments for the HTTP client (url, params, headers).
+
+    Raises:
+        ValueError: If access_token or notice_number is empty.
     """
     if not access_token:
         raise ValueError("access_token cannot be None")
@@ -58,18 +60,41 @@ def get_rtp_by_notice_number(access_token: str, notice_number: str):
     if not notice_number:
         raise ValueError("notice_number cannot be None")
 
-    params = {"noticeNumber": notice_number}
-    headers = {
-        "Authorization": access_token,
-        "Version": GET_RTP_VERSION,
-        "RequestId": str(uuid.uuid4()),
-        **APPLICATION_JSON_HEADER,
+    return {
+        "url": GET_RTP_BY_NOTICE_NUMBER_URL,
+        "params": {"noticeNumber": notice_number},
+        "headers": _get_rtp_headers(access_token),
     }
 
-    resp = requests.get(
-        url=GET_RTP_BY_NOTICE_NUMBER_URL,
-        params=params,
-        headers=headers,
+
+def get_rtp(access_token: str, rtp_id: str):
+    """
+    Retrieve an RTP resource by its unique RTP identifier.
+
+    Args:
+        access_token (str): The bearer token used for authentication.
+        rtp_id (str): The identifier of the RTP resource to fetch.
+
+    Returns:
+        requests.Response: The HTTP response object returned by the API.
+    """
+    resp = http_session.get(**build_get_rtp_request(access_token, rtp_id), timeout=HTTP_TIMEOUT)
+    return resp
+
+
+def get_rtp_by_notice_number(access_token: str, notice_number: str):
+    """
+    Retrieve an RTP resource by its notice number.
+
+    Args:
+        access_token (str): The bearer token used for authentication.
+        notice_number (str): The notice number associated with the RTP resource.
+
+    Returns:
+        requests.Response: The HTTP response object returned by the API.
+    """
+    resp = http_session.get(
+        **build_get_rtp_by_notice_number_request(access_token, notice_number),
         timeout=HTTP_TIMEOUT,
     )
     return resp
@@ -94,18 +119,13 @@ def get_rtp_delivery_status(access_token: str, notice_number: str, payee_id: str
     Returns:
         requests.Response: The HTTP response object returned by the API.
     """
-    headers = {
-        "Authorization": access_token,
-        "Version": GET_RTP_VERSION,
-        "RequestId": str(uuid.uuid4()),
-        **APPLICATION_JSON_HEADER,
-    }
+    headers = _get_rtp_headers(access_token)
     params = {
         "noticeNumber": notice_number,
         "payeeId": payee_id,
     }
 
-    resp = requests.get(
+    resp = http_session.get(
         url=GET_RTP_DELIVERY_STATUS_URL,
         params=params,
         headers=headers,
@@ -1,5 +1,4 @@
-import requests
-
+from api.utils import http_session
 from api.utils.endpoints import LANDING_PAGE_URL
 from api.utils.http_utils import HTTP_TIMEOUT
 
@@ -9,4 +8,4 @@ def landing_page():
     :returns: the response of the call.
     :rtype: requests.Response
     """
-    return requests.get(url=LANDING_PAGE_URL, timeout=HTTP_TIMEOUT)
+    return http_session.get(url=LANDING_PAGE_URL, timeout=HTTP_TIMEOUT)
@@ -1,22 +1,20 @@
 import uuid
 
-import requests
-
+from api.utils import http_session
 from api.utils.api_version import SEND_GPD_MESSAGE_VERSION
 from api.utils.endpoints import RTP_SENDER_GPD_MESSAGE_URL
 from api.utils.http_utils import HTTP_TIMEOUT
 from utils.idempotency_key_utils import generate_idempotency_key
 
 
-def send_gpd_message(access_token: str, message_payload: dict):
-    """Send an RTP message to the GPD sender service.
+def build_gpd_message_request(access_token: str, message_payload: dict) -> dict:
+    """Build the url, headers and body of a GPD message call, shared by the sync and async clients.
 
     :param access_token: Bearer token for RTP Consumer client
     :param message_payload: RTP message payload (CREATE/UPDATE/DELETE operation)
-    :returns: The response of the call
-    :rtype: requests.Response
+    :returns: Keyword arguments for the HTTP client (url, headers, json)
+    :rtype: dict
     """
-
     msg_id = str(message_payload.get("id", ""))
     resource_uuid = str(uuid.uuid5(uuid.NAMESPACE_OID, msg_id))
 
@@ -31,4 +29,15 @@ def send_gpd_message(access_token: str, message_payload: dict):
         "Idempotency-Key": idempotency_key,
     }
 
-    return requests.post(headers=headers, url=RTP_SENDER_GPD_MESSAGE_URL, json=message_payload, timeout=HTTP_TIMEOUT)
+    return {"url": RTP_SENDER_GPD_MESSAGE_URL, "headers": headers, "json": message_payload}
+
+
+def send_gpd_message(access_token: str, message_payload: dict):
+    """Send an RTP message to the GPD sender service.
+
+    :param access_token: Bearer token for RTP Consumer client
+    :param message_payload: RTP message payload (CREATE/UPDATE/DELETE operation)
+    :returns: The response of the call
+    :rtype: requests.Response
+    """
+    return http_session.post(**build_gpd_message_request(access_token, message_payload), timeout=HTTP_TIMEOUT)
@@ -1,16 +1,21 @@
 import requests
 
+from api.utils import http_session
 from api.utils.endpoints import SEND_RTP_URL, SERVICE_PROVIDER_MOCK_URL
 from api.utils.http_utils import HTTP_TIMEOUT
 
 
+def build_send_rtp_request(access_token: str, rtp_payload: dict, version: str) -> dict:
+    """Build the url, headers and body of a send RTP call, shared by the sync and async clients."""
+    return {
+        "url": SEND_RTP_URL,
+        "headers": {"Authorization": f"{access_token}", "Version": version},
+        "json": rtp_payload,
+    }
+
+
 def _post_rtp(access_token: str, rtp_payload: dict, version: str) -> requests.Response:
-    return requests.post(
-        headers={"Authorization": f"{access_token}", "Version": version},
-        url=SEND_RTP_URL,
-        json=rtp_payload,
-        timeout=HTTP_TIMEOUT,
-    )
+    return http_session.post(**build_send_rtp_request(access_token, rtp_payload, version), timeout=HTTP_TIMEOUT)
 
 
 def send_rtp(access_token: str, rtp_payload: dict) -> requests.Response:
@@ -30,4 +35,4 @@ def send_rtp_v2(access_token: str, rtp_payload: dict) -> requests.Response:
 
 
 def send_rtp_to_mock(rtp_payload):
-    return requests.post(url=SERVICE_PROVIDER_MOCK_URL, json=rtp_payload, timeout=HTTP_TIMEOUT)
+    return http_session.post(url=SERVICE_PROVIDER_MOCK_URL, json=rtp_payload, timeout=HTTP_TIMEOUT)
@@ -1,17 +1,70 @@
-import requests
+import getpass
+import re
+import tempfile
+from pathlib import Path
 
+from api.utils import http_session
 from api.utils.endpoints import CBI_AUTH_URL, KC_AUTH_URL, POSTE_AUTH_URL
+from config.configuration import config
+from utils.token_broker import TokenBroker
+from utils.token_cache import DEFAULT_EXPIRES_IN_S, TokenCache, TokenFetcher, TokenKey, secret_fingerprint
+
+KEYCLOAK_REALM = re.search(r"/realms/([^/]+)/", KC_AUTH_URL).group(1)
+POSTE_SCOPE = "fd1d2688-49fe-40f8-9238-4aec86c48eef/.default"
+
+token_cache = TokenCache(
+    refresh_margin_s=config.get("token_refresh_margin_sec", 60),
+    enabled=config.get("token_cache_enabled", True),
+)
+token_broker = TokenBroker(
+    directory=Path(config.get("token_broker_dir") or Path(tempfile.gettempdir()) / f"rtp-tokens-{getpass.getuser()}"),
+    refresh_margin_s=config.get("token_refresh_margin_sec", 60),
+    enabled=config.get("token_broker_enabled", True),
+)
+
+
+def _response_token_fetcher(token_request) -> TokenFetcher:
+    def fetch() -> tuple[str, float]:
+        token_response = token_request()
+        token_response.raise_for_status()
+        body = token_response.json()
+        return body["access_token"], body.get("expires_in", DEFAULT_EXPIRES_IN_S)
+
+    return fetch
+
+
+def _brokered_token(key: TokenKey, fingerprint: str, fetch: TokenFetcher) -> str:
+    """Serve a token from the in-process cache, falling back to the cross-process broker, then to `fetch`."""
+    return token_cache.get(key, fingerprint, token_broker.fetcher(key, fingerprint, fetch))
+
+
+def _client_credentials_token(client_id: str, client_secret: str, access_token_function):
+    fetch = _response_token_fetcher(lambda: access_token_function(client_id=client_id, client_secret=client_secret))
+    realm = KEYCLOAK_REALM if access_token_function is get_keycloak_access_token else access_token_function.__qualname__
+    key: TokenKey = (client_id, "client_credentials", realm)
+    fingerprint = secret_fingerprint(client_secret)
+    return key, fingerprint, token_broker.fetcher(key, fingerprint, fetch)
 
 
 def get_valid_access_token(client_id: str, client_secret: str, access_token_function):
-    token_response = access_token_function(client_id=client_id, client_secret=client_secret)
-    token_response.raise_for_status()
+    """Return a client-credentials Bearer token, served from the process-wide `token_cache`.
+
+    Tokens are cached per (client_id, grant_type, realm) until shortly before `expires_in` and
+    refreshed in the background; misses go through `token_broker`, so parallel processes share
+    one token per client. A failed token request is raised and never cached.
+    """
+    key, fingerprint, fetch = _client_credentials_token(client_id, client_secret, access_token_function)
+    return f"Bearer {token_cache.get(key, fingerprint, fetch)}"
+
 
-    return f"Bearer {token_response.json()['access_token']}"
+async def aget_valid_access_token(client_id: str, client_secret: str, access_token_function):
+    """Asyncio variant of `get_valid_access_token` sharing the same cache."""
+    key, fingerprint, fetch = _client_credentials_token(client_id, client_secret, access_token_function)
+    return f"Bearer {await token_cache.aget(key, fingerprint, fetch)}"
 
 
 def get_keycloak_access_token(client_id: str, client_secret: str):
-    token_response = requests.post(
+    token_response = http_session.post(
         KC_AUTH_URL,
         headers={"Content-Type": "application/x-www-form-urlencoded"},
         data={
@@ -25,7 +78,7 @@ def get_keycloak_access_token(client_id: str, client_secret: str):
 
 
 def get_keycloak_password_token(client_id: str, username: str, password: str):
-    token_response = requests.post(
+    token_response = http_session.post(
         KC_AUTH_URL,
         headers={"Content-Type": "application/x-www-form-urlencoded"},
         data={
@@ -39,21 +92,36 @@ def get_keycloak_password_token(client_id: str, username: str, password: str):
     return token_response
 
 
-def get_cbi_access_token(cert_path: str, key_path: str, authorization: str):
-    token_response = requests.post(
-        CBI_AUTH_URL,
-        cert=(cert_path, key_path),
-        headers={
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Authorization": authorization,
-        },
-        data={"grant_type": "client_credentials", "scope": "srtp"},
+def get_valid_password_token(client_id: str, username: str, password: str):
+    """Return a password-grant Bearer token through the token cache and cross-process broker."""
+    key: TokenKey = (f"{client_id}:{username}", "password", KEYCLOAK_REALM)
+    fetch = _response_token_fetcher(
+        lambda: get_keycloak_password_token(client_id=client_id, username=username, password=password)
     )
-
-    return token_response.json()["access_token"]
+    return f"Bearer {_brokered_token(key, secret_fingerprint(password), fetch)}"
+
+
+def get_cbi_access_token(cert_path: str, key_path: str, authorization: str, use_cache: bool = True):
+    """Return a CBI access token; `use_cache=False` always calls the auth endpoint (availability probes)."""
+    fetch = _response_token_fetcher(
+        lambda: http_session.post(
+            CBI_AUTH_URL,
+            cert=(cert_path, key_path),
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Authorization": authorization,
+            },
+            data={"grant_type": "client_credentials", "scope": "srtp"},
+        )
+    )
+    if not use_cache:
+        return fetch()[0]
+    # Fingerprint the credential only: cert_path differs per xdist worker, the certificate does not
+    key: TokenKey = (secret_fingerprint(authorization), "client_credentials", "cbi")
+    return _brokered_token(key, secret_fingerprint(authorization), fetch)
 
 
-def get_poste_access_token(cert_path: str, key_path: str, client_id: str, client_secret: str):
+def get_poste_access_token(cert_path: str, key_path: str, client_id: str, client_secret: str, use_cache: bool = True):
     """
     Retrieves an access token from the POSTE authentication endpoint using client credentials and mutual TLS.
 
@@ -65,17 +133,26 @@ def get_poste_access_token(cert_path: str, key_path: str, client_id: str, client
     :type client_id: str
     :param client_secret: The client secret for authentication.
     :type client_secret: str
+    :param use_cache: Serve the token from the cache and broker; False always calls the auth endpoint.
+    :type use_cache: bool
+    :returns: The access token, served from the token cache and cross-process broker while valid.
+    :rtype: str
     """
-    token_response = requests.post(
-        POSTE_AUTH_URL,
-        cert=(cert_path, key_path),
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-        data={
-            "client_id": client_id,
-            "client_secret": client_secret,
-            "grant_type": "client_credentials",
-            "scope": "fd1d2688-49fe-40f8-9238-4aec86c48eef/.default",
-        },
-    )
 
-    return token_response.json()["access_token"]
+    fetch = _response_token_fetcher(
+        lambda: http_session.post(
+            POSTE_AUTH_URL,
+            cert=(cert_path, key_path),
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            data={
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "grant_type": "client_credentials",
+                "scope": POSTE_SCOPE,
+            },
+        )
+    )
+    if not use_cache:
+        return fetch()[0]
+    key: TokenKey = (client_id, "client_credentials", "poste")
+    return _brokered_token(key, secret_fingerprint(client_secret), fetch)
@@ -1,7 +1,6 @@
 import uuid
 
-import requests
-
+from api.utils import http_session
 from api.utils.api_version import ACTIVATION_VERSION
 from api.utils.endpoints import (
     ACTIVATION_BY_ID_URL,
@@ -13,15 +12,27 @@ from api.utils.endpoints import (
 from api.utils.http_utils import HTTP_TIMEOUT
 
 
+def build_activation_request(
+    access_token: str, payer_fiscal_code: str, service_provider_id: str, url: str = ACTIVATION_URL
+) -> dict:
+    """Build the url, headers and body of an activation call, shared by the sync and async clients.
+    :returns: keyword arguments for the HTTP client (url, headers, json).
+    :rtype: dict
+    """
+    return {
+        "url": url,
+        "headers": {"Authorization": f"{access_token}", "Version": ACTIVATION_VERSION, "RequestId": str(uuid.uuid4())},
+        "json": {"payer": {"fiscalCode": payer_fiscal_code, "rtpSpId": service_provider_id}},
+    }
+
+
 def activate(access_token: str, payer_fiscal_code: str, service_provider_id: str):
     """API to activate a debtor to receive RTP
     :returns: the response of the call.
     :rtype: requests.Response
     """
-    return requests.post(
-        url=ACTIVATION_URL,
-        headers={"Authorization": f"{access_token}", "Version": ACTIVATION_VERSION, "RequestId": str(uuid.uuid4())},
-        json={"payer": {"fiscalCode": payer_fiscal_code, "rtpSpId": service_provider_id}},
+    return http_session.post(
+        **build_activation_request(access_token, payer_fiscal_code, service_provider_id),
         timeout=HTTP_TIMEOUT,
     )
 
@@ -31,10 +42,8 @@ def activate_dev(access_token: str, payer_fiscal_code: str, service_provider_id:
     :returns: the response of the call.
     :rtype: requests.Response
     """
-    return requests.post(
-        url=ACTIVATION_URL_DEV,
-        headers={"Authorization": f"{access_token}", "Version": ACTIVATION_VERSION, "RequestId": str(uuid.uuid4())},
-        json={"payer": {"fiscalCode": payer_fiscal_code, "rtpSpId": service_provider_id}},
+    return http_session.post(
+        **build_activation_request(access_token, payer_fiscal_code, service_provider_id, url=ACTIVATION_URL_DEV),
         timeout=HTTP_TIMEOUT,
     )
 
@@ -44,7 +53,7 @@ def get_activation_by_payer_id(access_token: str, payer_fiscal_code: str):
     :returns: the response of the call.
     :rtype: requests.Response
     """
-    return requests.get(
+    return http_session.get(
         url=ACTIVATION_URL + "/payer",
         headers={
             "Authorization": f"{access_token}",
@@ -58,7 +67,7 @@ def get_activation_by_payer_id(access_token: str, payer_fiscal_code: str):
 
 def get_activation_by_id(access_token: str, activation_id: str):
     """API to get activation by activationId."""
-    return requests.get(
+    return http_session.get(
         url=ACTIVATION_BY_ID_URL.format(activationId=activation_id),
         headers={"Authorization": f"{access_token}", "Version": ACTIVATION_VERSION, "RequestId": str(uuid.uuid4())},
         timeout=HTTP_TIMEOUT,
@@ -74,7 +83,7 @@ def get_activation_status_by_fiscal_code(access_token: str, payer_fiscal_code: s
     :returns: the response of the call.
     :rtype: requests.Response
     """
-    return requests.get(
+    return http_session.get(
         url=ACTIVATION_PAYER_STATUS_URL.format(payerId=payer_fiscal_code),
         headers={
             "Authorization": f"{access_token}",
@@ -102,4 +111,4 @@ def get_all_activations(
     if page is not None:
         params["page"] = page
 
-    return requests.get(url=ACTIVATION_LIST_URL, headers=headers, params=params, timeout=HTTP_TIMEOUT)
+    return http_session.get(url=ACTIVATION_LIST_URL, headers=headers, params=params, timeout=HTTP_TIMEOUT)
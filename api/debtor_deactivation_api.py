@@ -1,7 +1,6 @@
 import uuid
 
-import requests
-
+from api.utils import http_session
 from api.utils.api_version import DEACTIVATION_VERSION
 from api.utils.endpoints import DEACTIVATION_URL
 from api.utils.http_utils import HTTP_TIMEOUT
@@ -14,7 +13,7 @@ def deactivate(access_token: str, activation_id: str):
     :returns: the response of the call.
     :rtype: requests.Response
     """
-    return requests.delete(
+    return http_session.delete(
         url=f"{DEACTIVATION_URL}/{activation_id}",
         headers={"Authorization": f"{access_token}", "Version": DEACTIVATION_VERSION, "RequestId": str(uuid.uuid4())},
         timeout=HTTP_TIMEOUT,
@@ -1,7 +1,6 @@
 import uuid
 
-import requests
-
+from api.utils import http_session
 from api.utils.endpoints import CBI_SEND_URL, CREATE_RTP_OPERATION, ICCREA_SEND_URL, POSTE_SEND_URL
 from api.utils.http_utils import CERT_PATH, HTTP_TIMEOUT, KEY_PATH
 from utils.idempotency_key_utils import generate_idempotency_key
@@ -20,7 +19,7 @@ def send_srtp_to_cbi(access_token: str, rtp_payload: JsonType):
     idempotency_key = generate_idempotency_key(CREATE_RTP_OPERATION, rtp_payload["resourceId"])
     bearer_token = _create_bearer_token(access_token)
 
-    return requests.post(
+    return http_session.post(
         headers={
             "Authorization": f"{bearer_token}",
             "Idempotency-key": idempotency_key,
@@ -45,7 +44,7 @@ def send_srtp_to_poste(access_token: str, rtp_payload: JsonType):
     idempotency_key = generate_idempotency_key(CREATE_RTP_OPERATION, rtp_payload["resourceId"])
     bearer_token = _create_bearer_token(access_token)
 
-    return requests.post(
+    return http_session.post(
         headers={
             "Authorization": f"{bearer_token}",
             "Idempotency-key": idempotency_key,
@@ -66,7 +65,7 @@ def send_srtp_to_iccrea(rtp_payload: JsonType):
     :type rtp_payload: JsonType
     """
     idempotency_key = generate_idempotency_key(CREATE_RTP_OPERATION, rtp_payload["resourceId"])
-    return requests.post(
+    return http_session.post(
         headers={"Idempotency-key": idempotency_key, "X-Request-ID": str(uuid.uuid4())},
         url=ICCREA_SEND_URL,
         json=rtp_payload,
@@ -2,6 +2,7 @@ import uuid
 
 import requests
 
+from api.utils import http_session
 from api.utils.api_version import TAKEOVER_API_VERSION
 from api.utils.endpoints import TAKEOVER_NOTIFICATION_URL, TAKEOVER_URL
 from api.utils.http_utils import APPLICATION_JSON_HEADER, HTTP_TIMEOUT
@@ -39,7 +40,7 @@ def takeover_activation(
     if include_payload:
         payload = {"payer": {"fiscalCode": payer_fiscal_code, "rtpSpId": service_provider_id}}
 
-    response = requests.post(url=f"{TAKEOVER_URL}/{otp}", headers=headers, json=payload, timeout=HTTP_TIMEOUT)
+    response = http_session.post(url=f"{TAKEOVER_URL}/{otp}", headers=headers, json=payload, timeout=HTTP_TIMEOUT)
 
     return response
 
@@ -55,5 +56,5 @@ def send_takeover_notification(
         "X-Version": TAKEOVER_API_VERSION,
     }
     payload = {"oldActivationId": old_activation_id, "fiscalCode": fiscal_code, "takeoverTimestamp": takeover_timestamp}
-    response = requests.post(url=TAKEOVER_NOTIFICATION_URL, headers=headers, json=payload, timeout=HTTP_TIMEOUT)
+    response = http_session.post(url=TAKEOVER_NOTIFICATION_URL, headers=headers, json=payload, timeout=HTTP_TIMEOUT)
     return response
@@ -2,6 +2,7 @@ import uuid
 
 import requests
 
+from api.utils import http_session
 from api.utils.api_version import PAYEES_VERSION
 from api.utils.endpoints import PAYEES_CONSENTS_URL, PAYEES_URL
 from api.utils.http_utils import HTTP_TIMEOUT
@@ -14,7 +15,7 @@ CONSENTS_DEFAULT_VALUE = "OPT_OUT"
 
 def get_payee_registry(access_token: str, page: int = 0, size: int = 20):
 
-    return requests.get(
+    return http_session.get(
         url=PAYEES_URL,
         headers={"Authorization": access_token, "Version": PAYEES_VERSION, "RequestId": str(uuid.uuid4())},
         params={"page": page, "size": size},
@@ -37,7 +38,7 @@ def get_payees_consents(
         params["fromDate"] = from_date
     params["toDate"] = get_date_or_default_today(to_date)
 
-    return requests.get(
+    return http_session.get(
         url=PAYEES_CONSENTS_URL,
         headers={"Authorization": access_token, "Version": PAYEES_VERSION, "RequestId": str(uuid.uuid4())},
         params=params,
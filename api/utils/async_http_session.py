@@ -0,0 +1,77 @@
+"""Shared ``httpx.AsyncClient`` instances used by the asyncio api/ clients.
+
+httpx binds connections to the event loop that opened them, so clients are cached per running
+loop and per client certificate: mTLS callers passing ``cert=(cert_path, key_path)`` get their
+own connection pool, everyone else shares the plain one. Like the sync sessions, pooled clients
+reject every cookie.
+"""
+
+import asyncio
+import functools
+import http.cookiejar
+import ssl
+import weakref
+
+import certifi
+import httpx
+
+from api.utils.http_utils import encode_json_body
+from config.configuration import config
+
+MAX_CONNECTIONS = config.get("http_async_max_connections", 1000)
+MAX_KEEPALIVE_CONNECTIONS = config.get("http_async_max_keepalive_connections", 100)
+
+CertType = str | tuple[str, str] | None
+
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[CertType, httpx.AsyncClient]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@functools.cache
+def _ssl_context(cert: CertType) -> ssl.SSLContext | bool:
+    if not cert:
+        return True
+    context = ssl.create_default_context(cafile=certifi.where())
+    if isinstance(cert, tuple):
+        context.load_cert_chain(certfile=cert[0], keyfile=cert[1])
+    else:
+        context.load_cert_chain(certfile=cert)
+    return context
+
+
+def client_for(cert: CertType = None) -> httpx.AsyncClient:
+    """Return the pooled client of the running event loop for the given client certificate."""
+    loop_clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    cert_key = tuple(cert) if isinstance(cert, list | tuple) else cert
+    client = loop_clients.get(cert_key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            verify=_ssl_context(cert_key),
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+        )
+        client.cookies.jar.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        loop_clients[cert_key] = client
+    return client
+
+
+async def request(method: str, url: str, cert: CertType = None, **kwargs) -> httpx.Response:
+    kwargs = encode_json_body(kwargs)
+    if isinstance(kwargs.get("data"), bytes):
+        # Encoded bodies come as requests-style data=bytes; httpx takes raw bytes as content=
+        kwargs["content"] = kwargs.pop("data")
+    return await client_for(cert).request(method=method, url=url, **kwargs)
+
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    return await request("GET", url, **kwargs)
+
+
+async def post(url: str, **kwargs) -> httpx.Response:
+    return await request("POST", url, **kwargs)
+
+
+async def aclose() -> None:
+    """Close every client opened on the running event loop; call it before the loop shuts down."""
+    loop_clients = _clients.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*(client.aclose() for client in loop_clients.values()))
@@ -0,0 +1,185 @@
+"""Shared keep-alive HTTP sessions used by every api/ client module.
+
+Sessions are pooled per scheme, host and client certificate, so repeated calls to the same
+service reuse open TCP/TLS connections instead of paying a handshake per request. mTLS callers
+passing ``cert=(cert_path, key_path)`` get a dedicated pool per certificate pair. Pooled sessions
+reject every cookie, so no server state leaks from one test's request into the next.
+"""
+
+import atexit
+import http.cookiejar
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+
+from api.utils.http_utils import encode_json_body
+from config.configuration import config
+
+POOL_CONNECTIONS = config.get("http_pool_connections", 10)
+POOL_MAXSIZE = config.get("http_pool_maxsize", 10)
+POOL_BLOCK = config.get("http_pool_block", False)
+
+CertType = str | tuple[str, str] | None
+
+
+@dataclass
+class ConnectionStats:
+    requests: int = 0
+    new_connections: int = 0
+
+    @property
+    def reused_connections(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "newConnections": self.new_connections,
+            "reusedConnections": self.reused_connections,
+        }
+
+
+def _counting_pool(pool_class: type[HTTPConnectionPool], stats: ConnectionStats, lock: threading.Lock) -> type:
+    class CountingConnectionPool(pool_class):
+        def _new_conn(self):
+            with lock:
+                stats.new_connections += 1
+            return super()._new_conn()
+
+    return CountingConnectionPool
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter counting every request it sends and every new connection its pools open."""
+
+    def __init__(self, stats: ConnectionStats, lock: threading.Lock, **kwargs):
+        self._stats = stats
+        self._stats_lock = lock
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(HTTPConnectionPool, self._stats, self._stats_lock),
+            "https": _counting_pool(HTTPSConnectionPool, self._stats, self._stats_lock),
+        }
+
+    def send(self, request, **kwargs) -> requests.Response:
+        with self._stats_lock:
+            self._stats.requests += 1
+        return super().send(request, **kwargs)
+
+
+def _cert_label(cert: CertType) -> str:
+    if not cert:
+        return ""
+    cert_file = cert[0] if isinstance(cert, tuple) else cert
+    return f" (mTLS {Path(cert_file).name})"
+
+
+class SessionRegistry:
+    """Registry of ``requests.Session`` objects keyed by (scheme, host, client certificate).
+
+    Args:
+        pool_connections: Number of per-host connection pools cached by each session.
+        pool_maxsize: Maximum number of connections kept alive per pool.
+        pool_block: When True, callers wait for a free connection instead of opening extra ones.
+    """
+
+    def __init__(
+        self, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE, pool_block: bool = POOL_BLOCK
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self._sessions: dict[tuple, requests.Session] = {}
+        self._stats: dict[tuple, ConnectionStats] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str, cert: CertType) -> tuple:
+        parts = urlsplit(url)
+        cert_key = tuple(cert) if isinstance(cert, list | tuple) else cert
+        return parts.scheme, parts.netloc, cert_key
+
+    def session_for(self, url: str, cert: CertType = None) -> requests.Session:
+        """Return the pooled session for the host of `url` and the given client certificate."""
+        key = self._key(url, cert)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                stats = self._stats[key] = ConnectionStats()
+                adapter = _CountingAdapter(
+                    stats,
+                    self._lock,
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                    pool_block=self.pool_block,
+                )
+                session = requests.Session()
+                session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.cert = cert
+                self._sessions[key] = session
+        return session
+
+    def request(self, method: str, url: str, cert: CertType = None, **kwargs) -> requests.Response:
+        return self.session_for(url, cert).request(method=method, url=url, **encode_json_body(kwargs))
+
+    def stats(self) -> dict:
+        """Return connection-reuse counters per pool and in total.
+
+        Returns:
+            dict: ``{"pools": {"<scheme>://<host>[ (mTLS <cert>)]": {...}}, "total": {...}}`` where each entry
+            reports requests, newConnections and reusedConnections (handshakes saved).
+        """
+        with self._lock:
+            snapshot = {
+                key: ConnectionStats(stats.requests, stats.new_connections) for key, stats in self._stats.items()
+            }
+        total = ConnectionStats(
+            requests=sum(stats.requests for stats in snapshot.values()),
+            new_connections=sum(stats.new_connections for stats in snapshot.values()),
+        )
+        pools = {
+            f"{scheme}://{netloc}{_cert_label(cert)}": stats.as_dict()
+            for (scheme, netloc, cert), stats in snapshot.items()
+        }
+        return {"pools": pools, "total": total.as_dict()}
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+session_registry = SessionRegistry()
+atexit.register(session_registry.close)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return session_registry.request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return session_registry.request("POST", url, **kwargs)
+
+
+def put(url: str, **kwargs) -> requests.Response:
+    return session_registry.request("PUT", url, **kwargs)
+
+
+def delete(url: str, **kwargs) -> requests.Response:
+    return session_registry.request("DELETE", url, **kwargs)
+
+
+def connection_stats() -> dict:
+    return session_registry.stats()
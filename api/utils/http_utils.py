@@ -1,6 +1,25 @@
 from config.configuration import config
+from utils import json_codec
 
 HTTP_TIMEOUT = config.default_timeout
 APPLICATION_JSON_HEADER = {"Content-Type": "application/json"}
 CERT_PATH = config.cert_path
 KEY_PATH = config.key_path
+
+
+def encode_json_body(kwargs: dict) -> dict:
+    """Replace a `json=` request argument by `data=` bytes encoded with utils.json_codec.
+
+    A Content-Type: application/json header is added unless the caller already set one. Like requests'
+    own `json=` handling, NaN and Infinity are rejected with ValueError instead of being sent.
+    Shared by the sync and async sessions so every api/ client goes through the same codec.
+    """
+    if kwargs.get("json") is None:
+        kwargs.pop("json", None)
+        return kwargs
+    headers = dict(kwargs.get("headers") or {})
+    if not any(name.lower() == "content-type" for name in headers):
+        headers["Content-Type"] = "application/json"
+    kwargs["headers"] = headers
+    kwargs["data"] = json_codec.dumps(kwargs.pop("json"))
+    return kwargs
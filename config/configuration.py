@@ -1,142 +1,321 @@
-"""Parse configuration file to obtain current settings."""
+"""Parse configuration file to obtain current settings.
 
+`config` (config.yaml plus RTP_* environment overrides) and `secrets` (environment variables) are
+lazy: importing this module reads nothing, and the first attribute access resolves an immutable,
+case-insensitive snapshot that serves the rest of the process. Importing Dynaconf and parsing
+config.yaml is skipped altogether when the parsed file is found in the local snapshot cache,
+keyed by target environment and config.yaml path, mtime and size.
+
+The cache only ever holds config.yaml content; environment overrides, worker-scoped paths and
+secrets are applied on top at every resolution. RTP_CONFIG_CACHE=false disables it and
+RTP_CONFIG_CACHE_DIR moves it (default <tmp>/rtp-config-<user>).
+"""
+
+import functools
+import getpass
+import hashlib
+import json
 import os
+import tempfile
+import tomllib
+from collections.abc import Callable, Iterator, Mapping
 from pathlib import Path
-
-from dynaconf import Dynaconf
+from types import MappingProxyType
 
 # Check if we're running in GitHub Actions
 IS_GITHUB_ACTIONS = os.getenv("GITHUB_ACTIONS", "false").lower() == "true"
 
-# Only load .env file if NOT in GitHub Actions
-if not IS_GITHUB_ACTIONS:
-    from dotenv import load_dotenv
-
-    load_dotenv()
-    print("Running locally - loaded .env file")
-else:
-    print("Running in GitHub Actions - using environment variables")
-
 BASE_DIR = Path(__file__).parent.parent.resolve()
+SETTINGS_FILE = BASE_DIR / "config.yaml"
 
 RTP_ENV_VAR_PREFIX = "RTP"
 
-# `envvar_prefix` = export envvars with RTP_ENV_VAR_PREFIX as prefix.
-# `settings_files` = Load settings files in the order.
-config = Dynaconf(
-    envvar_prefix=RTP_ENV_VAR_PREFIX,
-    settings_files=["config.yaml"],
-)
-config.cert_path = str(BASE_DIR / config.cert_path)
-config.key_path = str(BASE_DIR / config.key_path)
-
-secrets = Dynaconf(
-    envvar_prefix="",  # No prefix for secrets
-    environments=False,  # Disable environment switching
-    settings_files=[],  # No files, only environment variables
-)
-
-secrets.debtor_service_provider = Dynaconf(
-    client_id=os.getenv("DEBTOR_SERVICE_PROVIDER_CLIENT_ID"),
-    service_provider_id=os.getenv("DEBTOR_SERVICE_PROVIDER_ID"),
-    client_secret=os.getenv("DEBTOR_SERVICE_PROVIDER_CLIENT_SECRET"),
-)
-
-secrets.debtor_service_provider_B = Dynaconf(
-    client_id=os.getenv("DEBTOR_SERVICE_PROVIDER_B_CLIENT_ID"),
-    service_provider_id=os.getenv("DEBTOR_SERVICE_PROVIDER_B_ID"),
-    client_secret=os.getenv("DEBTOR_SERVICE_PROVIDER_B_CLIENT_SECRET"),
-)
-
-secrets.debtor_service_provider_C = Dynaconf(
-    client_id=os.getenv("DEBTOR_SERVICE_PROVIDER_C_CLIENT_ID"),
-    service_provider_id=os.getenv("DEBTOR_SERVICE_PROVIDER_C_ID"),
-    client_secret=os.getenv("DEBTOR_SERVICE_PROVIDER_C_CLIENT_SECRET"),
-)
-
-secrets.creditor_service_provider = Dynaconf(
-    client_id=os.getenv("CREDITOR_SERVICE_PROVIDER_CLIENT_ID"),
-    service_provider_id=os.getenv("CREDITOR_SERVICE_PROVIDER_ID"),
-    client_secret=os.getenv("CREDITOR_SERVICE_PROVIDER_CLIENT_SECRET"),
-)
-
-secrets.pagopa_integration_payee_registry = Dynaconf(
-    client_id=os.getenv("PAGOPA_INTEGRATION_PAYEE_REGISTRY_CLIENT_ID"),
-    client_secret=os.getenv("PAGOPA_INTEGRATION_PAYEE_REGISTRY_CLIENT_SECRET"),
-)
-
-secrets.pagopa_integration_payee_registry_consent = Dynaconf(
-    client_id=os.getenv("PAGOPA_INTEGRATION_PAYEE_REGISTRY_CONSENT_CLIENT_ID"),
-    client_secret=os.getenv("PAGOPA_INTEGRATION_PAYEE_REGISTRY_CONSENT_CLIENT_SECRET"),
-)
-
-secrets.pagopa_integration_service_registry = Dynaconf(
-    client_id=os.getenv("PAGOPA_INTEGRATION_SERVICE_REGISTRY_CLIENT_ID"),
-    client_secret=os.getenv("PAGOPA_INTEGRATION_SERVICE_REGISTRY_CLIENT_SECRET"),
-)
-
-secrets.webpage = Dynaconf(
-    username=os.getenv("WEBPAGE_USERNAME"),
-    password=os.getenv("WEBPAGE_PASSWORD"),
-    client_id=os.getenv("WEBPAGE_CLIENT_ID"),
-    payer_fiscal_code=os.getenv("WEBPAGE_PAYER_FISCAL_CODE"),
-)
-
-secrets.debt_positions = Dynaconf(
-    subscription_key=os.getenv("DEBT_POSITIONS_SUBSCRIPTION_KEY"),
-    organization_id=os.getenv("DEBT_POSITIONS_ORGANIZATION_ID"),
-)
-
-secrets.debt_positions_dev = Dynaconf(
-    subscription_key=os.getenv("DEBT_POSITIONS_DEV_SUBSCRIPTION_KEY"),
-    organization_id=os.getenv("DEBT_POSITIONS_DEV_ORGANIZATION_ID"),
-)
-
-secrets.rtp_reader = Dynaconf(
-    client_id=os.getenv("RTP_READER_CLIENT_ID"),
-    client_secret=os.getenv("RTP_READER_CLIENT_SECRET"),
-)
-
-secrets.rtp_consumer = Dynaconf(
-    client_id=os.getenv("RTP_CONSUMER_CLIENT_ID"),
-    client_secret=os.getenv("RTP_CONSUMER_CLIENT_SECRET"),
-)
-
-secrets.read_rtp_activations = Dynaconf(
-    client_id=os.getenv("READ_RTP_ACTIVATIONS_CLIENT_ID"),
-    client_secret=os.getenv("READ_RTP_ACTIVATIONS_CLIENT_SECRET"),
-)
-
-secrets.poste_oauth = Dynaconf(
-    client_id=os.getenv("POSTE_CLIENT_ID"),
-    client_secret=os.getenv("POSTE_CLIENT_SECRET"),
-)
-
-# Direct attributes for backward compatibility
-secrets.CBI_client_id = os.getenv("CBI_CLIENT_ID")
-secrets.CBI_client_secret = os.getenv("CBI_CLIENT_SECRET")
-secrets.CBI_client_PFX_base64 = os.getenv("CBI_CLIENT_PFX_BASE64")
-secrets.CBI_client_PFX_password_base64 = os.getenv("CBI_CLIENT_PFX_PASSWORD_BASE64")
-secrets.debtor_service_provider_mock_PFX_base64 = os.getenv("DEBTOR_SERVICE_PROVIDER_MOCK_PFX_BASE64")
-secrets.debtor_service_provider_mock_PFX_password_base64 = os.getenv("DEBTOR_SERVICE_PROVIDER_MOCK_PFX_PASSWORD_BASE64")
-secrets.cbi_activated_fiscal_code = os.getenv("CBI_ACTIVATED_FISCAL_CODE")
-secrets.cbi_payee_id = os.getenv("CBI_PAYEE_ID")
-secrets.creditor_agent_id = os.getenv("CREDITOR_AGENT_ID")
-secrets.poste_activated_fiscal_code = os.getenv("POSTE_ACTIVATED_FISCAL_CODE")
-secrets.iccrea_activated_fiscal_code = os.getenv("ICCREA_ACTIVATED_FISCAL_CODE")
-secrets.mock_actc_fiscal_code = os.getenv("MOCK_ACTC_FISCAL_CODE")
-secrets.mock_rjct_fiscal_code = os.getenv("MOCK_RJCT_FISCAL_CODE")
-secrets.mock_no_links_fiscal_code = os.getenv("MOCK_NO_LINKS_FISCAL_CODE")
-secrets.mock_extra_field_fiscal_code = os.getenv("MOCK_EXTRA_FIELD_FISCAL_CODE")
-secrets.ec_tax_code = os.getenv("EC_TAX_CODE")
-
-secrets.mock_rjct_extra_field_fiscal_code = os.getenv("MOCK_RJCT_EXTRA_FIELD_FISCAL_CODE")
-secrets.mock_rjct_no_links_fiscal_code = os.getenv("MOCK_RJCT_NO_LINKS_FISCAL_CODE")
-secrets.mock_server_error_fiscal_code = os.getenv("MOCK_SERVER_ERROR_FISCAL_CODE")
-secrets.mock_actc_fiscal_code_v2 = os.getenv("MOCK_ACTC_FISCAL_CODE_V2")
-secrets.mock_rjct_fiscal_code_v2 = os.getenv("MOCK_RJCT_FISCAL_CODE_V2")
-secrets.mock_no_links_fiscal_code_v2 = os.getenv("MOCK_NO_LINKS_FISCAL_CODE_V2")
-secrets.mock_extra_field_fiscal_code_v2 = os.getenv("MOCK_EXTRA_FIELD_FISCAL_CODE_V2")
-secrets.mock_rjct_extra_field_fiscal_code_v2 = os.getenv("MOCK_RJCT_EXTRA_FIELD_FISCAL_CODE_V2")
-secrets.mock_rjct_no_links_fiscal_code_v2 = os.getenv("MOCK_RJCT_NO_LINKS_FISCAL_CODE_V2")
-secrets.mock_server_error_fiscal_code_v2 = os.getenv("MOCK_SERVER_ERROR_FISCAL_CODE_V2")
+# pytest-xdist workers (gw0, gw1, ...) materialise the mTLS PEM files under their own names,
+# so parallel workers never overwrite the certificate another worker is handshaking with.
+XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER", "")
+
+# Nested secrets: attribute group -> {attribute: environment variable}
+SECRET_GROUPS = {
+    "debtor_service_provider": {
+        "client_id": "DEBTOR_SERVICE_PROVIDER_CLIENT_ID",
+        "service_provider_id": "DEBTOR_SERVICE_PROVIDER_ID",
+        "client_secret": "DEBTOR_SERVICE_PROVIDER_CLIENT_SECRET",
+    },
+    "debtor_service_provider_B": {
+        "client_id": "DEBTOR_SERVICE_PROVIDER_B_CLIENT_ID",
+        "service_provider_id": "DEBTOR_SERVICE_PROVIDER_B_ID",
+        "client_secret": "DEBTOR_SERVICE_PROVIDER_B_CLIENT_SECRET",
+    },
+    "debtor_service_provider_C": {
+        "client_id": "DEBTOR_SERVICE_PROVIDER_C_CLIENT_ID",
+        "service_provider_id": "DEBTOR_SERVICE_PROVIDER_C_ID",
+        "client_secret": "DEBTOR_SERVICE_PROVIDER_C_CLIENT_SECRET",
+    },
+    "creditor_service_provider": {
+        "client_id": "CREDITOR_SERVICE_PROVIDER_CLIENT_ID",
+        "service_provider_id": "CREDITOR_SERVICE_PROVIDER_ID",
+        "client_secret": "CREDITOR_SERVICE_PROVIDER_CLIENT_SECRET",
+    },
+    "pagopa_integration_payee_registry": {
+        "client_id": "PAGOPA_INTEGRATION_PAYEE_REGISTRY_CLIENT_ID",
+        "client_secret": "PAGOPA_INTEGRATION_PAYEE_REGISTRY_CLIENT_SECRET",
+    },
+    "pagopa_integration_payee_registry_consent": {
+        "client_id": "PAGOPA_INTEGRATION_PAYEE_REGISTRY_CONSENT_CLIENT_ID",
+        "client_secret": "PAGOPA_INTEGRATION_PAYEE_REGISTRY_CONSENT_CLIENT_SECRET",
+    },
+    "pagopa_integration_service_registry": {
+        "client_id": "PAGOPA_INTEGRATION_SERVICE_REGISTRY_CLIENT_ID",
+        "client_secret": "PAGOPA_INTEGRATION_SERVICE_REGISTRY_CLIENT_SECRET",
+    },
+    "webpage": {
+        "username": "WEBPAGE_USERNAME",
+        "password": "WEBPAGE_PASSWORD",
+        "client_id": "WEBPAGE_CLIENT_ID",
+        "payer_fiscal_code": "WEBPAGE_PAYER_FISCAL_CODE",
+    },
+    "debt_positions": {
+        "subscription_key": "DEBT_POSITIONS_SUBSCRIPTION_KEY",
+        "organization_id": "DEBT_POSITIONS_ORGANIZATION_ID",
+    },
+    "debt_positions_dev": {
+        "subscription_key": "DEBT_POSITIONS_DEV_SUBSCRIPTION_KEY",
+        "organization_id": "DEBT_POSITIONS_DEV_ORGANIZATION_ID",
+    },
+    "rtp_reader": {
+        "client_id": "RTP_READER_CLIENT_ID",
+        "client_secret": "RTP_READER_CLIENT_SECRET",
+    },
+    "rtp_consumer": {
+        "client_id": "RTP_CONSUMER_CLIENT_ID",
+        "client_secret": "RTP_CONSUMER_CLIENT_SECRET",
+    },
+    "read_rtp_activations": {
+        "client_id": "READ_RTP_ACTIVATIONS_CLIENT_ID",
+        "client_secret": "READ_RTP_ACTIVATIONS_CLIENT_SECRET",
+    },
+    "poste_oauth": {
+        "client_id": "POSTE_CLIENT_ID",
+        "client_secret": "POSTE_CLIENT_SECRET",
+    },
+}
+
+# Direct attributes for backward compatibility: attribute -> environment variable
+SECRET_VALUES = {
+    "CBI_client_id": "CBI_CLIENT_ID",
+    "CBI_client_secret": "CBI_CLIENT_SECRET",
+    "CBI_client_PFX_base64": "CBI_CLIENT_PFX_BASE64",
+    "CBI_client_PFX_password_base64": "CBI_CLIENT_PFX_PASSWORD_BASE64",
+    "debtor_service_provider_mock_PFX_base64": "DEBTOR_SERVICE_PROVIDER_MOCK_PFX_BASE64",
+    "debtor_service_provider_mock_PFX_password_base64": "DEBTOR_SERVICE_PROVIDER_MOCK_PFX_PASSWORD_BASE64",
+    "cbi_activated_fiscal_code": "CBI_ACTIVATED_FISCAL_CODE",
+    "cbi_payee_id": "CBI_PAYEE_ID",
+    "creditor_agent_id": "CREDITOR_AGENT_ID",
+    "poste_activated_fiscal_code": "POSTE_ACTIVATED_FISCAL_CODE",
+    "iccrea_activated_fiscal_code": "ICCREA_ACTIVATED_FISCAL_CODE",
+    "mock_actc_fiscal_code": "MOCK_ACTC_FISCAL_CODE",
+    "mock_rjct_fiscal_code": "MOCK_RJCT_FISCAL_CODE",
+    "mock_no_links_fiscal_code": "MOCK_NO_LINKS_FISCAL_CODE",
+    "mock_extra_field_fiscal_code": "MOCK_EXTRA_FIELD_FISCAL_CODE",
+    "ec_tax_code": "EC_TAX_CODE",
+    "mock_rjct_extra_field_fiscal_code": "MOCK_RJCT_EXTRA_FIELD_FISCAL_CODE",
+    "mock_rjct_no_links_fiscal_code": "MOCK_RJCT_NO_LINKS_FISCAL_CODE",
+    "mock_server_error_fiscal_code": "MOCK_SERVER_ERROR_FISCAL_CODE",
+    "mock_actc_fiscal_code_v2": "MOCK_ACTC_FISCAL_CODE_V2",
+    "mock_rjct_fiscal_code_v2": "MOCK_RJCT_FISCAL_CODE_V2",
+    "mock_no_links_fiscal_code_v2": "MOCK_NO_LINKS_FISCAL_CODE_V2",
+    "mock_extra_field_fiscal_code_v2": "MOCK_EXTRA_FIELD_FISCAL_CODE_V2",
+    "mock_rjct_extra_field_fiscal_code_v2": "MOCK_RJCT_EXTRA_FIELD_FISCAL_CODE_V2",
+    "mock_rjct_no_links_fiscal_code_v2": "MOCK_RJCT_NO_LINKS_FISCAL_CODE_V2",
+    "mock_server_error_fiscal_code_v2": "MOCK_SERVER_ERROR_FISCAL_CODE_V2",
+}
+
+
+def _freeze(value: object) -> object:
+    if isinstance(value, Mapping):
+        return Settings(value)
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class Settings:
+    """Immutable settings snapshot, read like Dynaconf: `settings.key`, `settings.get(key, default)`.
+
+    Keys are case-insensitive and nested mappings are snapshots too.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Mapping[str, object]):
+        object.__setattr__(
+            self, "_values", MappingProxyType({key.lower(): _freeze(value) for key, value in values.items()})
+        )
+
+    def __getattr__(self, name: str) -> object:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        try:
+            return self._values[name.lower()]
+        except KeyError:
+            raise AttributeError(f"Setting {name!r} is not defined") from None
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"Settings are read-only, cannot set {name!r}")
+
+    def __getitem__(self, key: str) -> object:
+        return self._values[key.lower()]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key.lower() in self._values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __repr__(self) -> str:
+        # Keys only: secrets are snapshots too
+        return f"Settings({sorted(self._values)})"
+
+    def get(self, key: str, default: object = None) -> object:
+        """Value of `key`, or `default` when it is not defined."""
+        return self._values.get(key.lower(), default)
+
+    def as_dict(self) -> dict[str, object]:
+        """Plain (mutable) copy of the snapshot."""
+        return {key: value.as_dict() if isinstance(value, Settings) else value for key, value in self._values.items()}
+
+
+class LazySettings:
+    """Proxy of the `Settings` returned by `resolve`, called on the first attribute access."""
+
+    __slots__ = ("_resolve",)
+
+    def __init__(self, resolve: Callable[[], Settings]):
+        object.__setattr__(self, "_resolve", resolve)
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"Settings are read-only, cannot set {name!r}")
+
+    def __getitem__(self, key: str) -> object:
+        return self._resolve()[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._resolve()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._resolve())
+
+    def __repr__(self) -> str:
+        return f"LazySettings({self._resolve()!r})"
+
+
+@functools.cache
+def _load_environment() -> None:
+    # Only load .env file if NOT in GitHub Actions
+    if not IS_GITHUB_ACTIONS:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        print("Running locally - loaded .env file")
+    else:
+        print("Running in GitHub Actions - using environment variables")
+
+
+def _cache_file(settings_file: Path) -> Path | None:
+    if os.getenv("RTP_CONFIG_CACHE", "true").lower() in ("false", "0", "no"):
+        return None
+    try:
+        stat = settings_file.stat()
+    except OSError:
+        return None
+    directory = os.getenv("RTP_CONFIG_CACHE_DIR") or Path(tempfile.gettempdir()) / f"rtp-config-{getpass.getuser()}"
+    key = hashlib.sha256(f"{settings_file}|{stat.st_mtime_ns}|{stat.st_size}".encode()).hexdigest()[:16]
+    target_env = os.getenv(f"{RTP_ENV_VAR_PREFIX}_TARGET_ENV", "default")
+    return Path(directory) / f"config-{target_env}-{key}.json"
+
+
+def _read_settings_file(settings_file: Path) -> dict[str, object]:
+    """config.yaml as parsed by Dynaconf, without environment overrides; served from the cache when possible."""
+    cache_file = _cache_file(settings_file)
+    if cache_file is not None:
+        try:
+            return json.loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass
+
+    from dynaconf import Dynaconf
+
+    # loaders=[] leaves out the environment loader: RTP_* overrides are applied on every resolution
+    values = Dynaconf(settings_files=[str(settings_file)], loaders=[]).as_dict()
+    if cache_file is not None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temporary = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            temporary.write_text(json.dumps(values))
+            os.replace(temporary, cache_file)
+        except (OSError, TypeError, ValueError):
+            pass
+    return values
+
+
+def _parse_env_value(value: str) -> object:
+    # Same reading as Dynaconf's environment loader: a TOML literal ("20" -> 20, "false" -> False),
+    # a Dynaconf "@" converter, or else the raw string
+    if value.startswith("@"):
+        from dynaconf.utils.parse_conf import parse_conf_data
+
+        return parse_conf_data(value, tomlfy=True)
+    try:
+        return tomllib.loads(f"value = {value}")["value"]
+    except tomllib.TOMLDecodeError:
+        return value
+
+
+def _apply_env_overrides(values: dict[str, object]) -> None:
+    prefix = f"{RTP_ENV_VAR_PREFIX}_"
+    for name, raw in os.environ.items():
+        if not name.startswith(prefix) or name == prefix:
+            continue
+        # RTP_A__B overrides the nested key a.b
+        *parents, key = name[len(prefix) :].lower().split("__")
+        target = values
+        for parent in parents:
+            node = target.get(parent)
+            target[parent] = node = dict(node) if isinstance(node, Mapping) else {}
+            target = node
+        target[key] = _parse_env_value(raw)
+
+
+def _worker_scoped_path(path: str) -> Path:
+    path = BASE_DIR / path
+    return path.with_name(f"{path.stem}-{XDIST_WORKER}{path.suffix}") if XDIST_WORKER else path
+
+
+@functools.cache
+def load_config() -> Settings:
+    """Resolve the config.yaml snapshot (with RTP_* environment overrides) once per process."""
+    _load_environment()
+    values = {key.lower(): value for key, value in _read_settings_file(SETTINGS_FILE).items()}
+    _apply_env_overrides(values)
+    values["cert_path"] = str(_worker_scoped_path(values["cert_path"]))
+    values["key_path"] = str(_worker_scoped_path(values["key_path"]))
+    return Settings(values)
+
+
+@functools.cache
+def load_secrets() -> Settings:
+    """Resolve the secrets snapshot from the environment (and .env locally) once per process."""
+    _load_environment()
+    values = {
+        group: {attribute: os.getenv(variable) for attribute, variable in attributes.items()}
+        for group, attributes in SECRET_GROUPS.items()
+    }
+    values.update({attribute: os.getenv(variable) for attribute, variable in SECRET_VALUES.items()})
+    return Settings(values)
+
+
+config = LazySettings(load_config)
+secrets = LazySettings(load_secrets)
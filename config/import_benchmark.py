@@ -0,0 +1,68 @@
+"""Startup cost of config.configuration, measured in fresh interpreters.
+
+Every scenario runs `--runs` times in its own subprocess; the median wall time is reported with
+the bare interpreter start (`python -c pass`) subtracted:
+
+    python -m config.import_benchmark --runs 20
+
+- import: `import config.configuration` alone, which resolves nothing
+- first access (no cache): config and secrets resolved through Dynaconf, RTP_CONFIG_CACHE=false
+- first access (warm cache): config and secrets resolved from the snapshot cache
+- dynaconf (reference): the eager Dynaconf object built at import before the snapshot, secrets excluded
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from config.configuration import BASE_DIR, RTP_ENV_VAR_PREFIX, SETTINGS_FILE
+
+_ACCESS = "from config.configuration import config, secrets; config.default_timeout; secrets.debtor_service_provider"
+
+# Scenario -> (code, extra environment)
+SCENARIOS = {
+    "import": ("import config.configuration", {}),
+    "first access (no cache)": (_ACCESS, {"RTP_CONFIG_CACHE": "false"}),
+    "first access (warm cache)": (_ACCESS, {}),
+    "dynaconf (reference)": (
+        f"from dynaconf import Dynaconf; "
+        f"Dynaconf(envvar_prefix={RTP_ENV_VAR_PREFIX!r}, settings_files=[{str(SETTINGS_FILE)!r}]).default_timeout",
+        {},
+    ),
+}
+
+
+def _run_ms(code: str, env: dict[str, str], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, env=env, check=True, stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the startup cost of config.configuration.")
+    parser.add_argument("--runs", type=int, default=10, help="Interpreter starts per scenario")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        base_env = {**os.environ, "RTP_CONFIG_CACHE_DIR": cache_dir}
+        # Populate the cache for the warm scenario
+        subprocess.run(
+            [sys.executable, "-c", _ACCESS], cwd=BASE_DIR, env=base_env, check=True, stdout=subprocess.DEVNULL
+        )
+
+        interpreter = _run_ms("pass", base_env, args.runs)
+        print(f"{'interpreter start':<28} {interpreter:8.1f} ms")
+        for name, (code, env) in SCENARIOS.items():
+            elapsed = _run_ms(code, {**base_env, **env}, args.runs)
+            print(f"{name:<28} {elapsed - interpreter:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
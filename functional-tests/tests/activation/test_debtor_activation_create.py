@@ -52,6 +52,7 @@ def test_activate_debtor(debtor_service_provider_token_a, random_fiscal_code):
 @pytest.mark.auth
 @pytest.mark.activation
 @pytest.mark.unhappy_path
+@pytest.mark.xdist_group(name="takeover")
 def test_activate_debtor_already_active_on_another_service_provider_triggers_takeover(
     debtor_service_provider_token_a, debtor_service_provider_token_b, random_fiscal_code
 ):
@@ -1,3 +1,5 @@
+import itertools
+import math
 import uuid
 
 import allure
@@ -7,6 +9,7 @@ import requests
 from api.debtor_activation_api import ACTIVATION_LIST_URL, activate, get_all_activations
 from config.configuration import config
 from utils.generator_random_values_utils import random_page_size
+from utils.pagination_utils import iter_activations
 from utils.response_assertions_utils import is_empty_response
 
 
@@ -187,3 +190,25 @@ def test_get_all_activations_nonexistent_next_activation_id(
 
     assert res.status_code == 200, f"Expected 200 but got {res.status_code}"
     assert is_empty_response(res), "Expected empty body for nonexistent NextActivationId"
+
+
+@allure.epic("Debtor Activation")
+@allure.feature("Activation")
+@allure.story("List Activations")
+@allure.title("Activation stream follows the cursor across pages without duplicates")
+@allure.tag("functional", "happy_path", "activation", "debtor_activation")
+@pytest.mark.auth
+@pytest.mark.activation
+@pytest.mark.happy_path
+def test_iter_activations_across_pages(debtor_service_provider_token_a):
+
+    page_size = 5
+    stream = iter_activations(debtor_service_provider_token_a, size=page_size)
+    activations = list(itertools.islice(stream, 3 * page_size))
+
+    activation_ids = [activation["id"] for activation in activations]
+    assert len(activation_ids) == len(set(activation_ids)), "Expected no duplicate activations across pages"
+    assert stream.items == len(activations), f"Expected {len(activations)} counted items, got {stream.items}"
+    assert stream.pages == max(math.ceil(stream.items / page_size), 1), (
+        f"Expected pages of {page_size} activations, got {stream.pages} pages for {stream.items} items"
+    )
@@ -19,7 +19,8 @@ def test_get_cbi_access_token(debtor_sp_mock_cert_key):
     auth = client_credentials_to_auth_token(secrets.CBI_client_id, secrets.CBI_client_secret)
     cert, key = debtor_sp_mock_cert_key
 
-    token = get_cbi_access_token(cert, key, auth)
+    # Bypass the token cache and broker: the probe must reach the auth endpoint
+    token = get_cbi_access_token(cert, key, auth, use_cache=False)
     assert isinstance(token, str) and token
 
 
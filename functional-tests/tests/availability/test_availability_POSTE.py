@@ -25,7 +25,10 @@ def test_get_poste_access_token(debtor_sp_mock_cert_key: tuple[str, str]):
     """
     cert, key = debtor_sp_mock_cert_key
 
-    token = get_poste_access_token(cert, key, secrets.poste_oauth.client_id, secrets.poste_oauth.client_secret)
+    # Bypass the token cache and broker: the probe must reach the auth endpoint
+    token = get_poste_access_token(
+        cert, key, secrets.poste_oauth.client_id, secrets.poste_oauth.client_secret, use_cache=False
+    )
 
     assert isinstance(token, str) and token, "Failed to retrieve a valid access token from POSTE."
 
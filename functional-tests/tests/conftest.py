@@ -4,10 +4,16 @@ import pytest
 from _pytest.nodes import Item
 from _pytest.reports import TestReport
 
-from api.auth_api import get_keycloak_access_token, get_keycloak_password_token, get_valid_access_token
+from api.auth_api import (
+    get_keycloak_access_token,
+    get_valid_access_token,
+    get_valid_password_token,
+    token_broker,
+    token_cache,
+)
 from api.debtor_activation_api import activate
 from config.configuration import config, secrets
-from utils.cryptography_utils import pfx_to_pem
+from utils.cryptography_utils import cached_pfx_to_pem
 from utils.extract_next_activation_id import extract_next_activation_id
 from utils.fiscal_code_utils import fake_fc, fake_fc_foreign, fake_omocodia_fc, fake_vat
 from utils.log_sanitizer_helper import sanitize_bearer_token
@@ -39,6 +45,16 @@ def pytest_runtest_makereport(
                 params[key] = sanitize_bearer_token(value)
 
 
+def pytest_terminal_summary(terminalreporter) -> None:
+    """Report how many token requests the process-wide token cache and the token broker saved."""
+    stats = token_cache.stats()
+    broker_stats = token_broker.stats()
+    terminalreporter.write_line(
+        f"token cache: {stats['hits']} hits, {stats['misses']} misses, {stats['refreshes']} background refreshes; "
+        f"token broker: {broker_stats['diskHits']} shared, {broker_stats['fetches']} fetched"
+    )
+
+
 # ============================================================
 #  Access token fixtures for Debtor Service Providers
 # ============================================================
@@ -102,13 +118,11 @@ def webpage_token() -> str:
     Access token for the webform user (password grant).
     Used by tests that need to act as the webpage user.
     """
-    token_response = get_keycloak_password_token(
+    return get_valid_password_token(
         client_id=secrets.webpage.client_id,
         username=secrets.webpage.username,
         password=secrets.webpage.password,
     )
-    token_response.raise_for_status()
-    return f"Bearer {token_response.json()['access_token']}"
 
 
 @pytest.fixture
@@ -262,12 +276,14 @@ def activate_payer(
 # ============================================================
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def debtor_sp_mock_cert_key() -> tuple[str, str]:
     """
     Returns (cert_path, key_path) for the debtor service provider mock PFX.
+    The PFX is decoded and written once per session and xdist worker (see `config.cert_path`);
+    mTLS sessions are pooled per returned pair.
     """
-    cert, key = pfx_to_pem(
+    cert, key = cached_pfx_to_pem(
         secrets.debtor_service_provider_mock_PFX_base64,
         secrets.debtor_service_provider_mock_PFX_password_base64,
         config.cert_path,
@@ -1,19 +1,20 @@
 import re
-import time
 
 import allure
 import pytest
 
 from api.debtor_activation_api import activate
+from api.RTP_get_api import get_rtp_by_notice_number as api_get_rtp_by_notice_number
 from api.RTP_get_api import get_rtp_delivery_status
 from api.RTP_process_sender import send_gpd_message
 from config.configuration import secrets
 from utils.dataset_gpd_message import generate_gpd_message_payload
 from utils.fiscal_code_utils import fake_fc
 from utils.generators_utils import generate_notice_number, generate_random_organization_id
+from utils.polling_utils import wait_until
 from utils.rtp_send_helpers import get_rtp_by_notice_number
 
-_SEND_PROCESSING_WAIT_S = 5
+_SEND_PROCESSING_TIMEOUT_S = 30
 
 _STATUS_DELIVERED = "PD_RTP_DELIVERED"
 _STATUS_NOT_DELIVERED = "PD_RTP_NOT_DELIVERED"
@@ -62,12 +63,15 @@ def test_get_delivery_status_sent_rtp(
         f"GPD message send failed: {send_response.status_code} {send_response.text}"
     )
 
-    time.sleep(_SEND_PROCESSING_WAIT_S)
-
-    delivery_response = get_rtp_delivery_status(
-        access_token=debtor_service_provider_token_a,
-        notice_number=message_payload["nav"],
-        payee_id=message_payload["ec_tax_code"],
+    delivery_response = wait_until(
+        action=lambda: get_rtp_delivery_status(
+            access_token=debtor_service_provider_token_a,
+            notice_number=message_payload["nav"],
+            payee_id=message_payload["ec_tax_code"],
+        ),
+        predicate=lambda response: response.json()["status"] == _STATUS_DELIVERED,
+        description="RTP delivery status PD_RTP_DELIVERED",
+        timeout_s=_SEND_PROCESSING_TIMEOUT_S,
     )
 
     assert delivery_response.status_code == 200, (
@@ -181,12 +185,15 @@ def test_get_delivery_status_error_send_rtp(
         f"got {send_response.status_code}: {send_response.text}"
     )
 
-    time.sleep(_SEND_PROCESSING_WAIT_S)
+    wait_until(
+        action=lambda: api_get_rtp_by_notice_number(rtp_reader_access_token, message_payload["nav"]),
+        predicate=lambda response: response.json()[-1]["status"] == "ERROR_SEND",
+        description="RTP status ERROR_SEND",
+        timeout_s=_SEND_PROCESSING_TIMEOUT_S,
+    )
 
     rtp = get_rtp_by_notice_number(rtp_reader_access_token, message_payload["nav"])
-    assert rtp.get("status") == "ERROR_SEND", (
-        f"Expected RTP status='ERROR_SEND', got status='{rtp.get('status')}'"
-    )
+    assert rtp.get("status") == "ERROR_SEND", f"Expected RTP status='ERROR_SEND', got status='{rtp.get('status')}'"
 
     error_send_event = next(
         (e for e in rtp.get("events", []) if e.get("triggerEvent") == "ERROR_SEND_RTP"),
@@ -256,7 +263,17 @@ def test_get_delivery_status_wrong_payee_id(
         f"GPD message send failed: {send_response.status_code} {send_response.text}"
     )
 
-    time.sleep(_SEND_PROCESSING_WAIT_S)
+    # Wait until the RTP is delivered for the right payee, so NOT_DELIVERED below is due to the payeeId filter
+    wait_until(
+        action=lambda: get_rtp_delivery_status(
+            access_token=debtor_service_provider_token_a,
+            notice_number=message_payload["nav"],
+            payee_id=message_payload["ec_tax_code"],
+        ),
+        predicate=lambda response: response.json()["status"] == _STATUS_DELIVERED,
+        description="RTP delivery status PD_RTP_DELIVERED",
+        timeout_s=_SEND_PROCESSING_TIMEOUT_S,
+    )
 
     delivery_response = get_rtp_delivery_status(
         access_token=debtor_service_provider_token_a,
@@ -1,10 +1,9 @@
-import time
-
 import allure
 import pytest
 
 from utils.dataset_debt_position_create import generate_debt_position_create_payload
 from utils.dataset_debt_position_update import generate_debt_position_update_payload
+from utils.polling_utils import wait_until
 
 
 @allure.epic("GPD Availability")
@@ -50,7 +49,13 @@ def test_delete_debt_position(gpd_test_data, environment):
     )
     assert create_response.status_code == 201, f"Expected 201 but got {create_response.status_code}"
 
-    time.sleep(1)
+    wait_until(
+        action=lambda: environment["get_function"](
+            gpd_test_data.subscription_key, gpd_test_data.organization_id, gpd_test_data.iupd
+        ),
+        predicate=lambda response: response.status_code == 200,
+        description="created debt position readable",
+    )
 
     delete_response = environment["delete_function"](
         gpd_test_data.subscription_key, gpd_test_data.organization_id, gpd_test_data.iupd
@@ -89,17 +94,20 @@ def test_update_debt_position(gpd_test_data, environment):
     )
     assert get_initial_response.status_code == 200, f"Expected 200 but got {get_initial_response.status_code}"
 
-    time.sleep(5)
-
     update_payload = generate_debt_position_update_payload(
         iupd=gpd_test_data.iupd, debtor_fc=gpd_test_data.debtor_fc, original_iuv=gpd_test_data.iuv
     )
 
-    update_response = environment["update_function"](
-        gpd_test_data.subscription_key,
-        gpd_test_data.organization_id,
-        gpd_test_data.iupd,
-        update_payload,
-        to_publish=True,
+    # The PUT is idempotent: retry it until the freshly published position accepts updates
+    update_response = wait_until(
+        action=lambda: environment["update_function"](
+            gpd_test_data.subscription_key,
+            gpd_test_data.organization_id,
+            gpd_test_data.iupd,
+            update_payload,
+            to_publish=True,
+        ),
+        predicate=lambda response: response.status_code == 200,
+        description="published debt position accepts updates",
     )
     assert update_response.status_code == 200, f"Expected 200 but got {update_response.status_code}"
@@ -13,6 +13,7 @@ from utils.dataset_gpd_message import generate_gpd_message_payload
 @allure.tag("functional", "gpd_message", "rtp_send")
 @pytest.mark.send
 @pytest.mark.happy_path
+@pytest.mark.xdist_group(name="idempotency")
 def test_send_gpd_message_create_idempotency(
     rtp_consumer_access_token, rtp_reader_access_token, random_fiscal_code, activate_payer
 ):
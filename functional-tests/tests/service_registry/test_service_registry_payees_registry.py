@@ -1,7 +1,10 @@
+import itertools
+
 import allure
 import pytest
 
 from api.service_registry_payee_registry_api import get_payee_registry
+from utils.pagination_utils import iter_payee_registry
 
 
 @allure.epic("Service Registry Payees")
@@ -55,3 +58,22 @@ def test_get_payees_invalid_auth():
     response = get_payee_registry("invalid_token")
 
     assert response.status_code == 401
+
+
+@allure.epic("Service Registry Payees")
+@allure.feature("Payees Registry")
+@allure.story("pagoPA retrieves payees registry")
+@allure.title("Payees registry stream reads pages in parallel, in order and without duplicates")
+@allure.tag("functional", "happy_path", "payees_registry")
+@pytest.mark.happy_path
+def test_iter_payee_registry_parallel_pages(pagopa_payee_registry_token):
+    page_size = 5
+    first_pages = get_payee_registry(pagopa_payee_registry_token, size=3 * page_size)
+    assert first_pages.status_code == 200
+    expected_ids = [payee["payeeId"] for payee in first_pages.json()["payees"]]
+
+    stream = iter_payee_registry(pagopa_payee_registry_token, size=page_size, parallel_pages=3)
+    streamed_ids = [payee["payeeId"] for payee in itertools.islice(stream, len(expected_ids))]
+
+    assert streamed_ids == expected_ids, "Expected the stream to match a single page of the same length"
+    assert stream.total_pages is not None and stream.total_pages > 0, "Expected totalPages from the first page"
@@ -1,4 +1,3 @@
-import time
 import uuid
 from datetime import UTC, datetime
 
@@ -10,6 +9,7 @@ from api.debtor_takeover_api import send_takeover_notification, takeover_activat
 from config.configuration import secrets
 from utils.activation_helpers import activate_with_sp_a, activate_with_sp_b
 from utils.http_utils import extract_id_from_location
+from utils.polling_utils import wait_until
 
 
 @allure.epic("Debtor Takeover")
@@ -19,6 +19,7 @@ from utils.http_utils import extract_id_from_location
 @allure.tag("functional", "happy_path", "activation", "takeover")
 @pytest.mark.functional
 @pytest.mark.happy_path
+@pytest.mark.xdist_group(name="takeover")
 def test_takeover_flow(random_fiscal_code, debtor_service_provider_token_a, debtor_service_provider_token_b):
     """Test the takeover flow where a user changes service provider"""
 
@@ -58,9 +59,13 @@ def test_takeover_flow(random_fiscal_code, debtor_service_provider_token_a, debt
     new_activation_id = extract_id_from_location(takeover_response.headers.get("Location"))
     assert new_activation_id is not None, "Missing Location header in takeover response"
 
-    time.sleep(1)
-
-    get_after_takeover = get_activation_by_id(debtor_service_provider_token_b, new_activation_id)
+    get_after_takeover = wait_until(
+        action=lambda: get_activation_by_id(debtor_service_provider_token_b, new_activation_id),
+        predicate=lambda response: (
+            response.json()["payer"]["rtpSpId"] == secrets.debtor_service_provider_B.service_provider_id
+        ),
+        description="activation moved to service provider B",
+    )
     assert get_after_takeover.status_code == 200, f"Failed to get activation after takeover: {get_after_takeover.text}"
 
     new_sp = get_after_takeover.json()["payer"]["rtpSpId"]
@@ -76,6 +81,7 @@ def test_takeover_flow(random_fiscal_code, debtor_service_provider_token_a, debt
 @pytest.mark.functional
 @allure.tag("functional", "happy_path", "activation", "takeover")
 @pytest.mark.happy_path
+@pytest.mark.xdist_group(name="takeover")
 def test_takeover_notification(random_fiscal_code):
     """Availability probe for takeover notification mock endpoint: expects 204 No Content"""
     old_activation_id = str(uuid.uuid4())
@@ -100,6 +106,7 @@ def test_takeover_notification(random_fiscal_code):
 @pytest.mark.functional
 @allure.tag("functional", "unhappy_path", "activation", "takeover")
 @pytest.mark.unhappy_path
+@pytest.mark.xdist_group(name="takeover")
 def test_takeover_fails_invalid_otp(
     random_fiscal_code, debtor_service_provider_token_a, debtor_service_provider_token_b
 ):
@@ -138,6 +145,7 @@ def test_takeover_fails_invalid_otp(
 @pytest.mark.functional
 @allure.tag("functional", "unhappy_path", "activation", "takeover")
 @pytest.mark.unhappy_path
+@pytest.mark.xdist_group(name="takeover")
 def test_takeover_with_unauthenticated_sp(
     random_fiscal_code, debtor_service_provider_token_a, debtor_service_provider_token_b
 ):
@@ -175,6 +183,7 @@ def test_takeover_with_unauthenticated_sp(
 @pytest.mark.functional
 @allure.tag("functional", "unhappy_path", "activation", "takeover")
 @pytest.mark.unhappy_path
+@pytest.mark.xdist_group(name="takeover")
 def test_takeover_otp_for_different_payer_fails(
     random_fiscal_code, debtor_service_provider_token_a, debtor_service_provider_token_b
 ):
@@ -203,6 +212,7 @@ def test_takeover_otp_for_different_payer_fails(
 @pytest.mark.functional
 @allure.tag("functional", "unhappy_path", "activation", "takeover")
 @pytest.mark.unhappy_path
+@pytest.mark.xdist_group(name="takeover")
 def test_takeover_without_prior_otp_fails(
     random_fiscal_code, debtor_service_provider_token_a, debtor_service_provider_token_b
 ):
@@ -228,6 +238,7 @@ def test_takeover_without_prior_otp_fails(
 @pytest.mark.functional
 @allure.tag("functional", "unhappy_path", "activation", "takeover")
 @pytest.mark.unhappy_path
+@pytest.mark.xdist_group(name="takeover")
 def test_takeover_empty_otp_bad_request(
     random_fiscal_code, debtor_service_provider_token_a, debtor_service_provider_token_b
 ):
@@ -250,6 +261,7 @@ def test_takeover_empty_otp_bad_request(
 @pytest.mark.functional
 @allure.tag("functional", "unhappy_path", "activation", "takeover")
 @pytest.mark.unhappy_path
+@pytest.mark.xdist_group(name="takeover")
 def test_takeover_with_token_of_wrong_sp_forbidden(
     random_fiscal_code, debtor_service_provider_token_a, debtor_service_provider_token_b
 ):
@@ -277,6 +289,7 @@ def test_takeover_with_token_of_wrong_sp_forbidden(
 @pytest.mark.functional
 @allure.tag("functional", "unhappy_path", "activation", "takeover")
 @pytest.mark.unhappy_path
+@pytest.mark.xdist_group(name="takeover")
 def test_takeover_reuse_otp_fails(random_fiscal_code, debtor_service_provider_token_a, debtor_service_provider_token_b):
     """Reusing the same OTP after a successful takeover should fail"""
     activation_response = activate_with_sp_a(debtor_service_provider_token_a, random_fiscal_code)
@@ -312,6 +325,7 @@ def test_takeover_reuse_otp_fails(random_fiscal_code, debtor_service_provider_to
 @pytest.mark.functional
 @allure.tag("functional", "unhappy_path", "activation", "takeover")
 @pytest.mark.unhappy_path
+@pytest.mark.xdist_group(name="takeover")
 def test_takeover_no_sense_body_but_valid_syntax(
     random_fiscal_code, debtor_service_provider_token_a, debtor_service_provider_token_b
 ):
@@ -2,6 +2,7 @@
 import uuid
 from pathlib import Path
 
+import json_codec
 import requests
 from auth import get_token
 from dotenv import find_dotenv, set_key
@@ -12,21 +13,45 @@ from config import ACTIVATION_BASE_URL
 ACTIVATION_URL = f"{ACTIVATION_BASE_URL}/activations"
 
 
-def activate_random_cf() -> str:
-    token = get_token()
-    rtp_sp_id = require_env("SERVICE_PROVIDER")
-    fiscal_code = random_fiscal_code()
-
-    headers = {
+def activation_headers(token: str) -> dict:
+    return {
         "Version": "v1",
         "RequestId": str(uuid.uuid4()),
         "Content-Type": "application/json",
         "Authorization": f"Bearer {token}",
     }
 
+
+# POST one activation; pass a pooled session when activating many fiscal codes
+def post_activation(
+    token: str, fiscal_code: str, rtp_sp_id: str, session: requests.Session | None = None
+) -> requests.Response:
     body = {"payer": {"fiscalCode": fiscal_code, "rtpSpId": rtp_sp_id}}
+    return (session or requests).post(
+        ACTIVATION_URL, headers=activation_headers(token), data=json_codec.dumps(body), timeout=15
+    )
+
+
+# Look up the activation ID of an already activated fiscal code (None when it is not ours or not found)
+def find_activation_id(token: str, fiscal_code: str, session: requests.Session | None = None) -> str | None:
+    headers = {
+        "Version": "v1",
+        "RequestId": str(uuid.uuid4()),
+        "payerId": fiscal_code,
+        "Authorization": f"Bearer {token}",
+    }
+    resp = (session or requests).get(f"{ACTIVATION_URL}/payer", headers=headers, timeout=15)
+    if resp.status_code != 200:
+        return None
+    return resp.json().get("id")
+
+
+def activate_random_cf() -> str:
+    token = get_token()
+    rtp_sp_id = require_env("SERVICE_PROVIDER")
+    fiscal_code = random_fiscal_code()
 
-    resp = requests.post(ACTIVATION_URL, headers=headers, json=body, timeout=15)
+    resp = post_activation(token, fiscal_code, rtp_sp_id)
     resp.raise_for_status()
 
     save_fiscal_code_to_env(fiscal_code)
@@ -1,4 +1,7 @@
 # auth.py
+import threading
+import time
+
 import requests
 from utilities import require_env
 
@@ -6,9 +9,16 @@ from config import AUTH_URL
 
 CLIENT_ID = require_env("DEBTOR_SERVICE_PROVIDER_CLIENT_ID")
 CLIENT_SECRET = require_env("DEBTOR_SERVICE_PROVIDER_CLIENT_SECRET")
+REFRESH_MARGIN_S = 60
+DEFAULT_EXPIRES_IN_S = 300
 
+# Process-wide cache: (token, refresh deadline on the monotonic clock), plus hit/miss counters
+_token_lock = threading.Lock()
+_cached_token: tuple[str, float] | None = None
+TOKEN_STATS = {"hits": 0, "misses": 0}
 
-def get_token() -> str:
+
+def fetch_token() -> tuple[str, float]:
     if not CLIENT_ID or not CLIENT_SECRET:
         raise RuntimeError("Missing CLIENT_ID or CLIENT_SECRET in environment variables")
 
@@ -19,7 +29,21 @@ def get_token() -> str:
         timeout=10,
     )
     resp.raise_for_status()
-    return resp.json()["access_token"]
+    body = resp.json()
+    return body["access_token"], float(body.get("expires_in", DEFAULT_EXPIRES_IN_S))
+
+
+# Return the cached token, fetching a new one REFRESH_MARGIN_S before `expires_in` runs out
+def get_token() -> str:
+    global _cached_token
+    with _token_lock:
+        if _cached_token and time.monotonic() < _cached_token[1]:
+            TOKEN_STATS["hits"] += 1
+            return _cached_token[0]
+        TOKEN_STATS["misses"] += 1
+        token, expires_in = fetch_token()
+        _cached_token = (token, time.monotonic() + max(expires_in - REFRESH_MARGIN_S, expires_in / 2))
+        return token
 
 
 if __name__ == "__main__":
@@ -1,15 +1,13 @@
 # send_to_gpd_queue.py
-import json
 from collections.abc import Iterable
 from datetime import UTC, datetime
 from pathlib import Path
 
-import requests
+import json_codec
 from dotenv import load_dotenv
+from gpd_file_upload import post_gpd_file, upload_failure
 from utilities import require_env, to_epoch_millis
 
-from config import GPD_TEST_BASE_URL
-
 load_dotenv()
 
 
@@ -17,10 +15,10 @@ def generate_create_records(out_dir: Path) -> Iterable[dict]:
     in_path = out_dir / "createRTP.ndjson"
     now = datetime.now(UTC)
     operation = "DELETE"
-    with in_path.open("r", encoding="utf-8", newline="\n") as file:
+    with in_path.open("rb") as file:
         for line in file:
             if line.strip():
-                data = json.loads(line)
+                data = json_codec.loads(line)
                 ts = to_epoch_millis(now)
                 yield {
                     "id": data["id"],
@@ -44,33 +42,17 @@ def write_file(out_dir: Path, rows: int) -> Path:
     out_path = out_dir / "deleteRTP.ndjson"
     records = generate_create_records(out_dir)
     written = 0
-    with out_path.open("w", encoding="utf-8", newline="\n") as f:
+    with out_path.open("wb") as f:
         for rec in records:
-            f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+            f.write(json_codec.ndjson_line(rec))
             written += 1
     if written == 0:
         raise SystemExit("No records written")
     return out_path
 
 
-def str_to_bool(val: str) -> bool:
-    return str(val).strip().lower() in {"1", "true", "yes", "y"}
-
-
 def cancel_file_to_api(path: Path) -> dict:
-    api_url = f"{GPD_TEST_BASE_URL}/send/gpd/file"
-    bulk = str_to_bool(require_env("BULK"))
-    rate = int(require_env("RATE"))
-    params = {"bulk": "true" if bulk else "false", "concurrency": str(rate)}
-
-    with path.open("rb") as fh:
-        files = {"file": (path.name, fh, "application/x-ndjson")}
-        resp = requests.post(api_url, params=params, files=files, timeout=300)
-    try:
-        resp.raise_for_status()
-    except requests.HTTPError:
-        raise SystemExit(f"HTTP {resp.status_code}: {resp.text.strip() or '<no body>'}")
-    return resp.json()
+    return post_gpd_file(path)
 
 
 def main() -> None:
@@ -81,7 +63,10 @@ def main() -> None:
     out_path = write_file(out_dir, rows)
     result = cancel_file_to_api(out_path)
     print("[uploader] Response:")
-    print(json.dumps(result, indent=2))
+    print(json_codec.dumps_str(result, indent=True))
+    failure = upload_failure(result)
+    if failure:
+        raise SystemExit(failure)
 
 
 if __name__ == "__main__":
@@ -1,16 +1,57 @@
 # cleanup_activation.py
-import json
+import os
+import time
 import uuid
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import json_codec
 import requests
 from auth import get_token
-from utilities import require_env
+from seed_activations import pooled_session, read_store
+from utilities import RateLimiter, require_env, require_env_or_default
 
 from config import ACTIVATION_BASE_URL
 
 ACTIVATION_PAYER_URL = f"{ACTIVATION_BASE_URL}/activations/payer"
 ACTIVATION_DELETE_URL = f"{ACTIVATION_BASE_URL}/activations"
+ACTIVATION_LIST_URL = f"{ACTIVATION_BASE_URL}/activations"
+
+# "" deactivates FISCAL_CODE only; "list" every activation of the service provider; "store" a seeded pool
+CLEANUP_SOURCE = require_env_or_default("CLEANUP_SOURCE", "").lower()
+CLEANUP_CONCURRENCY = int(require_env_or_default("CLEANUP_CONCURRENCY", "16"))
+CLEANUP_RATE = float(require_env_or_default("CLEANUP_RATE", "50"))
+CLEANUP_PAGE_SIZE = int(require_env_or_default("CLEANUP_PAGE_SIZE", "128"))
+SEED_STORE = require_env_or_default("SEED_STORE", "activations.ndjson")
+# Fixed payers the functional tests rely on (same variables as config/configuration.py), never deactivated in list mode
+FIXED_PAYER_ENV_VARS = (
+    "MOCK_ACTC_FISCAL_CODE",
+    "MOCK_RJCT_FISCAL_CODE",
+    "MOCK_NO_LINKS_FISCAL_CODE",
+    "MOCK_EXTRA_FIELD_FISCAL_CODE",
+    "MOCK_RJCT_EXTRA_FIELD_FISCAL_CODE",
+    "MOCK_RJCT_NO_LINKS_FISCAL_CODE",
+    "MOCK_SERVER_ERROR_FISCAL_CODE",
+    "MOCK_ACTC_FISCAL_CODE_V2",
+    "MOCK_RJCT_FISCAL_CODE_V2",
+    "MOCK_NO_LINKS_FISCAL_CODE_V2",
+    "MOCK_EXTRA_FIELD_FISCAL_CODE_V2",
+    "MOCK_RJCT_EXTRA_FIELD_FISCAL_CODE_V2",
+    "MOCK_RJCT_NO_LINKS_FISCAL_CODE_V2",
+    "MOCK_SERVER_ERROR_FISCAL_CODE_V2",
+    "CBI_ACTIVATED_FISCAL_CODE",
+    "POSTE_ACTIVATED_FISCAL_CODE",
+    "ICCREA_ACTIVATED_FISCAL_CODE",
+    "WEBPAGE_PAYER_FISCAL_CODE",
+)
+# Fiscal codes that list mode must never deactivate: the fixed payers above plus KEEP_FISCAL_CODES
+KEEP_FISCAL_CODES = {
+    fc.strip()
+    for fc in [*require_env_or_default("KEEP_FISCAL_CODES", "").split(","), *map(os.getenv, FIXED_PAYER_ENV_VARS)]
+    if fc and fc.strip()
+}
+PROGRESS_EVERY_S = 5.0
 
 
 # Get activation ID by fiscal code
@@ -26,7 +67,7 @@ def get_activation_id(token: str) -> str:
     resp.raise_for_status()
     data = resp.json()
     activation_id = data.get("id")
-    print(json.dumps({"activationId": activation_id}, indent=2))
+    print(json_codec.dumps_str({"activationId": activation_id}, indent=True))
     return activation_id
 
 
@@ -36,13 +77,146 @@ def deactivate_activation(token: str, activation_id: str):
     headers = {"Version": "v1", "RequestId": str(uuid.uuid4()), "Authorization": f"Bearer {token}"}
     resp = requests.delete(url, headers=headers, timeout=15)
     print(
-        json.dumps(
-            {"status": resp.status_code, "ok": resp.status_code == 200, "responseText": resp.text[:500]}, indent=2
+        json_codec.dumps_str(
+            {"status": resp.status_code, "ok": resp.status_code == 200, "responseText": resp.text[:500]}, indent=True
         )
     )
     resp.raise_for_status()
 
 
+# Cursor of the next page, looked up like utils/extract_next_activation_id.py: body metadata/page,
+# then the top level of the body, then the NextActivationId header
+def next_activation_id(resp: requests.Response, body: dict) -> str | None:
+    for key in ("metadata", "page"):
+        meta = body.get(key)
+        if isinstance(meta, dict) and meta.get("nextActivationId"):
+            return meta["nextActivationId"]
+    if body.get("nextActivationId"):
+        return body["nextActivationId"]
+    return resp.headers.get("NextActivationId")
+
+
+# Walk every page of the service provider's activations through the NextActivationId cursor
+def iter_activations(token: str, session: requests.Session, page_size: int = CLEANUP_PAGE_SIZE) -> Iterator[dict]:
+    cursor = None
+    while True:
+        headers = {"Version": "v1", "RequestId": str(uuid.uuid4()), "Authorization": f"Bearer {token}"}
+        if cursor:
+            headers["NextActivationId"] = cursor
+        resp = session.get(ACTIVATION_LIST_URL, headers=headers, params={"size": page_size}, timeout=15)
+        resp.raise_for_status()
+        body = resp.json()
+        yield from body.get("activations") or []
+        cursor = next_activation_id(resp, body)
+        if not cursor:
+            return
+
+
+# Collect (fiscalCode, activationId) pairs of every listed activation not in KEEP_FISCAL_CODES; the whole
+# list is read before deleting so that deactivations cannot invalidate the cursor
+def list_activation_pool(token: str, session: requests.Session) -> dict[str, str]:
+    pool = {}
+    for activation in iter_activations(token, session):
+        fiscal_code = (activation.get("payer") or {}).get("fiscalCode")
+        if fiscal_code not in KEEP_FISCAL_CODES:
+            pool[fiscal_code or activation["id"]] = activation["id"]
+    return pool
+
+
+# DELETE one activation; 404 means it is already gone. Transient errors are retried by the session adapter
+def deactivate_one(session: requests.Session, limiter: RateLimiter, activation_id: str) -> int:
+    limiter.wait()
+    headers = {"Version": "v1", "RequestId": str(uuid.uuid4()), "Authorization": f"Bearer {get_token()}"}
+    return session.delete(f"{ACTIVATION_DELETE_URL}/{activation_id}", headers=headers, timeout=15).status_code
+
+
+# Deactivate a pool of activations concurrently; returns the throughput summary and the pairs left behind
+def deactivate_pool(
+    pool: dict[str, str], session: requests.Session, concurrency: int = CLEANUP_CONCURRENCY, rate: float = CLEANUP_RATE
+) -> tuple[dict, dict[str, str]]:
+    limiter = RateLimiter(rate)
+    deleted = missing = 0
+    remaining = {}
+    started = last_progress = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(deactivate_one, session, limiter, activation_id): fiscal_code
+            for fiscal_code, activation_id in pool.items()
+        }
+        for future in as_completed(futures):
+            try:
+                status = future.result()
+            except requests.RequestException:
+                status = None
+            if status in (200, 204):
+                deleted += 1
+            elif status == 404:
+                missing += 1
+            else:
+                remaining[futures[future]] = pool[futures[future]]
+
+            now = time.monotonic()
+            if now - last_progress >= PROGRESS_EVERY_S:
+                last_progress = now
+                done = deleted + missing + len(remaining)
+                print(json_codec.dumps_str({"done": done, "of": len(pool), "perS": round(done / (now - started), 1)}))
+
+    elapsed = time.monotonic() - started
+    summary = {
+        "activations": len(pool),
+        "deactivated": deleted,
+        "alreadyGone": missing,
+        "failed": len(remaining),
+        "elapsedS": round(elapsed, 1),
+        "perS": round(len(pool) / elapsed, 1) if elapsed else None,
+    }
+    print(json_codec.dumps_str({"deactivation": summary}, indent=True))
+    return summary, remaining
+
+
+# Keep only the activations that could not be deactivated in the seed store, so a rerun retries them;
+# the seeding plan is dropped because its fiscal codes are no longer active
+def rewrite_store(store_path: Path, remaining: dict[str, str]) -> None:
+    store_path.with_name(f"{store_path.name}.plan.json").unlink(missing_ok=True)
+    if not remaining:
+        store_path.unlink(missing_ok=True)
+        return
+    tmp_path = store_path.with_name(f"{store_path.name}.tmp")
+    with tmp_path.open("wb") as f:
+        for fiscal_code, activation_id in remaining.items():
+            f.write(json_codec.ndjson_line({"fiscalCode": fiscal_code, "activationId": activation_id}))
+    os.replace(tmp_path, store_path)
+
+
+def cleanup_activation_pool(source: str) -> dict:
+    with pooled_session(CLEANUP_CONCURRENCY) as session:
+        if source == "store":
+            store_path = Path(SEED_STORE)
+            pool = read_store(store_path)
+        elif source == "list":
+            if not KEEP_FISCAL_CODES:
+                raise SystemExit(
+                    "CLEANUP_SOURCE=list needs the fixed payers to keep: set the MOCK_*_FISCAL_CODE variables "
+                    "or KEEP_FISCAL_CODES"
+                )
+            pool = list_activation_pool(get_token(), session)
+        else:
+            raise SystemExit(f"Unknown CLEANUP_SOURCE {source!r}: expected 'list' or 'store'")
+
+        print(json_codec.dumps_str({"source": source, "activations": len(pool), "kept": sorted(KEEP_FISCAL_CODES)}))
+        if not pool:
+            return {"activations": 0}
+        confirmation = input(f"Deactivate {len(pool)} activations? (y/n): ").lower().strip()
+        if confirmation not in ["y", "yes"]:
+            print("Deactivation cancelled by user.")
+            return {"activations": len(pool), "cancelled": True}
+
+        summary, remaining = deactivate_pool(pool, session)
+    if source == "store":
+        rewrite_store(store_path, remaining)
+    return summary
+
+
 # Remove local JSON/ZIP artifacts named testRTP-*.json|zip under OUT_DIR
 def cleanup_local_artifacts() -> dict:
     out_dir = Path(require_env("OUT_DIR")).expanduser().resolve()
@@ -57,11 +231,15 @@ def cleanup_local_artifacts() -> dict:
                 except Exception as e:
                     deleted.append(f"FAILED:{p} -> {e}")
     summary = {"outDir": str(out_dir), "deletedCount": len(deleted), "items": deleted}
-    print(json.dumps({"cleanup": summary}, indent=2))
+    print(json_codec.dumps_str({"cleanup": summary}, indent=True))
     return summary
 
 
 def main():
+    if CLEANUP_SOURCE:
+        cleanup_activation_pool(CLEANUP_SOURCE)
+        return
+
     token = get_token()
     try:
         activation_id = get_activation_id(token)
@@ -1,30 +1,385 @@
+import math
+import os
+import re
+import threading
 import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import UTC, datetime
+from pathlib import Path
 
+import json_codec
 import pymongo
+from bson import ObjectId, json_util
+from pymongo.collection import Collection
 from pymongo.errors import ConnectionFailure, OperationFailure
-from utilities import require_env
+from utilities import require_env, require_env_or_default
 
 # --- Configuration ---
 CONNECTION_STRING = require_env("COSMOS_DB_CONNECTION_STRING")
 DATABASE_NAME = "rtp"
 COLLECTION_NAME = "rtps"
-BATCH_SIZE = 20
+BATCH_SIZE = int(require_env_or_default("BATCH_SIZE", "100"))
+MIN_BATCH_SIZE = 10
+MAX_BATCH_SIZE = int(require_env_or_default("MAX_BATCH_SIZE", "1000"))
+MAX_CONCURRENCY = int(require_env_or_default("MAX_CONCURRENCY", "8"))
 SECONDS_TO_SLEEP = 1
+PROGRESS_INTERVAL_S = 5
 SERVICE_PROVIDER_DEBTOR = require_env("SERVICE_PROVIDER")
+# Partitioned mode: "" (single range cursor), "objectid" (_id creation windows) or "operationid" (mongolist.ndjson)
+CLEANUP_PARTITION_BY = require_env_or_default("CLEANUP_PARTITION_BY", "").lower()
+PARTITIONS = int(require_env_or_default("PARTITIONS", "8"))
+MONGO_LIST_FILE = require_env_or_default("MONGO_LIST_FILE", "mongolist.ndjson")
+CHECKPOINT_FILE = require_env_or_default("CHECKPOINT_FILE", "cleanup_checkpoint.json")
+CHECKPOINT_INTERVAL_S = float(require_env_or_default("CHECKPOINT_INTERVAL_S", "2"))
+
+# Cosmos DB for MongoDB reports RU exhaustion as error 16500 (HTTP 429 "Request rate is large")
+THROTTLING_ERROR_CODES = {16500, 429}
+RETRY_AFTER_PATTERN = re.compile(r"RetryAfterMs=(\d+)")
+
+
+def is_throttling_error(error: OperationFailure) -> bool:
+    message = str(error)
+    return error.code in THROTTLING_ERROR_CODES or "TooManyRequests" in message or "Request rate is large" in message
+
+
+def retry_after_seconds(error: OperationFailure, default: float) -> float:
+    match = RETRY_AFTER_PATTERN.search(str(error))
+    return int(match.group(1)) / 1000 if match else default
+
+
+class AdaptiveThrottle:
+    """
+    Additive-increase / multiplicative-decrease control of batch size and in-flight deletes.
+
+    Every throttled request halves both values and pushes back the next request; every
+    `grow_after` consecutive successes add one worker and `MIN_BATCH_SIZE` documents per batch.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = BATCH_SIZE,
+        concurrency: int = 2,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_concurrency: int = MAX_CONCURRENCY,
+        grow_after: int = 5,
+    ):
+        self.batch_size = max(MIN_BATCH_SIZE, min(batch_size, max_batch_size))
+        self.concurrency = max(1, min(concurrency, max_concurrency))
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max_concurrency
+        self.grow_after = grow_after
+        self.throttled_count = 0
+        self._successes = 0
+        self._backoff_s = 0.0
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._backoff_s = 0.0
+            self._successes += 1
+            if self._successes >= self.grow_after:
+                self._successes = 0
+                self.batch_size = min(self.max_batch_size, self.batch_size + MIN_BATCH_SIZE)
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+
+    def on_throttled(self, retry_after_s: float) -> None:
+        with self._lock:
+            self.throttled_count += 1
+            self._successes = 0
+            self.batch_size = max(MIN_BATCH_SIZE, self.batch_size // 2)
+            self.concurrency = max(1, self.concurrency // 2)
+            self._backoff_s = min(30.0, max(retry_after_s, self._backoff_s * 2 or SECONDS_TO_SLEEP))
+            self._resume_at = max(self._resume_at, time.monotonic() + self._backoff_s)
+
+    def wait_turn(self) -> None:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def call_with_backoff(operation: Callable[[], object], throttle: AdaptiveThrottle) -> object:
+    while True:
+        throttle.wait_turn()
+        try:
+            result = operation()
+        except OperationFailure as e:
+            if not is_throttling_error(e):
+                raise
+            throttle.on_throttled(retry_after_seconds(e, SECONDS_TO_SLEEP))
+            continue
+        throttle.on_success()
+        return result
+
+
+def iter_id_pages(
+    collection: Collection, query_filter: dict, throttle: AdaptiveThrottle, start_after: object = None
+) -> Iterator[list]:
+    """Yield pages of matching `_id`s in ascending order, resuming each page after the last `_id` seen."""
+    last_id = start_after
+    while True:
+        page_filter = query_filter if last_id is None else {"$and": [query_filter, {"_id": {"$gt": last_id}}]}
+        page_size = throttle.batch_size
+        ids = call_with_backoff(
+            lambda: [doc["_id"] for doc in collection.find(page_filter, {"_id": 1}).sort("_id", 1).limit(page_size)],
+            throttle,
+        )
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def delete_batch(collection: Collection, ids: list, throttle: AdaptiveThrottle) -> int:
+    return call_with_backoff(lambda: collection.delete_many({"_id": {"$in": ids}}).deleted_count, throttle)
+
+
+def print_progress(deleted: int, total: int, started: float) -> None:
+    elapsed = time.monotonic() - started
+    rate = deleted / elapsed if elapsed > 0 else 0.0
+    remaining = max(total - deleted, 0)
+    eta = f"{remaining / rate:.0f}s" if rate > 0 else "n/a"
+    print(f"-> Deleted {deleted}/{total} documents ({rate:.1f} docs/s, ETA {eta}).")
+
+
+def delete_concurrently(
+    collection: Collection, query_filter: dict, total: int, throttle: AdaptiveThrottle | None = None
+) -> int:
+    """
+    Delete every document matching `query_filter`, keeping up to `throttle.concurrency`
+    `delete_many` batches in flight, and return the number of deleted documents.
+    """
+    throttle = throttle or AdaptiveThrottle()
+    started = last_report = time.monotonic()
+    deleted = 0
+    in_flight: set[Future] = set()
+
+    def collect(done: set[Future]) -> None:
+        nonlocal deleted
+        for future in done:
+            deleted += future.result()
+
+    with ThreadPoolExecutor(max_workers=throttle.max_concurrency) as pool:
+        for ids in iter_id_pages(collection, query_filter, throttle):
+            while len(in_flight) >= throttle.concurrency:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(pool.submit(delete_batch, collection, ids, throttle))
+
+            if time.monotonic() - last_report >= PROGRESS_INTERVAL_S:
+                last_report = time.monotonic()
+                print_progress(deleted, total, started)
+        done, _ = wait(in_flight)
+        collect(done)
+
+    print_progress(deleted, total, started)
+    print(
+        f"   Final batch size {throttle.batch_size}, concurrency {throttle.concurrency}, "
+        f"throttled {throttle.throttled_count} times."
+    )
+    return deleted
+
+
+def objectid_partitions(collection: Collection, query_filter: dict, partitions: int) -> list[dict]:
+    """Split the matching documents into `_id` ranges covering equal windows of ObjectId creation time."""
+    first = collection.find_one(query_filter, {"_id": 1}, sort=[("_id", 1)])
+    last = collection.find_one(query_filter, {"_id": 1}, sort=[("_id", -1)])
+    if first is None:
+        return []
+    if not isinstance(first["_id"], ObjectId) or not isinstance(last["_id"], ObjectId):
+        raise SystemExit("CLEANUP_PARTITION_BY=objectid requires ObjectId _id values; use operationid instead")
+
+    start = first["_id"].generation_time.timestamp()
+    end = last["_id"].generation_time.timestamp() + 1
+    step = (end - start) / partitions
+    bounds = sorted({ObjectId.from_datetime(datetime.fromtimestamp(start + i * step, UTC)) for i in range(partitions)})
+    ranges = [{"$gte": low, "$lt": high} for low, high in zip(bounds, bounds[1:])] + [{"$gte": bounds[-1]}]
+    return [{"$and": [query_filter, {"_id": id_range}]} for id_range in ranges]
+
+
+def operation_id_partitions(query_filter: dict, mongo_list_path: Path, partitions: int) -> list[dict]:
+    """Split the operationIds listed by send_to_gpd_queue.generate_search_file into disjoint `$in` lists."""
+    operation_ids = json_codec.loads(mongo_list_path.read_bytes())["operationId"]["$in"]
+    size = max(1, math.ceil(len(operation_ids) / partitions))
+    # operationIds are random digits: keep the service provider filter so other providers' documents are never hit
+    return [
+        {"$and": [query_filter, {"operationId": {"$in": operation_ids[i : i + size]}}]}
+        for i in range(0, len(operation_ids), size)
+    ]
+
+
+class CleanupCheckpoint:
+    """
+    On-disk progress of a partitioned cleanup. The partition filters (which hold the whole operationId
+    list in operationid mode) are written once to a `.plan` file next to the checkpoint; the checkpoint
+    itself only holds per-partition initial count, deleted documents, last deleted `_id` and completion
+    flag. Progress is saved at most every CHECKPOINT_INTERVAL_S and whenever a partition completes;
+    resuming from a slightly older `_id` only rescans documents that are already gone.
+    """
+
+    def __init__(self, path: Path, plan_key: str, filters: list[dict], progress: list[dict]):
+        self.path = path
+        self.plan_key = plan_key
+        self.filters = filters
+        self.partitions = progress
+        self._lock = threading.Lock()
+        self._saved_at = 0.0
+
+    @staticmethod
+    def plan_path(path: Path) -> Path:
+        return path.with_name(f"{path.name}.plan")
+
+    @classmethod
+    def load(cls, path: Path, plan_key: str) -> "CleanupCheckpoint | None":
+        plan_path = cls.plan_path(path)
+        if not path.exists() or not plan_path.exists():
+            return None
+        state = json_util.loads(path.read_text(encoding="utf-8"))
+        if state.get("planKey") != plan_key:
+            return None
+        plan = json_util.loads(plan_path.read_text(encoding="utf-8"))
+        if plan.get("planKey") != plan_key or len(plan["filters"]) != len(state["partitions"]):
+            return None
+        return cls(path, plan_key, plan["filters"], state["partitions"])
+
+    @classmethod
+    def create(cls, path: Path, plan_key: str, collection: Collection, filters: list[dict]) -> "CleanupCheckpoint":
+        progress = []
+        for partition_filter in filters:
+            total = collection.count_documents(partition_filter)
+            progress.append({"total": total, "deleted": 0, "lastId": None, "done": total == 0})
+        checkpoint = cls(path, plan_key, filters, progress)
+        write_atomically(cls.plan_path(path), json_util.dumps({"planKey": plan_key, "filters": filters}))
+        checkpoint.save()
+        return checkpoint
+
+    @property
+    def total(self) -> int:
+        return sum(partition["total"] for partition in self.partitions)
+
+    @property
+    def deleted(self) -> int:
+        return sum(partition["deleted"] for partition in self.partitions)
+
+    def pending(self) -> list[int]:
+        return [index for index, partition in enumerate(self.partitions) if not partition["done"]]
+
+    def record(self, index: int, last_id: object, deleted: int) -> None:
+        with self._lock:
+            self.partitions[index]["lastId"] = last_id
+            self.partitions[index]["deleted"] += deleted
+            if time.monotonic() - self._saved_at >= CHECKPOINT_INTERVAL_S:
+                self.save()
+
+    def finish(self, index: int) -> None:
+        with self._lock:
+            self.partitions[index]["done"] = True
+            self.save()
+
+    def flush(self) -> None:
+        with self._lock:
+            self.save()
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.plan_path(self.path).unlink(missing_ok=True)
+
+    # Callers hold the lock (or own the checkpoint exclusively); the state is a few fields per partition
+    def save(self) -> None:
+        write_atomically(self.path, json_util.dumps({"planKey": self.plan_key, "partitions": self.partitions}))
+        self._saved_at = time.monotonic()
+
+
+def write_atomically(path: Path, text: str) -> None:
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def delete_partition(
+    collection: Collection, checkpoint: CleanupCheckpoint, index: int, throttle: AdaptiveThrottle
+) -> None:
+    partition = checkpoint.partitions[index]
+    for ids in iter_id_pages(collection, checkpoint.filters[index], throttle, start_after=partition["lastId"]):
+        checkpoint.record(index, ids[-1], delete_batch(collection, ids, throttle))
+    checkpoint.finish(index)
+
+
+def delete_partitions(collection: Collection, checkpoint: CleanupCheckpoint, workers: int = MAX_CONCURRENCY) -> int:
+    """Delete every pending partition on its own worker and return the documents deleted by this run."""
+    throttle = AdaptiveThrottle(max_concurrency=workers)
+    deleted_before = checkpoint.deleted
+    started = time.monotonic()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(delete_partition, collection, checkpoint, index, throttle) for index in checkpoint.pending()
+            }
+            while futures:
+                done, futures = wait(futures, timeout=PROGRESS_INTERVAL_S, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+                if not done:
+                    print_progress(checkpoint.deleted - deleted_before, checkpoint.total - deleted_before, started)
+    finally:
+        # Persist the progress recorded since the last throttled save
+        checkpoint.flush()
+
+    print_progress(checkpoint.deleted - deleted_before, checkpoint.total - deleted_before, started)
+    print(
+        f"   Partitions completed: {len(checkpoint.partitions) - len(checkpoint.pending())}/{len(checkpoint.partitions)}."
+    )
+    if not checkpoint.pending():
+        # A finished plan must not be resumed: the next run plans new partitions (and new documents) from scratch
+        checkpoint.remove()
+    return checkpoint.deleted - deleted_before
+
+
+def partition_plan_key() -> str:
+    """Return the checkpoint plan key of CLEANUP_PARTITION_BY."""
+    if CLEANUP_PARTITION_BY == "objectid":
+        return f"objectid:{SERVICE_PROVIDER_DEBTOR}:{PARTITIONS}"
+    if CLEANUP_PARTITION_BY == "operationid":
+        mongo_list_path = Path(MONGO_LIST_FILE).expanduser().resolve()
+        return f"operationid:{mongo_list_path}:{mongo_list_path.stat().st_mtime_ns}:{PARTITIONS}"
+    raise SystemExit("CLEANUP_PARTITION_BY must be objectid or operationid")
+
+
+def build_partition_filters(collection: Collection, query_filter: dict) -> list[dict]:
+    """Return the partition filters for CLEANUP_PARTITION_BY."""
+    if CLEANUP_PARTITION_BY == "objectid":
+        return objectid_partitions(collection, query_filter, PARTITIONS)
+    return operation_id_partitions(query_filter, Path(MONGO_LIST_FILE).expanduser().resolve(), PARTITIONS)
+
+
+def load_or_plan_checkpoint(collection: Collection, query_filter: dict) -> CleanupCheckpoint:
+    checkpoint_path = Path(CHECKPOINT_FILE).expanduser().resolve()
+    plan_key = partition_plan_key()
+    checkpoint = CleanupCheckpoint.load(checkpoint_path, plan_key)
+    if checkpoint is not None:
+        print(
+            f"Resuming from {checkpoint_path}: {len(checkpoint.partitions) - len(checkpoint.pending())}/"
+            f"{len(checkpoint.partitions)} partitions done, {checkpoint.deleted} documents already deleted."
+        )
+        return checkpoint
+    return CleanupCheckpoint.create(
+        checkpoint_path, plan_key, collection, build_partition_filters(collection, query_filter)
+    )
 
 
 def delete_test_records_with_confirmation():
     """
     Connects to Cosmos DB, counts matching records, asks for user confirmation,
-    and then deletes the records in batches if confirmed.
+    and then deletes the records in concurrent batches if confirmed.
     """
     client = None
-    total_deleted_count = 0
 
     try:
         # --- 1. Connect to the Database ---
         print("Attempting to connect to Cosmos DB...")
-        client = pymongo.MongoClient(CONNECTION_STRING)
+        client = pymongo.MongoClient(CONNECTION_STRING, maxPoolSize=MAX_CONCURRENCY + 1)
         client.admin.command("ping")
         print("Connection established successfully!")
 
@@ -35,8 +390,14 @@ def delete_test_records_with_confirmation():
         # --- 2. Count Records and Ask for Confirmation ---
         print("\n🔍 Searching for documents to delete...")
 
-        # Use count_documents for an efficient count without fetching all the data
-        document_count = collection.count_documents(query_filter)
+        checkpoint = None
+        if CLEANUP_PARTITION_BY:
+            # Partition counts are stored in the checkpoint, so a resumed run does not recount them
+            checkpoint = load_or_plan_checkpoint(collection, query_filter)
+            document_count = checkpoint.total - checkpoint.deleted
+        else:
+            # Use count_documents for an efficient count without fetching all the data
+            document_count = collection.count_documents(query_filter)
 
         if document_count == 0:
             print("✅ No documents found with the specified criteria. Nothing to do.")
@@ -51,27 +412,10 @@ def delete_test_records_with_confirmation():
         if confirmation in ["y", "yes"]:
             print("\nUser confirmed. Starting deletion process...")
 
-            # The batched deletion loop
-            while total_deleted_count < document_count:
-                # Find the _ids of a batch of documents
-                documents_to_delete = list(collection.find(query_filter, {"_id": 1}).limit(BATCH_SIZE))
-
-                if not documents_to_delete:
-                    # This is a safeguard; the loop should naturally end.
-                    break
-
-                ids_to_delete = [doc["_id"] for doc in documents_to_delete]
-
-                # Delete the current batch
-                result = collection.delete_many({"_id": {"$in": ids_to_delete}})
-
-                deleted_count = result.deleted_count
-                total_deleted_count += deleted_count
-
-                print(f"-> Deleted batch of {deleted_count} documents. Total so far: {total_deleted_count}.")
-
-                # Sleep to avoid overwhelming the database
-                time.sleep(SECONDS_TO_SLEEP)
+            if checkpoint is not None:
+                total_deleted_count = delete_partitions(collection, checkpoint)
+            else:
+                total_deleted_count = delete_concurrently(collection, query_filter, document_count)
 
             print(f"\n🎉 Operation completed! Total documents deleted: {total_deleted_count}.")
 
@@ -1,13 +1,26 @@
 # generate_massive_zip.py
 import argparse
-import json
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import repeat
 from pathlib import Path
-from zipfile import ZIP_DEFLATED, ZipFile
-
-from utilities import calculate_dates, get_current_timestamp, random_iupd, random_iuv, require_env
+from zipfile import ZIP64_LIMIT, ZIP_DEFLATED, ZipFile
+
+import json_codec
+from utilities import (
+    calculate_dates,
+    get_current_timestamp,
+    random_iupd,
+    random_iupd_batch,
+    random_iuv,
+    random_iuv_batch,
+    require_env,
+)
 
 BASENAME_PREFIX = "testRTP-"
 BASENAME_DELETE_PREFIX = "testRTPDelete-"
+IUPD_PREFIX = "testMassiveRTP"
+STREAM_CHUNK_ROWS = 10_000
 
 
 # Build one payment position row
@@ -63,14 +76,35 @@ def generate_massive_zip(fiscal_code: str) -> dict:
     out_path = Path(out_dir).expanduser().resolve()
     out_path.mkdir(parents=True, exist_ok=True)
 
-    payment_positions = [build_payment_option_row(fiscal_code, random_iupd(), random_iuv()) for _ in range(rows)]
-    payload = {"paymentPositions": payment_positions}
+    paths = stream_files(fiscal_code, rows, out_path)
+    return build_summary(paths, rows, fiscal_code)
+
 
-    iupds = [p["iupd"] for p in payment_positions]
-    delete_body = {"paymentPositionIUPDs": iupds}
-    json_path_delete, zip_path_delete = write_files(delete_body, out_path, BASENAME_DELETE_PREFIX)
+# Split ROWS into files of at most rows_per_file rows, generated in parallel processes; returns one summary per file
+def generate_massive_zip_shards(fiscal_code: str, rows_per_file: int, workers: int) -> list[dict]:
+    rows = int(require_env("ROWS"))
+    out_path = Path(require_env("OUT_DIR")).expanduser().resolve()
+    out_path.mkdir(parents=True, exist_ok=True)
 
-    json_path, zip_path = write_files(payload, out_path, BASENAME_PREFIX)
+    sizes = [min(rows_per_file, rows - start) for start in range(0, rows, rows_per_file)]
+    suffixes = [f"-{i:04d}" for i in range(len(sizes))]
+    # A fixed-width shard number in the IUPD prefix keeps the shards' IUPDs disjoint
+    iupd_prefixes = [f"{IUPD_PREFIX}{i:04d}" for i in range(len(sizes))]
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(sizes)))) as pool:
+        shard_paths = pool.map(
+            stream_files,
+            repeat(fiscal_code),
+            sizes,
+            repeat(out_path),
+            repeat(STREAM_CHUNK_ROWS),
+            suffixes,
+            iupd_prefixes,
+        )
+        return [build_summary(paths, size, fiscal_code) for paths, size in zip(shard_paths, sizes)]
+
+
+def build_summary(paths: tuple[Path, Path, Path, Path], rows: int, fiscal_code: str) -> dict:
+    json_path, zip_path, json_path_delete, zip_path_delete = paths
     return {
         "jsonPath": str(json_path),
         "zipPath": str(zip_path),
@@ -81,23 +115,68 @@ def generate_massive_zip(fiscal_code: str) -> dict:
     }
 
 
-# Write JSON and ZIP files with same basename; returns (json_path, zip_path)
-def write_files(payload: dict, out_dir: Path, file_name_prefix) -> tuple[Path, Path]:
-    stamp = get_current_timestamp()
-    basename = f"{file_name_prefix}{stamp}"
-    json_name = f"{basename}.json"
-    zip_name = f"{basename}.zip"
-
-    json_path = out_dir / json_name
-    zip_path = out_dir / zip_name
-
-    json_bytes = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-
-    json_path.write_bytes(json_bytes)
-    with ZipFile(zip_path, "w", compression=ZIP_DEFLATED) as zf:
-        zf.writestr(json_name, json_bytes)
-
-    return json_path, zip_path
+# Writes the same bytes to a JSON file and to a same-named entry of a ZIP archive
+class JsonZipWriter:
+    def __init__(self, out_dir: Path, basename: str, force_zip64: bool = False):
+        self.json_path = out_dir / f"{basename}.json"
+        self.zip_path = out_dir / f"{basename}.zip"
+        self._force_zip64 = force_zip64
+        self._stack = ExitStack()
+
+    def __enter__(self) -> "JsonZipWriter":
+        self._json_file = self._stack.enter_context(self.json_path.open("wb"))
+        zip_file = self._stack.enter_context(ZipFile(self.zip_path, "w", compression=ZIP_DEFLATED))
+        self._zip_entry = self._stack.enter_context(
+            zip_file.open(self.json_path.name, "w", force_zip64=self._force_zip64)
+        )
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stack.__exit__(*exc_info)
+
+    def write(self, data: bytes) -> None:
+        self._json_file.write(data)
+        self._zip_entry.write(data)
+
+
+# Stream the create and delete payloads row by row into their JSON and ZIP files in a single pass,
+# so memory depends on chunk_rows (plus the set of used IUPDs) and not on the row payloads;
+# returns (json, zip, json_delete, zip_delete)
+def stream_files(
+    fiscal_code: str,
+    rows: int,
+    out_dir: Path,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+    basename_suffix: str = "",
+    iupd_prefix: str = IUPD_PREFIX,
+) -> tuple[Path, Path, Path, Path]:
+    stamp = f"{get_current_timestamp()}{basename_suffix}"
+    sample_row = json_codec.dumps(build_payment_option_row(fiscal_code, random_iupd(), random_iuv()))
+    # Entries whose final size is unknown need ZIP64 headers up front when they may exceed 2 GiB
+    force_zip64 = (len(sample_row) + 1) * rows >= ZIP64_LIMIT
+
+    with (
+        JsonZipWriter(out_dir, f"{BASENAME_PREFIX}{stamp}", force_zip64) as create,
+        JsonZipWriter(out_dir, f"{BASENAME_DELETE_PREFIX}{stamp}") as delete,
+    ):
+        create.write(b'{"paymentPositions":[')
+        delete.write(b'{"paymentPositionIUPDs":[')
+        separator = b""
+        # IUPDs must be unique in the whole file, not only within a chunk
+        used_iupds: set[str] = set()
+        for start in range(0, rows, chunk_rows):
+            count = min(chunk_rows, rows - start)
+            iupds = random_iupd_batch(count, prefix=iupd_prefix, exclude=used_iupds)
+            positions = (
+                build_payment_option_row(fiscal_code, iupd, iuv) for iupd, iuv in zip(iupds, random_iuv_batch(count))
+            )
+            create.write(separator + b",".join(map(json_codec.dumps, positions)))
+            delete.write(separator + b",".join(map(json_codec.dumps, iupds)))
+            separator = b","
+        create.write(b"]}")
+        delete.write(b"]}")
+
+    return create.json_path, create.zip_path, delete.json_path, delete.zip_path
 
 
 # Parse command-line arguments
@@ -111,7 +190,7 @@ def parse_args() -> argparse.Namespace:
 def main():
     args = parse_args()
     summary = generate_massive_zip(args.fiscal_code)
-    print(json.dumps(summary, indent=2))
+    print(json_codec.dumps_str(summary, indent=True))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,224 @@
+# gpd_file_upload.py
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from utilities import require_env, require_env_or_default
+
+from config import GPD_TEST_BASE_URL
+
+GPD_FILE_URL = f"{GPD_TEST_BASE_URL}/send/gpd/file"
+UPLOAD_TIMEOUT_S = 300
+READ_BLOCK_SIZE = 1024 * 1024
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+def str_to_bool(val: str) -> bool:
+    return str(val).strip().lower() in {"1", "true", "yes", "y"}
+
+
+# One contiguous, newline-aligned byte range of an NDJSON file
+@dataclass(frozen=True)
+class NdjsonPart:
+    index: int
+    start: int
+    end: int
+    rows: int
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+class MultipartFileRange:
+    """multipart/form-data body exposing one byte range of a file as a single file field.
+
+    The body is produced on demand through ``read``, so requests streams it with a known
+    Content-Length and never holds more than one block of the file in memory.
+    """
+
+    def __init__(self, path: Path, part: NdjsonPart, field_name: str = "file", content_type: str = NDJSON_CONTENT_TYPE):
+        self.boundary = uuid.uuid4().hex
+        file_name = f"{path.stem}.part-{part.index:05d}{path.suffix}"
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{file_name}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+        self._file = path.open("rb")
+        self._file.seek(part.start)
+        self._remaining = part.size
+        self._buffer = self._head
+        self._tail_sent = False
+        self.len = len(self._head) + part.size + len(self._tail)
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self.len
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.len
+        chunks = []
+        wanted = size
+        while wanted > 0:
+            if not self._buffer:
+                if self._remaining > 0:
+                    self._buffer = self._file.read(min(self._remaining, max(wanted, READ_BLOCK_SIZE)))
+                    if not self._buffer:
+                        raise OSError("NDJSON file shrank while being uploaded")
+                    self._remaining -= len(self._buffer)
+                elif not self._tail_sent:
+                    self._buffer = self._tail
+                    self._tail_sent = True
+                else:
+                    break
+            chunk, self._buffer = self._buffer[:wanted], self._buffer[wanted:]
+            chunks.append(chunk)
+            wanted -= len(chunk)
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+# Split an NDJSON file into newline-aligned parts bounded by rows and/or bytes (0 = unbounded)
+def split_ndjson_parts(path: Path, max_rows: int = 0, max_bytes: int = 0) -> list[NdjsonPart]:
+    parts: list[NdjsonPart] = []
+    start = offset = rows = 0
+    with path.open("rb") as f:
+        for line in f:
+            rows_full = max_rows and rows >= max_rows
+            bytes_full = max_bytes and offset + len(line) - start > max_bytes
+            if rows and (rows_full or bytes_full):
+                parts.append(NdjsonPart(len(parts), start, offset, rows))
+                start, rows = offset, 0
+            offset += len(line)
+            if line.strip():
+                rows += 1
+    if rows:
+        parts.append(NdjsonPart(len(parts), start, offset, rows))
+    return parts
+
+
+def gpd_file_params() -> dict:
+    bulk = str_to_bool(require_env("BULK"))
+    rate = int(require_env("RATE"))
+    return {"bulk": "true" if bulk else "false", "concurrency": str(rate)}
+
+
+def _response_body(resp: requests.Response) -> dict | list | str:
+    try:
+        return resp.json()
+    except ValueError:
+        return resp.text
+
+
+# Send one part and return its outcome; HTTP and transport errors (connection, timeout) are reported, not raised,
+# so one failing part cannot abort the others
+def upload_part(session: requests.Session, url: str, path: Path, part: NdjsonPart, params: dict) -> dict:
+    body = MultipartFileRange(path, part)
+    started = time.perf_counter()
+    result = {"part": part.index, "rows": part.rows, "bytes": part.size}
+    try:
+        resp = session.post(
+            url, params=params, data=body, headers={"Content-Type": body.content_type}, timeout=UPLOAD_TIMEOUT_S
+        )
+    except requests.RequestException as e:
+        return {
+            **result,
+            "status": None,
+            "ok": False,
+            "latencyMs": round((time.perf_counter() - started) * 1000, 1),
+            "response": str(e),
+        }
+    finally:
+        body.close()
+    return {
+        **result,
+        "status": resp.status_code,
+        "ok": resp.ok,
+        "latencyMs": round((time.perf_counter() - started) * 1000, 1),
+        "response": _response_body(resp),
+    }
+
+
+# Sum the numeric top-level fields of every JSON object response (e.g. processed/failed counters)
+def aggregate_responses(results: list[dict]) -> dict:
+    totals: dict[str, int | float] = {}
+    for result in results:
+        if isinstance(result["response"], dict):
+            for key, value in result["response"].items():
+                if isinstance(value, int | float) and not isinstance(value, bool):
+                    totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def upload_ndjson_in_parts(
+    url: str, path: Path, params: dict, part_rows: int = 0, part_bytes: int = 0, workers: int = 4
+) -> dict:
+    parts = split_ndjson_parts(path, part_rows, part_bytes)
+    if not parts:
+        raise SystemExit(f"No records to upload in {path}")
+
+    started = time.perf_counter()
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda part: upload_part(session, url, path, part, params), parts))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(result["latencyMs"] for result in results)
+    failed = [result for result in results if not result["ok"]]
+    summary = {
+        "file": str(path),
+        "parts": len(parts),
+        "rows": sum(part.rows for part in parts),
+        "elapsedS": round(elapsed, 3),
+        "latencyMs": {"min": latencies[0], "p50": latencies[len(latencies) // 2], "max": latencies[-1]},
+        "totals": aggregate_responses(results),
+        "failedParts": [result["part"] for result in failed],
+        "results": results,
+    }
+    return summary
+
+
+# Describe the failed parts of an upload summary, or None when every part succeeded; the caller prints the
+# summary first and picks the exit code, so a partial failure never hides the per-part results
+def upload_failure(summary: dict | list) -> str | None:
+    failed_parts = set(summary.get("failedParts") or ()) if isinstance(summary, dict) else set()
+    if not failed_parts:
+        return None
+    first = next(result for result in summary["results"] if result["part"] in failed_parts)
+    reason = f"HTTP {first['status']}" if first["status"] is not None else "request error"
+    return f"{len(failed_parts)}/{summary['parts']} parts failed, first {reason}: {str(first['response'])[:500]}"
+
+
+# POST an NDJSON file to /send/gpd/file; with UPLOAD_PART_ROWS or UPLOAD_PART_BYTES set, the file is
+# split into parts streamed concurrently by UPLOAD_WORKERS threads
+def post_gpd_file(path: Path) -> dict:
+    params = gpd_file_params()
+    part_rows = int(require_env_or_default("UPLOAD_PART_ROWS", "0"))
+    part_bytes = int(require_env_or_default("UPLOAD_PART_BYTES", "0"))
+    if part_rows > 0 or part_bytes > 0:
+        workers = int(require_env_or_default("UPLOAD_WORKERS", "4"))
+        return upload_ndjson_in_parts(GPD_FILE_URL, path, params, part_rows, part_bytes, workers)
+
+    with path.open("rb") as fh:
+        files = {"file": (path.name, fh, NDJSON_CONTENT_TYPE)}
+        resp = requests.post(GPD_FILE_URL, params=params, files=files, timeout=UPLOAD_TIMEOUT_S)
+    try:
+        resp.raise_for_status()
+    except requests.HTTPError:
+        raise SystemExit(f"HTTP {resp.status_code}: {resp.text.strip() or '<no body>'}")
+    return resp.json()
@@ -0,0 +1,18 @@
+# json_codec.py
+# The load drivers share the repository codec (utils/json_codec.py): one implementation, one switch
+# (RTP_JSON_CODEC=stdlib forces the fallback) and NaN/Infinity rejected by both backends. It is loaded by path
+# because load-tests/ cannot put the repository root on sys.path: the root config package would shadow config.py.
+import importlib.util
+from pathlib import Path
+
+_CODEC_PATH = Path(__file__).resolve().parent.parent / "utils" / "json_codec.py"
+_spec = importlib.util.spec_from_file_location("rtp_json_codec", _CODEC_PATH)
+_codec = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_codec)
+
+BACKEND = _codec.BACKEND
+JSONDecodeError = _codec.JSONDecodeError
+dumps = _codec.dumps
+dumps_str = _codec.dumps_str
+loads = _codec.loads
+ndjson_line = _codec.ndjson_line
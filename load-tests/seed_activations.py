@@ -0,0 +1,148 @@
+# seed_activations.py
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import json_codec
+import requests
+from activation import find_activation_id, post_activation
+from auth import get_token
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utilities import RateLimiter, random_fiscal_code_batch, require_env, require_env_or_default
+
+PROGRESS_EVERY_S = 5.0
+# Transient statuses retried by the adapter; a retried POST that had already succeeded comes back as 409
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def pooled_session(concurrency: int) -> requests.Session:
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=RETRY_STATUSES, allowed_methods=None)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# The plan (count, seed, service provider) is kept next to the store so a rerun regenerates the same
+# fiscal codes and only activates the ones not stored yet
+def load_or_create_plan(store_path: Path, count: int, rtp_sp_id: str) -> dict:
+    plan_path = store_path.with_name(f"{store_path.name}.plan.json")
+    if plan_path.exists():
+        plan = json_codec.loads(plan_path.read_bytes())
+        if plan["count"] != count or plan["serviceProvider"] != rtp_sp_id:
+            raise SystemExit(
+                f"{store_path} was seeded with SEED_COUNT={plan['count']} for {plan['serviceProvider']}; "
+                "use another SEED_STORE or delete the store and its .plan.json to start over"
+            )
+        return plan
+    seed = int(require_env_or_default("SEED", str(int.from_bytes(os.urandom(4), "big"))))
+    plan = {"count": count, "seed": seed, "serviceProvider": rtp_sp_id}
+    plan_path.write_bytes(json_codec.dumps(plan))
+    return plan
+
+
+def read_store(store_path: Path) -> dict[str, str]:
+    seeded = {}
+    if store_path.exists():
+        with store_path.open("rb") as f:
+            for line in f:
+                # A line cut by an interruption is ignored; its fiscal code is activated again (409 -> reuse)
+                try:
+                    record = json_codec.loads(line)
+                except ValueError:
+                    continue
+                seeded[record["fiscalCode"]] = record["activationId"]
+        # Terminate a cut last line so the next append starts on a line of its own
+        with store_path.open("rb+") as f:
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+    return seeded
+
+
+# Activate one fiscal code; returns the store record, or None when it could not be activated
+def seed_one(session: requests.Session, limiter: RateLimiter, fiscal_code: str, rtp_sp_id: str) -> dict | None:
+    limiter.wait()
+    token = get_token()
+    resp = post_activation(token, fiscal_code, rtp_sp_id, session)
+    if resp.status_code == 201:
+        activation_id = resp.headers.get("Location", "").rstrip("/").split("/")[-1]
+        return {"fiscalCode": fiscal_code, "activationId": activation_id, "reused": False}
+    if resp.status_code == 409:
+        activation_id = find_activation_id(token, fiscal_code, session)
+        if activation_id:
+            return {"fiscalCode": fiscal_code, "activationId": activation_id, "reused": True}
+    return None
+
+
+def seed_activations(count: int, store_path: Path, rtp_sp_id: str, concurrency: int = 16, rate: float = 50.0) -> dict:
+    plan = load_or_create_plan(store_path, count, rtp_sp_id)
+    seeded = read_store(store_path)
+    pending = [fc for fc in random_fiscal_code_batch(count, seed=plan["seed"]) if fc not in seeded]
+    print(
+        json_codec.dumps_str(
+            {"store": str(store_path), "target": count, "alreadySeeded": len(seeded), "pending": len(pending)}
+        )
+    )
+
+    limiter = RateLimiter(rate)
+    created = reused = failed = 0
+    started = last_progress = time.monotonic()
+    with pooled_session(concurrency) as session, store_path.open("ab") as store:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(seed_one, session, limiter, fc, rtp_sp_id) for fc in pending]
+            for future in as_completed(futures):
+                try:
+                    record = future.result()
+                except requests.RequestException:
+                    record = None
+                if record is None:
+                    failed += 1
+                else:
+                    store.write(json_codec.ndjson_line(record))
+                    store.flush()
+                    if record["reused"]:
+                        reused += 1
+                    else:
+                        created += 1
+
+                now = time.monotonic()
+                if now - last_progress >= PROGRESS_EVERY_S:
+                    last_progress = now
+                    done = created + reused + failed
+                    print(
+                        json_codec.dumps_str(
+                            {"done": done, "of": len(pending), "perS": round(done / (now - started), 1)}
+                        )
+                    )
+
+    elapsed = time.monotonic() - started
+    summary = {
+        "store": str(store_path),
+        "seeded": len(seeded) + created + reused,
+        "created": created,
+        "reused": reused,
+        "failed": failed,
+        "elapsedS": round(elapsed, 1),
+        "perS": round((created + reused + failed) / elapsed, 1) if elapsed else None,
+    }
+    print(json_codec.dumps_str({"seed": summary}, indent=True))
+    return summary
+
+
+def main():
+    seed_activations(
+        count=int(require_env("SEED_COUNT")),
+        store_path=Path(require_env_or_default("SEED_STORE", "activations.ndjson")),
+        rtp_sp_id=require_env("SERVICE_PROVIDER"),
+        concurrency=int(require_env_or_default("SEED_CONCURRENCY", "16")),
+        rate=float(require_env_or_default("SEED_RATE", "50")),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,42 @@
 # send_to_gpd_queue.py
-import json
 import os
+import shutil
+import time
 from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
-import requests
+import json_codec
 from dotenv import load_dotenv
-from utilities import random_iuv, require_env, require_env_or_default, to_epoch_millis
-
-from config import GPD_TEST_BASE_URL
+from gpd_file_upload import post_gpd_file, upload_failure
+from utilities import random_sharded_number_batch, require_env, require_env_or_default, to_epoch_millis
 
 load_dotenv()
 
-
-def str_to_bool(val: str) -> bool:
-    return str(val).strip().lower() in {"1", "true", "yes", "y"}
+DEFAULT_CHUNK_ROWS = 100_000
+SHARD_COPY_BUFFER = 8 * 1024 * 1024
 
 
-# CREATE: generate new records with fresh IDs
-def generate_create_records(count: int) -> Iterable[dict]:
+# CREATE: generate new records with fresh IDs; ids and iuvs come from the `shard`-th of `shards` disjoint numeric
+# slices, so the shards of one file never repeat an identifier
+def generate_create_records(count: int, seed: int | None = None, shard: int = 0, shards: int = 1) -> Iterable[dict]:
     now = datetime.now(UTC)
     operation = "CREATE"
     status = require_env("STATUS")
     debtor_cf = require_env("FISCAL_CODE")
-
-    for i in range(count):
-        due = to_epoch_millis(now + timedelta(days=30))
-        iuv = random_iuv(17)
+    psp_code = os.getenv("PSP_CODE") or None
+    psp_tax_code = os.getenv("PSP_TAX_CODE") or None
+    timestamp = to_epoch_millis(now)
+    due = to_epoch_millis(now + timedelta(days=30))
+    ids = random_sharded_number_batch(count, 10, shard, shards, seed)
+    iuvs = random_sharded_number_batch(count, 17, shard, shards, None if seed is None else seed + 1)
+
+    for record_id, iuv in zip(ids, iuvs):
         yield {
-            "id": random_iuv(10),
+            "id": record_id,
             "operation": operation,
-            "timestamp": to_epoch_millis(datetime.now(UTC)),
+            "timestamp": timestamp,
             "iuv": iuv,
             "subject": "Performance Test RTP",
             "description": "Test RTP from queue API",
@@ -41,18 +46,17 @@ def generate_create_records(count: int) -> Iterable[dict]:
             "due_date": due,
             "amount": 1500,
             "status": status,
-            "psp_code": os.getenv("PSP_CODE") or None,
-            "psp_tax_code": os.getenv("PSP_TAX_CODE") or None,
+            "psp_code": psp_code,
+            "psp_tax_code": psp_tax_code,
             "is_partial_payment": None,
         }
 
 
 def read_source_lines(path: Path) -> Iterator[dict]:
-    with path.open("r", encoding="utf-8") as f:
+    with path.open("rb") as f:
         for line in f:
-            line = line.strip()
-            if line:
-                yield json.loads(line)
+            if line.strip():
+                yield json_codec.loads(line)
 
 
 # UPDATE: reuse IDs/iuv/nav from source and bump amount by +500
@@ -92,61 +96,95 @@ def generate_update_records(count: int, source_file: Path) -> Iterable[dict]:
         }
 
 
+# Encode one CREATE chunk as NDJSON bytes, newline-terminated
+def create_chunk_bytes(count: int, seed: int | None = None, shard: int = 0, shards: int = 1) -> bytes:
+    lines = [json_codec.dumps(rec) for rec in generate_create_records(count, seed, shard, shards)]
+    return b"\n".join(lines) + b"\n" if lines else b""
+
+
+# Generate one CREATE shard and write it with a single buffered write; returns rows written
+def write_create_chunk(part_path: Path, count: int, seed: int | None = None, shard: int = 0, shards: int = 1) -> int:
+    with part_path.open("wb") as f:
+        f.write(create_chunk_bytes(count, seed, shard, shards))
+    return count
+
+
+# Shard the CREATE row range across a process pool, then concatenate the shards in order.
+# With one worker or one shard the chunks are written serially to the output, so memory stays bounded by chunk_rows.
+def write_create_file_parallel(
+    out_path: Path, rows: int, workers: int, chunk_rows: int, seed: int | None = None
+) -> int:
+    sizes = [min(chunk_rows, rows - start) for start in range(0, rows, chunk_rows)]
+    # Each shard draws its identifiers from its own stream (two seeds per shard: ids and iuvs) and its own
+    # numeric slice, so ids stay unique across shards without sharing state between processes
+    seeds = [None if seed is None else seed + 2 * i for i in range(len(sizes))]
+    shards = len(sizes)
+    if workers <= 1 or shards <= 1:
+        with out_path.open("wb") as out:
+            for shard, (size, chunk_seed) in enumerate(zip(sizes, seeds)):
+                out.write(create_chunk_bytes(size, chunk_seed, shard, shards))
+        return rows
+
+    part_paths = [out_path.with_name(f"{out_path.name}.part-{i:05d}") for i in range(len(sizes))]
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+            written = sum(pool.map(write_create_chunk, part_paths, sizes, seeds, range(shards), [shards] * shards))
+
+        with out_path.open("wb") as out:
+            for part_path in part_paths:
+                with part_path.open("rb") as src:
+                    shutil.copyfileobj(src, out, SHARD_COPY_BUFFER)
+    finally:
+        for part_path in part_paths:
+            part_path.unlink(missing_ok=True)
+    return written
+
+
 # Write NDJSON to disk
 def write_file(out_dir: Path, rows: int, op: str, source_file: Path | None) -> Path:
     filename = "createRTP.ndjson" if op == "CREATE" else "updateRTP.ndjson"
     out_path = out_dir / filename
+    started = time.perf_counter()
 
     if op == "UPDATE":
         if not source_file or not source_file.exists():
             raise SystemExit("SOURCE_FILE required for UPDATE and must exist")
-        records = generate_update_records(rows, source_file)
+        written = 0
+        with out_path.open("wb") as f:
+            for rec in generate_update_records(rows, source_file):
+                f.write(json_codec.ndjson_line(rec))
+                written += 1
     else:
-        records = generate_create_records(rows)
-
-    written = 0
-    with out_path.open("w", encoding="utf-8", newline="\n") as f:
-        for rec in records:
-            f.write(json.dumps(rec, separators=(",", ":")) + "\n")
-            written += 1
+        workers = int(require_env_or_default("WORKERS", str(os.cpu_count() or 1)))
+        chunk_rows = int(require_env_or_default("CHUNK_ROWS", str(DEFAULT_CHUNK_ROWS)))
+        if chunk_rows <= 0:
+            raise SystemExit("CHUNK_ROWS must be a positive integer")
+        seed = os.getenv("SEED")
+        written = write_create_file_parallel(out_path, rows, workers, chunk_rows, int(seed) if seed else None)
 
     if written == 0:
         raise SystemExit("No records written")
+
+    elapsed = time.perf_counter() - started
+    print(f"[generator] {written} rows in {elapsed:.2f}s ({written / max(elapsed, 1e-9):,.0f} rows/s)")
     return out_path
 
 
-def generate_search_file(out_dir: Path) -> Iterable[dict]:
+def generate_search_file(out_dir: Path) -> Path:
     in_path = out_dir / "createRTP.ndjson"
     out_path = out_dir / "mongolist.ndjson"
-    ids: List[int] = []
-    with in_path.open("r", encoding="utf-8", newline="\n") as file:
-        for line in file:
-            if line.strip():
-                data = json.loads(line)
-                ids.append(int(data["id"]))
+    ids = [int(record["id"]) for record in read_source_lines(in_path)]
     mongo_query = {"operationId": {"$in": ids}, "status": {"$ne": "CANCELLED"}}
-    with out_path.open("w", encoding="utf-8") as file:
-        json.dump(mongo_query, file, indent=2)
+    out_path.write_bytes(json_codec.dumps(mongo_query, indent=True))
 
     print(f"Successfully generated MongoDB query file at {out_path}")
     print(f"Total IDs processed: {len(ids)}")
+    return out_path
 
 
 # POST file to /send/gpd/file
 def send_file_to_api(path: Path) -> dict:
-    api_url = f"{GPD_TEST_BASE_URL}/send/gpd/file"
-    bulk = str_to_bool(require_env("BULK"))
-    rate = int(require_env("RATE"))
-    params = {"bulk": "true" if bulk else "false", "concurrency": str(rate)}
-
-    with path.open("rb") as fh:
-        files = {"file": (path.name, fh, "application/x-ndjson")}
-        resp = requests.post(api_url, params=params, files=files, timeout=300)
-    try:
-        resp.raise_for_status()
-    except requests.HTTPError:
-        raise SystemExit(f"HTTP {resp.status_code}: {resp.text.strip() or '<no body>'}")
-    return resp.json()
+    return post_gpd_file(path)
 
 
 def run_continuously(timelength_minutes: float, block: Callable[[], None]):
@@ -179,6 +217,8 @@ def main() -> None:
     if op_env not in {"CREATE", "UPDATE"}:
         raise SystemExit("OPERATION must be CREATE or UPDATE")
 
+    failures = []
+
     def block():
         source_file = out_dir / "createRTP.ndjson" if op_env == "UPDATE" else None
 
@@ -188,9 +228,15 @@ def main() -> None:
 
         result = send_file_to_api(out_path)
         print("[uploader] Response:")
-        print(json.dumps(result, indent=2))
+        print(json_codec.dumps_str(result, indent=True))
+        failure = upload_failure(result)
+        if failure:
+            print(f"[uploader] {failure}")
+            failures.append(failure)
 
     run_continuously(mins, block)
+    if failures:
+        raise SystemExit(f"{len(failures)} upload(s) with failed parts, last: {failures[-1]}")
 
 
 if __name__ == "__main__":
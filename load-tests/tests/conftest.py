@@ -0,0 +1,11 @@
+# conftest.py
+# The load scripts are flat modules importing each other by bare name and reading their settings at import:
+# put load-tests/ on sys.path and provide the required variables before any test module imports them.
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("COSMOS_DB_CONNECTION_STRING", "mongodb://localhost:27017")
+os.environ.setdefault("SERVICE_PROVIDER", "TESTSP01")
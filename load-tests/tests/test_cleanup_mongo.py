@@ -0,0 +1,158 @@
+# test_cleanup_mongo.py
+# cleanup_mongo against an in-memory mongomock collection; throttling is simulated by raising the
+# OperationFailure Cosmos DB returns when the request units are exhausted.
+import pytest
+from pymongo.errors import OperationFailure
+
+mongomock = pytest.importorskip("mongomock")
+import cleanup_mongo  # noqa: E402
+
+PROVIDER = {"serviceProviderDebtor": "SP1"}
+
+
+def throttling_error(retry_after_ms: int = 5) -> OperationFailure:
+    return OperationFailure(f"Request rate is large. RetryAfterMs={retry_after_ms}", code=16500)
+
+
+# Wraps a collection so that the first `failures` delete_many calls fail as throttled
+class ThrottledCollection:
+    def __init__(self, collection, failures: int):
+        self._collection = collection
+        self.failures = failures
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    def delete_many(self, query_filter):
+        if self.failures > 0:
+            self.failures -= 1
+            raise throttling_error()
+        return self._collection.delete_many(query_filter)
+
+
+@pytest.fixture
+def collection():
+    collection = mongomock.MongoClient().rtp.rtps
+    collection.insert_many([{"serviceProviderDebtor": "SP1", "operationId": str(i)} for i in range(250)])
+    collection.insert_many([{"serviceProviderDebtor": "SP2", "operationId": str(i)} for i in range(40)])
+    return collection
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(cleanup_mongo, "SECONDS_TO_SLEEP", 0.01)
+    monkeypatch.setattr(cleanup_mongo.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_delete_concurrently_deletes_only_the_provider_documents(collection):
+    throttle = cleanup_mongo.AdaptiveThrottle(batch_size=30, concurrency=3, max_concurrency=4)
+
+    deleted = cleanup_mongo.delete_concurrently(collection, PROVIDER, total=250, throttle=throttle)
+
+    assert deleted == 250
+    assert collection.count_documents(PROVIDER) == 0
+    assert collection.count_documents({"serviceProviderDebtor": "SP2"}) == 40
+
+
+def test_delete_concurrently_retries_throttled_batches(collection, sleeps):
+    throttled = ThrottledCollection(collection, failures=3)
+    throttle = cleanup_mongo.AdaptiveThrottle(batch_size=40, concurrency=4, max_concurrency=4)
+
+    deleted = cleanup_mongo.delete_concurrently(throttled, PROVIDER, total=250, throttle=throttle)
+
+    assert deleted == 250
+    assert collection.count_documents(PROVIDER) == 0
+    assert throttle.throttled_count == 3
+
+
+def test_call_with_backoff_honours_retry_after(sleeps):
+    throttle = cleanup_mongo.AdaptiveThrottle()
+    outcomes = [throttling_error(retry_after_ms=2500), "done"]
+
+    def operation():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert cleanup_mongo.call_with_backoff(operation, throttle) == "done"
+    assert throttle.throttled_count == 1
+    assert len(sleeps) == 1 and 2.4 < sleeps[0] <= 2.5
+
+
+def test_call_with_backoff_raises_other_operation_failures():
+    def operation():
+        raise OperationFailure("unauthorized", code=13)
+
+    with pytest.raises(OperationFailure):
+        cleanup_mongo.call_with_backoff(operation, cleanup_mongo.AdaptiveThrottle())
+
+
+def test_retry_after_and_throttling_detection():
+    assert cleanup_mongo.is_throttling_error(throttling_error())
+    assert cleanup_mongo.is_throttling_error(OperationFailure("TooManyRequests", code=None))
+    assert not cleanup_mongo.is_throttling_error(OperationFailure("duplicate key", code=11000))
+    assert cleanup_mongo.retry_after_seconds(throttling_error(retry_after_ms=1200), default=1) == 1.2
+    assert cleanup_mongo.retry_after_seconds(OperationFailure("busy", code=16500), default=0.5) == 0.5
+
+
+def test_throttle_window_grows_after_successes_and_halves_when_throttled():
+    throttle = cleanup_mongo.AdaptiveThrottle(batch_size=100, concurrency=2, max_concurrency=4, grow_after=3)
+
+    for _ in range(3):
+        throttle.on_success()
+    assert (throttle.concurrency, throttle.batch_size) == (3, 100 + cleanup_mongo.MIN_BATCH_SIZE)
+
+    for _ in range(6):
+        throttle.on_success()
+    assert throttle.concurrency == 4  # capped at max_concurrency
+
+    throttle.on_throttled(retry_after_s=0)
+    assert (throttle.concurrency, throttle.batch_size) == (2, 65)
+
+    for _ in range(10):
+        throttle.on_throttled(retry_after_s=0)
+    assert (throttle.concurrency, throttle.batch_size) == (1, cleanup_mongo.MIN_BATCH_SIZE)
+
+
+def test_operation_id_partitions_keep_the_provider_filter(collection, tmp_path):
+    mongo_list = tmp_path / "mongolist.ndjson"
+    mongo_list.write_text('{"operationId": {"$in": ["1", "2", "3", "4", "5"]}}')
+
+    filters = cleanup_mongo.operation_id_partitions(PROVIDER, mongo_list, partitions=2)
+
+    assert [collection.count_documents(partition) for partition in filters] == [3, 2]
+    assert all(partition["$and"][0] == PROVIDER for partition in filters)
+
+
+def test_checkpoint_keeps_filters_in_the_plan_and_resumes(collection, tmp_path, monkeypatch):
+    monkeypatch.setattr(cleanup_mongo, "CHECKPOINT_INTERVAL_S", 3600)
+    path = tmp_path / "checkpoint.json"
+    filters = [{"$and": [PROVIDER, {"operationId": {"$in": [str(i) for i in range(0, 250, 2)]}}]}]
+    filters.append({"$and": [PROVIDER, {"operationId": {"$in": [str(i) for i in range(1, 250, 2)]}}]})
+    checkpoint = cleanup_mongo.CleanupCheckpoint.create(path, "plan", collection, filters)
+    saved = path.read_text()
+
+    checkpoint.record(0, "some-id", 10)
+    assert path.read_text() == saved  # throttled: no rewrite per batch
+    assert "operationId" not in saved  # the id lists live in the plan file only
+    checkpoint.flush()
+
+    resumed = cleanup_mongo.CleanupCheckpoint.load(path, "plan")
+    assert resumed.filters == filters
+    assert resumed.partitions[0]["deleted"] == 10 and resumed.partitions[0]["lastId"] == "some-id"
+    assert cleanup_mongo.CleanupCheckpoint.load(path, "other plan") is None
+
+
+def test_delete_partitions_removes_a_finished_checkpoint(collection, tmp_path):
+    path = tmp_path / "checkpoint.json"
+    filters = [
+        {"$and": [PROVIDER, {"operationId": {"$in": [str(i) for i in range(start, 250, 3)]}}]} for start in range(3)
+    ]
+    checkpoint = cleanup_mongo.CleanupCheckpoint.create(path, "plan", collection, filters)
+
+    assert cleanup_mongo.delete_partitions(collection, checkpoint, workers=3) == 250
+    assert collection.count_documents({}) == 40
+    assert not path.exists() and not cleanup_mongo.CleanupCheckpoint.plan_path(path).exists()
@@ -0,0 +1,39 @@
+# test_send_to_gpd_queue.py
+# CREATE files are generated in shards by separate processes: identifiers must stay unique across shards.
+import json
+
+import pytest
+import send_to_gpd_queue
+from utilities import random_sharded_number_batch
+
+
+@pytest.fixture(autouse=True)
+def create_env(monkeypatch):
+    monkeypatch.setenv("STATUS", "VALID")
+    monkeypatch.setenv("FISCAL_CODE", "RSSMRA85T10A562S")
+
+
+def test_sharded_numbers_stay_in_disjoint_slices():
+    first = random_sharded_number_batch(500, 4, shard=0, shards=4, seed=1)
+    last = random_sharded_number_batch(500, 4, shard=3, shards=4, seed=1)
+
+    assert len(set(first)) == len(set(last)) == 500
+    assert all(len(number) == 4 and int(number) < 2500 for number in first)
+    assert all(7500 <= int(number) < 10000 for number in last)
+
+
+def test_sharded_numbers_reject_a_batch_larger_than_the_slice():
+    with pytest.raises(ValueError):
+        random_sharded_number_batch(26, 2, shard=0, shards=4)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_create_ids_are_unique_across_shards(tmp_path, workers):
+    out_path = tmp_path / "createRTP.ndjson"
+
+    written = send_to_gpd_queue.write_create_file_parallel(out_path, 2000, workers, 250, seed=7)
+
+    records = [json.loads(line) for line in out_path.read_bytes().splitlines()]
+    assert written == len(records) == 2000
+    assert len({record["id"] for record in records}) == 2000
+    assert len({record["iuv"] for record in records}) == 2000
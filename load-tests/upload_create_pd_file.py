@@ -1,14 +1,20 @@
 # upload_create_pd_file.py
-import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import json_codec
 import requests
 from activation import activate_random_cf
-from generate_massive_zip import generate_massive_zip
-from utilities import require_env
+from generate_massive_zip import generate_massive_zip, generate_massive_zip_shards
+from requests.adapters import HTTPAdapter
+from utilities import require_env, require_env_or_default
 
 from config import GPD_MASSIVE_BASE_URL
 
+UPLOAD_TIMEOUT_S = 300
+
 
 # Activate a new fiscal code and generate the massive ZIP file
 def activate_and_generate() -> Path:
@@ -16,31 +22,83 @@ def activate_and_generate() -> Path:
     print({"fiscal_code": fiscal_code})
 
     summary = generate_massive_zip(fiscal_code)
-    print(json.dumps(summary, indent=2))
+    print(json_codec.dumps_str(summary, indent=True))
     return Path(summary["zipPath"])
 
 
-# Upload the ZIP file using the GPD massive upload endpoint
-def upload(zip_path: Path):
+# Activate a new fiscal code and generate ROWS split into ZIP shards of at most rows_per_file rows
+def activate_and_generate_shards(rows_per_file: int, workers: int) -> list[Path]:
+    fiscal_code = activate_random_cf()
+    print({"fiscal_code": fiscal_code})
+
+    summaries = generate_massive_zip_shards(fiscal_code, rows_per_file, workers)
+    print(json_codec.dumps_str(summaries, indent=True))
+    return [Path(summary["zipPath"]) for summary in summaries]
+
+
+# Upload the ZIP file using the GPD massive upload endpoint; returns the per-file outcome.
+# Transport errors (connection, timeout) are reported as a failed result, so one shard cannot abort the others.
+def upload(zip_path: Path, session: requests.Session | None = None) -> dict:
     broker = require_env("BROKER_CODE")
     org = require_env("ORG_FISCAL_CODE")
     ocp_key = require_env("GPD_API_KEY")
     url = f"{GPD_MASSIVE_BASE_URL}/brokers/{broker}/organizations/{org}/debtpositions/file"
-    with zip_path.open("rb") as f:
-        files = {"file": (zip_path.name, f, "application/zip")}
-        headers = {"ocp-apim-subscription-key": ocp_key}
-        resp = requests.post(url, headers=headers, files=files)
-    print(
-        json.dumps(
-            {"status": resp.status_code, "ok": resp.status_code == 202, "responseText": resp.text[:500]}, indent=2
-        )
-    )
+    started = time.perf_counter()
+    try:
+        with zip_path.open("rb") as f:
+            files = {"file": (zip_path.name, f, "application/zip")}
+            headers = {"ocp-apim-subscription-key": ocp_key}
+            resp = (session or requests).post(url, headers=headers, files=files, timeout=UPLOAD_TIMEOUT_S)
+    except requests.RequestException as e:
+        result = {"zipPath": str(zip_path), "status": None, "ok": False, "timeTo202Ms": None, "error": str(e)}
+        print(json_codec.dumps_str(result, indent=True))
+        return result
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    result = {
+        "zipPath": str(zip_path),
+        "status": resp.status_code,
+        "ok": resp.status_code == 202,
+        "timeTo202Ms": elapsed_ms if resp.status_code == 202 else None,
+        "responseText": resp.text[:500],
+    }
+    print(json_codec.dumps_str(result, indent=True))
+    return result
+
+
+# Upload every shard concurrently through one pooled session; returns the aggregated outcome
+def upload_shards(zip_paths: list[Path], concurrency: int) -> dict:
+    started = time.perf_counter()
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda zip_path: upload(zip_path, session), zip_paths))
+
+    accepted = sorted(result["timeTo202Ms"] for result in results if result["ok"])
+    summary = {
+        "files": len(results),
+        "accepted": len(accepted),
+        "failed": [result["zipPath"] for result in results if not result["ok"]],
+        "elapsedS": round(time.perf_counter() - started, 3),
+        "timeTo202Ms": {"p50": accepted[len(accepted) // 2], "max": accepted[-1]} if accepted else None,
+    }
+    print(json_codec.dumps_str({"upload": summary}, indent=True))
+    return summary
 
 
 # Main execution
 def main():
-    zip_path = activate_and_generate()
-    upload(zip_path)
+    rows_per_file = int(require_env_or_default("ROWS_PER_FILE", "0"))
+    if rows_per_file <= 0:
+        zip_path = activate_and_generate()
+        upload(zip_path)
+        return
+
+    workers = int(require_env_or_default("WORKERS", str(os.cpu_count() or 1)))
+    concurrency = int(require_env_or_default("UPLOAD_CONCURRENCY", "4"))
+    zip_paths = activate_and_generate_shards(rows_per_file, workers)
+    upload_shards(zip_paths, concurrency)
 
 
 if __name__ == "__main__":
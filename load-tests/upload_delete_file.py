@@ -1,8 +1,8 @@
 # upload_delete_file.py
 import argparse
-import json
 from pathlib import Path
 
+import json_codec
 import requests
 from utilities import require_env
 
@@ -31,7 +31,7 @@ def upload_delete(zip_path: Path):
         resp = requests.request("DELETE", url, headers=headers, files=files, timeout=60)
 
     print(
-        json.dumps(
+        json_codec.dumps_str(
             {
                 "url": url,
                 "zipPath": str(zip_path),
@@ -39,7 +39,7 @@ def upload_delete(zip_path: Path):
                 "ok": 200 <= resp.status_code < 300,
                 "responseText": resp.text[:1000],
             },
-            indent=2,
+            indent=True,
         )
     )
 
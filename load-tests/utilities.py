@@ -1,6 +1,8 @@
 # utilities.py
 import os
 import random
+import threading
+import time
 from datetime import UTC, datetime, timedelta
 
 from dotenv import load_dotenv
@@ -8,6 +10,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 ALNUM = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+DIGITS = "0123456789"
 
 
 def random_iupd(prefix: str = "testMassiveRTP", length: int = 5) -> str:
@@ -19,6 +22,87 @@ def random_iuv(digits: int = 17) -> str:
     return "".join(str(random.randint(0, 9)) for _ in range(digits))
 
 
+# Byte -> symbol table for a bulk draw; bytes above the largest multiple of len(alphabet) are
+# dropped so that every symbol keeps the same probability
+def _byte_tables(alphabet: str) -> tuple[bytes, bytes]:
+    accepted = 256 - 256 % len(alphabet)
+    table = bytes(ord(alphabet[b % len(alphabet)]) if b < accepted else 0 for b in range(256))
+    return table, bytes(range(accepted, 256))
+
+
+_BYTE_TABLES = {alphabet: _byte_tables(alphabet) for alphabet in (ALNUM, DIGITS)}
+
+
+def random_token_batch(
+    count: int, length: int, alphabet: str = DIGITS, seed: int | None = None, exclude: set[str] | None = None
+) -> list[str]:
+    """Return `count` distinct random tokens of `length` symbols drawn from `alphabet`.
+
+    Symbols come from one bulk byte draw (``os.urandom``, or ``random.Random(seed)`` when a seed
+    is given for reproducible datasets) mapped through a lookup table, so no per-digit Python call
+    is made. Duplicates are discarded and topped up with further draws until the batch is unique.
+    Tokens in `exclude` are never returned and the new ones are added to it, so successive batches
+    sharing one set stay unique across batches.
+    """
+    if count < 0 or length <= 0:
+        raise ValueError("count must be >= 0 and length must be > 0")
+    excluded = exclude if exclude is not None else set()
+    if count + len(excluded) > len(alphabet) ** length:
+        raise ValueError(f"Cannot draw {count} unique tokens of length {length} from {len(alphabet)} symbols")
+
+    table, rejected = _BYTE_TABLES.get(alphabet) or _byte_tables(alphabet)
+    rng = random.Random(seed) if seed is not None else None
+    tokens: dict[str, None] = {}
+    while len(tokens) < count:
+        missing = count - len(tokens)
+        # Oversample slightly so rejected bytes rarely force another draw
+        raw_size = missing * length + missing * length // 8 + 16
+        raw = rng.randbytes(raw_size) if rng else os.urandom(raw_size)
+        symbols = raw.translate(table, rejected).decode("ascii")
+        usable = min(missing, len(symbols) // length) * length
+        drawn = (symbols[i : i + length] for i in range(0, usable, length))
+        tokens.update(
+            dict.fromkeys(token for token in drawn if token not in excluded) if excluded else dict.fromkeys(drawn)
+        )
+    batch = list(tokens)[:count]
+    if exclude is not None:
+        exclude.update(batch)
+    return batch
+
+
+def random_iuv_batch(count: int, digits: int = 17, seed: int | None = None) -> list[str]:
+    return random_token_batch(count, digits, DIGITS, seed)
+
+
+# Distinct zero-padded numbers drawn from the `shard`-th of `shards` equal slices of the `digits`-digit range, so
+# batches generated independently (e.g. in separate worker processes) never share a value
+def random_sharded_number_batch(
+    count: int, digits: int, shard: int = 0, shards: int = 1, seed: int | None = None
+) -> list[str]:
+    if not 0 <= shard < shards:
+        raise ValueError("shard must be in [0, shards)")
+    span = 10**digits // shards
+    if count > span:
+        raise ValueError(f"Cannot draw {count} unique {digits}-digit numbers from a slice of {span}")
+    start = shard * span
+    return [str(number).zfill(digits) for number in random.Random(seed).sample(range(start, start + span), count)]
+
+
+# `exclude` holds the random parts (without prefix) already used, to keep IUPDs unique across batches
+def random_iupd_batch(
+    count: int,
+    prefix: str = "testMassiveRTP",
+    length: int = 5,
+    seed: int | None = None,
+    exclude: set[str] | None = None,
+) -> list[str]:
+    return [f"{prefix}{rnd}" for rnd in random_token_batch(count, length, ALNUM, seed, exclude)]
+
+
+def random_fiscal_code_batch(count: int, length: int = 11, seed: int | None = None) -> list[str]:
+    return random_token_batch(count, length, DIGITS, seed)
+
+
 def get_current_timestamp() -> str:
     return datetime.now(UTC).strftime("%Y%m%d%H%M%S")
 
@@ -50,5 +134,24 @@ def require_env_or_default(name: str, default: str) -> str:
     return val
 
 
+class RateLimiter:
+    """Spread calls from any number of threads evenly at `rate` per second (0 disables the limit)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 def to_epoch_millis(dt: datetime) -> int:
     return int(dt.timestamp() * 1000)
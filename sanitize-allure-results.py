@@ -5,12 +5,13 @@ This is run as a post-processing step before publishing reports to gh-pages.
 """
 
 import argparse
-import json
 import re
 import sys
 from pathlib import Path
 from typing import Any
 
+from utils import json_codec
+
 _MULTI_SEGMENT_TOKEN = r"[\w-]+(?:\.+[\w-]+)+"
 
 
@@ -57,23 +58,18 @@ def sanitize_json_file(file_path: Path) -> bool:
     Returns True if file was modified, False otherwise.
     """
     try:
-        with open(file_path, encoding="utf-8") as f:
-            data = json.load(f)
+        data = json_codec.loads(file_path.read_bytes())
 
         sanitized_data = sanitize_dict(data)
 
         # Check if anything was modified
-        original_json = json.dumps(data, sort_keys=True)
-        sanitized_json = json.dumps(sanitized_data, sort_keys=True)
-
-        if original_json != sanitized_json:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(sanitized_data, f, ensure_ascii=False, indent=2)
+        if sanitized_data != data:
+            file_path.write_bytes(json_codec.dumps(sanitized_data, indent=True))
             return True
 
         return False
 
-    except json.JSONDecodeError as e:
+    except json_codec.JSONDecodeError as e:
         print(f"⚠️  Warning: Could not parse JSON file {file_path}: {e}", file=sys.stderr)
         return False
     except Exception as e:
@@ -0,0 +1,218 @@
+"""Precompiled callback payload factories, for high-rate callback traffic on /cb/send and /cb/cancel.
+
+A `CallbackFactory` builds the payload of a DS variant once with the dataset generator of that
+variant, turns the per-callback fields into template slots and serializes the rest a single time.
+Rendering a callback then costs a handful of string substitutions instead of a deep dict build
+with several uuid4 calls and date formatting.
+
+Fields outside the slots (remittance text, creditor name and IDs, IBAN, amount, dates,
+OrgnlPmtInfId / OrgnlInstrId / OrgnlEndToEndId) are drawn once per factory and shared by all of
+its callbacks; create another factory when they must vary.
+
+Example:
+    factory = CallbackFactory("DS_08P_ACCP", bic="MOCKSP04")
+    body = factory.render(msg_id=resource_id.replace("-", ""))
+    srtp_callback(cert_path=cert, key_path=key, rtp_payload=body)
+
+    for body in CallbackFactory("DS_12P_CNCL").render_many(resource_ids=sent_resource_ids):
+        srtp_rfc_callback(cert_path=cert, key_path=key, rtp_payload=body)
+"""
+
+import itertools
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+
+from utils.type_utils import JsonType
+
+from .dataset_callback_data_DS_04b_compliant import generate_callback_data_DS_04b_compliant
+from .dataset_callback_data_DS_05_ACTC_compliant import generate_callback_data_DS_05_ACTC_compliant
+from .dataset_callback_data_DS_08N_compliant import generate_callback_data_DS_08N_compliant
+from .dataset_callback_data_DS_08P_ACCP_compliant import generate_callback_data_DS_08P_ACCP_compliant
+from .dataset_callback_data_DS_08P_ACWC_compliant import generate_callback_data_DS_08P_ACWC_compliant
+from .dataset_callback_data_DS_08P_RJCT_compliant import generate_callback_data_DS_08P_RJCT_compliant
+from .dataset_callback_data_DS_12_base import generate_rfc_callback_data
+from .datetime_utils import generate_create_time
+from .generators_utils import generate_random_string
+from .json_codec import loads
+from .json_template import JsonTemplate, escape, slot
+
+
+@dataclass(frozen=True)
+class _Variant:
+    generate: Callable[[str], JsonType] | None
+    status: str
+    rfc: bool = False
+
+
+# Non-compliant callbacks are rendered from the compliant variant with status="INVALID"
+VARIANTS = {
+    "DS_04b": _Variant(generate_callback_data_DS_04b_compliant, "RJCT"),
+    "DS_05_ACTC": _Variant(generate_callback_data_DS_05_ACTC_compliant, "ACTC"),
+    "DS_08N": _Variant(generate_callback_data_DS_08N_compliant, "RJCT"),
+    "DS_08P_ACCP": _Variant(generate_callback_data_DS_08P_ACCP_compliant, "ACCP"),
+    "DS_08P_ACWC": _Variant(generate_callback_data_DS_08P_ACWC_compliant, "ACWC"),
+    "DS_08P_RJCT": _Variant(generate_callback_data_DS_08P_RJCT_compliant, "RJCT"),
+    "DS_12P_CNCL": _Variant(None, "CNCL", rfc=True),
+    "DS_12N_RJCR": _Variant(None, "RJCR", rfc=True),
+}
+
+
+def _send_skeleton(generate: Callable[[str], JsonType]) -> JsonType:
+    """RTP callback (/cb/send) of a DS-04/05/08 generator with slots in place of the per-callback fields."""
+    payload = generate(slot("bic"))
+    payload["resourceId"] = slot("resourceId")
+    response = payload["AsynchronousSepaRequestToPayResponse"]
+    if "Document" in response:
+        # DS-05 / DS-08 shape
+        response["resourceId"] = slot("resourceId")
+        report = response["Document"]["CdtrPmtActvtnReqStsRpt"]
+        transaction = report["OrgnlPmtInfAndSts"][0]["TxInfAndSts"]
+        transaction["StsId"] = slot("messageId")
+        transaction["TxSts"] = slot("status")
+    else:
+        # DS-04 shape
+        report = response["CdtrPmtActvtnReqStsRpt"]
+        report["OrgnlPmtInfAndSts"][0]["TxInfAndSts"]["TxSts"] = [slot("status")]
+        link = payload["_links"]["initialSepaRequestToPayUri"]
+        link["href"] = f"{link['href'].rsplit('/', 1)[0]}/{slot('resourceId')}"
+    report["GrpHdr"]["MsgId"] = slot("messageId")
+    report["GrpHdr"]["CreDtTm"] = slot("createdAt")
+    report["OrgnlGrpInfAndSts"]["OrgnlMsgId"] = slot("msgId")
+    return payload
+
+
+def _rfc_skeleton() -> JsonType:
+    """RFC callback (/cb/cancel) of the DS-12 base generator with slots in place of the per-callback fields."""
+    payload = generate_rfc_callback_data(
+        status=slot("status"),
+        bic=slot("bic"),
+        resource_id=slot("resourceId"),
+        original_msg_id=slot("msgId"),
+        assignee_bic=slot("assigneeBic"),
+    )
+    investigation = payload["SepaRequestToPayCancellationResponse"]["Document"]["RsltnOfInvstgtn"]
+    investigation["Assgnmt"]["CreDtTm"] = slot("createdAt")
+    transaction = investigation["CxlDtls"]["TxInfAndSts"][0]
+    transaction["CxlStsId"] = slot("messageId")
+    transaction["OrgnlGrpInf"]["OrgnlCreDtTm"] = slot("createdAt")
+    return payload
+
+
+class CallbackFactory:
+    """Compiled callback payload of one DS variant.
+
+    Args:
+        variant: Key of VARIANTS, e.g. "DS_08P_ACCP" or "DS_12P_CNCL".
+        bic: Default BIC of the callback sender, overridable per callback.
+        assignee_bic: Assignee BIC of RFC callbacks (DS-12), used for certificate verification.
+
+    Attributes:
+        status: Default status of the variant (TxSts, or Sts.Conf for RFC callbacks).
+        rfc: True for DS-12 callbacks, to be sent with `srtp_rfc_callback` (/cb/cancel);
+            the others go through `srtp_callback` (/cb/send).
+    """
+
+    def __init__(self, variant: str, bic: str = "MOCKSP04", assignee_bic: str = "MOCKSP04"):
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown callback variant {variant!r}, expected one of {sorted(VARIANTS)}")
+        spec = VARIANTS[variant]
+        self.variant = variant
+        self.status = spec.status
+        self.rfc = spec.rfc
+        self.bic = bic
+        self.assignee_bic = assignee_bic
+        self._template = JsonTemplate(_rfc_skeleton() if spec.rfc else _send_skeleton(spec.generate))
+
+    def _default_resource_id(self) -> str:
+        return str(uuid.uuid4()) if self.rfc else f"TestRtpMessage{generate_random_string(16)}"
+
+    def _default_msg_id(self, resource_id: str) -> str:
+        # An RFC callback refers to the RTP by its resourceId, whose MsgId is the same UUID without dashes
+        return resource_id.replace("-", "") if self.rfc else f"TestRtpMessage{generate_random_string(20)}"
+
+    def _message_id(self) -> str:
+        return uuid.uuid4().hex if self.rfc else str(uuid.uuid4())
+
+    def render(
+        self,
+        resource_id: str = None,
+        msg_id: str = None,
+        status: str = None,
+        bic: str = None,
+        created_at: str = None,
+    ) -> str:
+        """Return one serialized callback.
+
+        Args:
+            resource_id: Callback resourceId; for RFC callbacks the resourceId of the cancelled RTP.
+                Random in the generator's format if omitted.
+            msg_id: OrgnlMsgId of the RTP the callback refers to. Random if omitted, or derived
+                from `resource_id` for RFC callbacks.
+            status: Status to report (defaults to the variant status, e.g. "INVALID" for a
+                non-compliant callback).
+            bic: Sender BIC (defaults to the factory BIC).
+            created_at: Creation timestamp (defaults to now).
+        """
+        resource_id = resource_id or self._default_resource_id()
+        return self._template.render(
+            {
+                "resourceId": escape(resource_id),
+                "msgId": escape(msg_id or self._default_msg_id(resource_id)),
+                "messageId": self._message_id(),
+                "createdAt": escape(created_at or generate_create_time()),
+                "status": escape(status or self.status),
+                "bic": escape(bic or self.bic),
+                "assigneeBic": escape(self.assignee_bic),
+            }
+        )
+
+    def render_dict(self, **fields) -> JsonType:
+        """Like `render`, parsed back into a dict for callers that post JSON objects."""
+        return loads(self.render(**fields))
+
+    def render_many(
+        self,
+        count: int = None,
+        resource_ids: Iterable[str] = None,
+        msg_ids: Iterable[str] = None,
+        status: str = None,
+        bic: str = None,
+    ) -> Iterator[str]:
+        """Lazily yield serialized callbacks, one per resource ID / message ID.
+
+        Static slot values are encoded once for the whole stream. The stream ends after `count`
+        callbacks or when `resource_ids` / `msg_ids` is exhausted, whichever comes first; with
+        neither `count` nor an iterable it is endless.
+
+        Args:
+            count: Maximum number of callbacks.
+            resource_ids: resourceId of every callback, random if omitted.
+            msg_ids: OrgnlMsgId of every callback, as in `render` if omitted.
+            status: Status reported by every callback.
+            bic: Sender BIC of every callback.
+        """
+        static = {
+            "status": escape(status or self.status),
+            "bic": escape(bic or self.bic),
+            "assigneeBic": escape(self.assignee_bic),
+        }
+        resource_ids = iter(resource_ids) if resource_ids is not None else None
+        msg_ids = iter(msg_ids) if msg_ids is not None else None
+        render = self._template.render
+        for _ in range(count) if count is not None else itertools.count():
+            resource_id = next(resource_ids, None) if resource_ids is not None else self._default_resource_id()
+            if resource_id is None:
+                return
+            msg_id = next(msg_ids, None) if msg_ids is not None else self._default_msg_id(resource_id)
+            if msg_id is None:
+                return
+            yield render(
+                {
+                    **static,
+                    "resourceId": escape(resource_id),
+                    "msgId": escape(msg_id),
+                    "messageId": self._message_id(),
+                    "createdAt": generate_create_time(),
+                }
+            )
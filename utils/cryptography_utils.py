@@ -2,12 +2,15 @@
 
 This module provides functions to:
 - build HTTP Basic auth tokens from client credentials,
-- convert PKCS#12 (.pfx) bundles to PEM-encoded certificate and key files,
+- convert PKCS#12 (.pfx) bundles to PEM-encoded certificate and key files, once per
+  process and bundle content (``cached_pfx_to_pem``),
 - extract certificate serial numbers from PEM data.
 """
 
 import base64
+import hashlib
 import os
+import threading
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
@@ -50,18 +53,72 @@ def pfx_to_pem(base64_pfx, base64_password, cert_destination_path=None, key_dest
     private_key, certificate, _ = load_key_and_certificates(pfx_data, pfx_password)
 
     if certificate:
-        os.makedirs(os.path.dirname(cert_destination_path), exist_ok=True)
-        with open(cert_destination_path, "wb+") as cert_file:
-            cert_file.write(certificate.public_bytes(Encoding.PEM))
+        _write_atomically(cert_destination_path, certificate.public_bytes(Encoding.PEM), 0o644)
 
     if private_key:
-        os.makedirs(os.path.dirname(key_destination_path), exist_ok=True)
-        with open(key_destination_path, "wb+") as key_file:
-            key_file.write(private_key.private_bytes(Encoding.PEM, PrivateFormat.TraditionalOpenSSL, NoEncryption()))
+        key_pem = private_key.private_bytes(Encoding.PEM, PrivateFormat.TraditionalOpenSSL, NoEncryption())
+        _write_atomically(key_destination_path, key_pem, 0o600)
 
     return cert_destination_path, key_destination_path
 
 
+def _write_atomically(path, data, mode):
+    """Replace `path` in one step, so a concurrent TLS handshake never reads a half-written PEM."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    descriptor = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(descriptor, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+class PemCache:
+    """Remember which PKCS#12 bundles were already materialised, keyed by a hash of their content.
+
+    Decoding and parsing a PFX and rewriting the PEM files happens once per bundle and destination;
+    later calls return the same paths, so mTLS sessions pooled per (cert, key) keep being reused.
+    """
+
+    def __init__(self):
+        self.conversions = 0
+        self.hits = 0
+        self._materialised: dict[tuple[str, str, str], tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def pfx_to_pem(self, base64_pfx, base64_password, cert_destination_path, key_destination_path):
+        """Cached variant of ``pfx_to_pem`` with the same arguments and return value."""
+        digest = hashlib.sha256(f"{base64_pfx or ''}\0{base64_password or ''}".encode()).hexdigest()
+        cache_key = (digest, str(cert_destination_path), str(key_destination_path))
+        with self._lock:
+            paths = self._materialised.get(cache_key)
+            if paths and all(os.path.exists(path) for path in paths):
+                self.hits += 1
+                return paths
+            paths = pfx_to_pem(base64_pfx, base64_password, cert_destination_path, key_destination_path)
+            self._materialised[cache_key] = paths
+            self.conversions += 1
+            return paths
+
+
+pem_cache = PemCache()
+
+
+def cached_pfx_to_pem(base64_pfx, base64_password, cert_destination_path=None, key_destination_path=None):
+    """Convert a base64-encoded PFX archive into PEM files once per process and bundle content.
+
+    Args:
+        base64_pfx: Base64-encoded PKCS#12 (.pfx) content.
+        base64_password: Base64-encoded password protecting the PFX.
+        cert_destination_path: Filesystem path where the PEM certificate is written.
+        key_destination_path: Filesystem path where the PEM private key is written.
+
+    Returns:
+        A tuple ``(cert_destination_path, key_destination_path)`` with the paths
+        of the materialised files.
+    """
+    return pem_cache.pfx_to_pem(base64_pfx, base64_password, cert_destination_path, key_destination_path)
+
+
 def get_serial_from_pem(pem_data):
     """Extract the certificate serial number in hexadecimal from PEM data.
 
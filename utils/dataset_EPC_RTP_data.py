@@ -1,13 +1,21 @@
+import json
+import random
+import time
 import uuid
-from datetime import UTC, datetime
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, timedelta
 
 from utils.text_utils import fake
 
 from .constants_config_helper import CALLBACK_URL
 from .constants_secrets_helper import CBI_PAYEE_ID, CREDITOR_AGENT_ID
 from .dataset_RTP_data import generate_rtp_data
-from .generators_utils import generate_random_organization_id
+from .datetime_utils import generate_expiry_date
+from .fiscal_code_utils import fake_fc_batch
+from .generators_utils import generate_random_digits, generate_random_organization_id, random_digit_batch
 from .iban_utils import generate_random_iban
+from .json_codec import loads
+from .json_template import JsonTemplate, escape, slot
 
 
 def generate_epc_rtp_data(
@@ -37,29 +45,57 @@ def generate_epc_rtp_data(
         creditor_agent_id = CREDITOR_AGENT_ID
 
     resource_id = str(uuid.uuid4())
-    sanitized_id = resource_id.replace("-", "")
 
-    initiating_party_id = generate_random_organization_id()
-    organization_name = fake.company()
-    creditor_iban = generate_random_iban()
+    return _epc_rtp_document(
+        {
+            **_rtp_data_slots(rtp_data),
+            "resourceId": resource_id,
+            "msgId": resource_id.replace("-", ""),
+            "creDtTm": datetime.now(UTC).astimezone().isoformat(timespec="milliseconds"),
+            "initgPtyNm": fake.company(),
+            "initgPtyId": generate_random_organization_id(),
+            "bic": bic,
+            "creditorAgentId": creditor_agent_id,
+            "payeeId": payee_id,
+            "creditorIban": generate_random_iban(),
+            "callbackUrl": CALLBACK_URL,
+        }
+    )
 
-    debtor_bic = bic
 
+def _rtp_data_slots(rtp_data: dict) -> dict:
+    """Map RTP data onto the EPC document slots."""
+    notice = rtp_data["paymentNotice"]
     return {
-        "resourceId": resource_id,
+        "noticeNumber": notice["noticeNumber"],
+        "expiryDate": notice["expiryDate"],
+        "amount": float(notice["amount"]),
+        "payerName": rtp_data["payer"]["name"],
+        "payerId": rtp_data["payer"]["payerId"],
+        "payeeName": rtp_data["payee"]["name"],
+        "atrInstr": f"ATR113/{rtp_data['payee']['payTrxRef']}",
+        "ustrdNotice": f"{notice['subject']}/{notice['noticeNumber']}",
+        "ustrdDescription": f"ATS001/{notice['description']}",
+    }
+
+
+def _epc_rtp_document(slots: dict) -> dict:
+    """Build the EPC CdtrPmtActvtnReq document from its slot values; the single definition of its structure."""
+    return {
+        "resourceId": slots["resourceId"],
         "Document": {
             "CdtrPmtActvtnReq": {
                 "GrpHdr": {
-                    "MsgId": sanitized_id,
-                    "CreDtTm": datetime.now(UTC).astimezone().isoformat(timespec="milliseconds"),
+                    "MsgId": slots["msgId"],
+                    "CreDtTm": slots["creDtTm"],
                     "NbOfTxs": "1",
                     "InitgPty": {
-                        "Nm": organization_name,
+                        "Nm": slots["initgPtyNm"],
                         "Id": {
                             "OrgId": {
                                 "Othr": [
                                     {
-                                        "Id": initiating_party_id,
+                                        "Id": slots["initgPtyId"],
                                         "SchmeNm": {"Cd": "BOID"},
                                     }
                                 ]
@@ -69,66 +105,66 @@ def generate_epc_rtp_data(
                 },
                 "PmtInf": [
                     {
-                        "PmtInfId": rtp_data["paymentNotice"]["noticeNumber"],
+                        "PmtInfId": slots["noticeNumber"],
                         "PmtMtd": "TRF",
-                        "ReqdExctnDt": {"Dt": rtp_data["paymentNotice"]["expiryDate"]},
-                        "XpryDt": {"Dt": rtp_data["paymentNotice"]["expiryDate"]},
+                        "ReqdExctnDt": {"Dt": slots["expiryDate"]},
+                        "XpryDt": {"Dt": slots["expiryDate"]},
                         "Dbtr": {
-                            "Nm": rtp_data["payer"]["name"],
+                            "Nm": slots["payerName"],
                             "Id": {
                                 "PrvtId": {
                                     "Othr": [
                                         {
-                                            "Id": rtp_data["payer"]["payerId"],
+                                            "Id": slots["payerId"],
                                             "SchmeNm": {"Cd": "POID"},
                                         }
                                     ]
                                 }
                             },
                         },
-                        "DbtrAgt": {"FinInstnId": {"BICFI": debtor_bic}},
+                        "DbtrAgt": {"FinInstnId": {"BICFI": slots["bic"]}},
                         "CdtTrfTx": [
                             {
                                 "PmtId": {
-                                    "InstrId": sanitized_id,
-                                    "EndToEndId": rtp_data["paymentNotice"]["noticeNumber"],
+                                    "InstrId": slots["msgId"],
+                                    "EndToEndId": slots["noticeNumber"],
                                 },
                                 "PmtTpInf": {
                                     "SvcLvl": {"Cd": "SRTP"},
                                     "LclInstrm": {"Prtry": "PAGOPA"},
                                 },
-                                "Amt": {"InstdAmt": float(rtp_data["paymentNotice"]["amount"])},
+                                "Amt": {"InstdAmt": slots["amount"]},
                                 "ChrgBr": "SLEV",
                                 "CdtrAgt": {
                                     "FinInstnId": {
                                         "Othr": {
-                                            "Id": creditor_agent_id,
+                                            "Id": slots["creditorAgentId"],
                                             "SchmeNm": {"Cd": "BOID"},
                                         }
                                     }
                                 },
                                 "Cdtr": {
-                                    "Nm": rtp_data["payee"]["name"],
+                                    "Nm": slots["payeeName"],
                                     "Id": {
                                         "OrgId": {
                                             "Othr": [
                                                 {
-                                                    "Id": payee_id,
+                                                    "Id": slots["payeeId"],
                                                     "SchmeNm": {"Cd": "BOID"},
                                                 }
                                             ]
                                         }
                                     },
                                 },
-                                "CdtrAcct": {"Id": {"IBAN": creditor_iban}},
+                                "CdtrAcct": {"Id": {"IBAN": slots["creditorIban"]}},
                                 "InstrForCdtrAgt": [
-                                    {"InstrInf": f"ATR113/{rtp_data['payee']['payTrxRef']}"},
+                                    {"InstrInf": slots["atrInstr"]},
                                     {"InstrInf": "flgConf"},
                                 ],
                                 "RmtInf": {
                                     "Ustrd": [
-                                        f"{rtp_data['paymentNotice']['subject']}/{rtp_data['paymentNotice']['noticeNumber']}",
-                                        f"ATS001/{rtp_data['paymentNotice']['description']}",
+                                        slots["ustrdNotice"],
+                                        slots["ustrdDescription"],
                                     ]
                                 },
                                 "NclsdFile": [],
@@ -138,5 +174,160 @@ def generate_epc_rtp_data(
                 ],
             }
         },
-        "callbackUrl": CALLBACK_URL,
+        "callbackUrl": slots["callbackUrl"],
     }
+
+
+# Slots filled per payload by EpcRtpTemplate; every other slot is compiled into the template text
+VARIABLE_SLOTS = (
+    "resourceId",
+    "msgId",
+    "creDtTm",
+    "noticeNumber",
+    "ustrdNotice",
+    "expiryDate",
+    "amount",
+    "payerId",
+    "bic",
+    "creditorIban",
+)
+
+
+class EpcRtpTemplate:
+    """EPC RTP payload compiled once into JSON text with holes for the per-payload slots.
+
+    The fixed part of the document (initiating party, payer and payee names, payee ID, creditor
+    agent, remittance description, callback URL) is serialized at construction; `render` only
+    encodes the VARIABLE_SLOTS values and joins them with the precompiled fragments, so a payload
+    costs a few microseconds instead of a full `generate_epc_rtp_data` call.
+
+    Args:
+        rtp_data: RTP data providing the fixed names and remittance texts (random if omitted).
+        payee_id: Payee ID (defaults to CBI_PAYEE_ID from secrets).
+        creditor_agent_id: Creditor agent ID (defaults to CREDITOR_AGENT_ID from secrets).
+        bic: Default debtor agent BIC, overridable per payload.
+        creditor_iban: Default creditor IBAN, overridable per payload (random if omitted).
+    """
+
+    def __init__(
+        self,
+        rtp_data: dict = None,
+        payee_id: str = None,
+        creditor_agent_id: str = None,
+        bic: str = None,
+        creditor_iban: str = None,
+    ):
+        rtp_data = rtp_data or generate_rtp_data()
+        self.subject = rtp_data["paymentNotice"]["subject"]
+        self.bic = bic
+        self.creditor_iban = creditor_iban or generate_random_iban()
+
+        slots = {
+            **_rtp_data_slots(rtp_data),
+            "initgPtyNm": fake.company(),
+            "initgPtyId": generate_random_organization_id(),
+            "creditorAgentId": creditor_agent_id or CREDITOR_AGENT_ID,
+            "payeeId": payee_id or CBI_PAYEE_ID,
+            "callbackUrl": CALLBACK_URL,
+        }
+        slots.update({name: slot(name) for name in VARIABLE_SLOTS})
+        self._template = JsonTemplate(_epc_rtp_document(slots), raw_slots=("amount", "bic"))
+
+    def render(
+        self,
+        resource_id: str = None,
+        notice_number: str = None,
+        amount: float = None,
+        payer_id: str = None,
+        expiry_date: str = None,
+        bic: str = None,
+        creditor_iban: str = None,
+        created_at: str = None,
+    ) -> str:
+        """Return one serialized payload; omitted slots get fresh random values or the template defaults."""
+        return self._render(
+            resource_id or str(uuid.uuid4()),
+            notice_number or generate_random_digits(18),
+            float(random.randint(0, 999999999) if amount is None else amount),
+            payer_id or fake_fc_batch(1)[0],
+            expiry_date or generate_expiry_date(),
+            bic or self.bic,
+            creditor_iban or self.creditor_iban,
+            created_at or _current_timestamp(),
+        )
+
+    def _render(
+        self,
+        resource_id: str,
+        notice_number: str,
+        amount: float,
+        payer_id: str,
+        expiry_date: str,
+        bic: str | None,
+        creditor_iban: str,
+        created_at: str,
+    ) -> str:
+        return self._template.render(
+            {
+                "resourceId": escape(resource_id),
+                "msgId": escape(resource_id.replace("-", "")),
+                "creDtTm": escape(created_at),
+                "noticeNumber": escape(notice_number),
+                "ustrdNotice": escape(f"{self.subject}/{notice_number}"),
+                "expiryDate": escape(expiry_date),
+                "amount": float.__repr__(amount),
+                "payerId": escape(payer_id),
+                "bic": json.dumps(bic),
+                "creditorIban": escape(creditor_iban),
+            }
+        )
+
+    def render_dict(self, **slots) -> dict:
+        """Like `render`, parsed back into a dict for the `send_srtp_to_*` clients."""
+        return loads(self.render(**slots))
+
+    def render_many(self, count: int, bic: str = None, payer_ids: list[str] = None) -> Iterator[str]:
+        """Yield `count` serialized payloads with unique resource IDs, notice numbers and payer IDs.
+
+        Payer IDs (unless given) and notice numbers are drawn in one batch, expiry dates come from a
+        precomputed list and the creation timestamp reuses its date and UTC offset, so the
+        per-payload cost is mostly the slot encoding.
+        """
+        payer_ids = payer_ids or fake_fc_batch(count)
+        notice_numbers = random_digit_batch(count, 18)
+        today = date.today()
+        expiry_dates = [(today + timedelta(days=days)).isoformat() for days in range(1, 366)]
+        bic = bic or self.bic
+        for payer_id, notice_number in zip(payer_ids, notice_numbers):
+            yield self._render(
+                str(uuid.uuid4()),
+                notice_number,
+                float(random.randint(0, 999999999)),
+                payer_id,
+                random.choice(expiry_dates),
+                bic,
+                self.creditor_iban,
+                _current_timestamp(),
+            )
+
+
+# (year, day of year, UTC offset) -> ("YYYY-MM-DDT", "+HH:MM"), the parts of the timestamp that rarely change
+_timestamp_parts: tuple[tuple[int, int, int], tuple[str, str]] = ((0, 0, 0), ("", ""))
+
+
+def _current_timestamp() -> str:
+    """Local ISO timestamp with milliseconds; only the time of day is formatted on every call."""
+    global _timestamp_parts
+    now = time.time()
+    local = time.localtime(now)
+    key = (local.tm_year, local.tm_yday, local.tm_gmtoff)
+    if key != _timestamp_parts[0]:
+        offset_minutes = abs(local.tm_gmtoff) // 60
+        sign = "-" if local.tm_gmtoff < 0 else "+"
+        _timestamp_parts = (
+            key,
+            (time.strftime("%Y-%m-%dT", local), f"{sign}{offset_minutes // 60:02d}:{offset_minutes % 60:02d}"),
+        )
+    day, offset = _timestamp_parts[1]
+    millis = int(now % 1 * 1000)
+    return f"{day}{local.tm_hour:02d}:{local.tm_min:02d}:{local.tm_sec:02d}.{millis:03d}{offset}"
@@ -54,6 +54,24 @@ def generate_random_digits(length: int) -> str:
     return "".join(random.choices("0123456789", k=length))
 
 
+def random_digit_batch(count: int, length: int) -> list[str]:
+    """Generate `count` distinct random digit strings of the given length.
+
+    Args:
+        count: Number of strings to generate
+        length: Digits per string
+
+    Returns:
+        List of unique, zero-padded digit strings
+    """
+    if count > 10**length:
+        raise ValueError(f"Cannot draw {count} unique {length}-digit strings")
+    values: dict[str, None] = {}
+    while len(values) < count:
+        values.update(dict.fromkeys(f"{random.randrange(10**length):0{length}d}" for _ in range(count - len(values))))
+    return list(values)
+
+
 def generate_iuv():
     """
     Generate a unique IUV (Identificativo Univoco Versamento).
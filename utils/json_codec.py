@@ -0,0 +1,101 @@
+"""JSON codec shared by the api/ clients, the load-tests/ drivers, NDJSON writers and report tooling.
+
+Uses orjson when it is installed (``pip install -e .[fast-json]``), the stdlib ``json`` module
+otherwise. Both produce compact UTF-8 JSON with non-ASCII characters unescaped and only differ
+in float exponent notation (``1e16`` vs ``1e+16``). Both reject NaN and Infinity with
+``ValueError``, which is not valid JSON (orjson alone would silently write null). Set
+``RTP_JSON_CODEC=stdlib`` to force the fallback, e.g. to compare timings.
+
+orjson only handles str keys and 64-bit integers: documents outside that range are encoded by
+the stdlib, so every value the stdlib accepts is accepted here too.
+"""
+
+import json
+import math
+import os
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+if os.getenv("RTP_JSON_CODEC", "").lower() == "stdlib":
+    orjson = None
+
+BACKEND = "orjson" if orjson else "stdlib"
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both backends
+JSONDecodeError = json.JSONDecodeError
+
+
+# Fallback encoders by (indent, sort_keys), built once: json.dumps with options creates one per call
+_STDLIB_ENCODERS = {
+    (indent, sort_keys): json.JSONEncoder(
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        sort_keys=sort_keys,
+    )
+    for indent in (False, True)
+    for sort_keys in (False, True)
+}
+
+
+def _stdlib_dumps(obj, indent: bool, sort_keys: bool) -> bytes:
+    return _STDLIB_ENCODERS[bool(indent), bool(sort_keys)].encode(obj).encode("utf-8")
+
+
+def _has_non_finite(obj) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, list | tuple):
+        return any(_has_non_finite(item) for item in obj)
+    return False
+
+
+def dumps(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize `obj` to UTF-8 JSON bytes.
+
+    Args:
+        obj: JSON-serializable value.
+        indent: Pretty-print with two-space indentation instead of the compact form.
+        sort_keys: Emit object keys in sorted order.
+
+    Returns:
+        The encoded document, compact (no spaces) unless `indent` is set.
+
+    Raises:
+        ValueError: `obj` contains NaN or Infinity.
+    """
+    if orjson:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            encoded = orjson.dumps(obj, option=option)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            # orjson writes NaN/Infinity as null: only documents containing a null need the check
+            if b"null" in encoded and _has_non_finite(obj):
+                raise ValueError("Out of range float values are not JSON compliant")
+            return encoded
+    return _stdlib_dumps(obj, indent, sort_keys)
+
+
+def dumps_str(obj, indent: bool = False, sort_keys: bool = False) -> str:
+    """Like `dumps`, decoded to str for text files and console output."""
+    return dumps(obj, indent=indent, sort_keys=sort_keys).decode("utf-8")
+
+
+def ndjson_line(obj) -> bytes:
+    """One NDJSON line (the compact record followed by a newline) as bytes, for binary-mode files."""
+    return dumps(obj) + b"\n"
+
+
+def loads(data: bytes | bytearray | memoryview | str):
+    """Parse a JSON document from bytes or str; raises `JSONDecodeError` on invalid input."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
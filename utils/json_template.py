@@ -0,0 +1,65 @@
+"""JSON documents serialized once, with named holes filled on every render.
+
+A document is built with `slot(name)` in place of its per-payload values and compiled by
+`JsonTemplate`; the fixed part is serialized a single time and `render` only substitutes the
+slot values, which is what makes bulk payload generation cheap.
+"""
+
+import json
+import re
+from collections.abc import Collection, Mapping
+from json.encoder import encode_basestring_ascii
+from operator import itemgetter
+
+# json.dumps escapes the NUL delimiters, so a slot appears in the serialized text as \u0000<name>\u0000
+_SLOT_PATTERN = re.compile(r"\\u0000(\w+)\\u0000")
+
+
+def slot(name: str) -> str:
+    """Placeholder for the slot `name`, usable as a whole string value or inside one."""
+    return f"\0{name}\0"
+
+
+def escape(value: str) -> str:
+    """Escape `value` for a string slot (JSON string content, without the surrounding quotes)."""
+    return encode_basestring_ascii(value)[1:-1]
+
+
+class JsonTemplate:
+    """Compiled JSON document.
+
+    Args:
+        document: JSON-serializable document containing `slot(...)` placeholders.
+        raw_slots: Slots whose placeholder is a whole string value to be replaced by any JSON
+            value (number, null, ...); their surrounding quotes are dropped at compile time.
+
+    Attributes:
+        slots: Names of the slots found in the document.
+    """
+
+    def __init__(self, document: object, raw_slots: Collection[str] = ()):
+        # re.split alternates literal fragments and slot names: [text, slot, text, slot, ..., text]
+        parts = _SLOT_PATTERN.split(json.dumps(document))
+        fragments, names = parts[0::2], parts[1::2]
+        for index, name in enumerate(names):
+            if name in raw_slots:
+                fragments[index] = fragments[index].removesuffix('"')
+                fragments[index + 1] = fragments[index + 1].removeprefix('"')
+
+        self.slots = frozenset(names)
+        # Fragments stay at the even positions, slot values are written over the odd ones on every render
+        parts[0::2] = fragments
+        self._parts = parts
+        self._slot_values = (
+            itemgetter(*names) if len(names) > 1 else lambda values: tuple(values[name] for name in names)
+        )
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """Return the serialized document with every slot replaced.
+
+        Args:
+            values: Text of every slot: `escape`d content for string slots, JSON text for raw slots.
+        """
+        parts = self._parts.copy()
+        parts[1::2] = self._slot_values(values)
+        return "".join(parts)
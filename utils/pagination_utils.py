@@ -0,0 +1,327 @@
+"""Streaming iterators over paginated listings.
+
+Each stream yields the items of every page lazily and fetches the next page in a background
+thread while the current one is being consumed, so enumerating a large listing costs roughly
+one request latency per page instead of request latency plus processing time. Page-number
+listings can also fetch several pages at once once the first page reports the total.
+"""
+
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+
+import requests
+
+from api.debtor_activation_api import get_all_activations
+from api.service_registry_payee_registry_api import (
+    CONSENTS_DEFAULT_PAGE_SIZE,
+    CONSENTS_DEFAULT_VALUE,
+    get_payee_registry,
+    get_payees_consents,
+)
+from utils.datetime_utils import get_date_or_default_today
+from utils.extract_next_activation_id import extract_next_activation_id
+from utils.generator_random_values_utils import MAX_PAGE_SIZE, MIN_PAGE_SIZE
+
+
+def _checked_page_size(size: int) -> int:
+    if not MIN_PAGE_SIZE <= size <= MAX_PAGE_SIZE:
+        raise ValueError(f"Page size must be between {MIN_PAGE_SIZE} and {MAX_PAGE_SIZE}, got {size}")
+    return size
+
+
+def _fetch_page(request: Callable[[], requests.Response]) -> requests.Response:
+    response = request()
+    response.raise_for_status()
+    return response
+
+
+class ActivationStream:
+    """Iterable over every activation visible to a service provider, following the NextActivationId cursor.
+
+    Args:
+        access_token: Bearer token of the debtor service provider.
+        size: Page size, between MIN_PAGE_SIZE and MAX_PAGE_SIZE.
+        prefetch: Request the next page as soon as the current one arrives.
+
+    Attributes:
+        pages: Pages fetched so far.
+        items: Activations yielded so far.
+    """
+
+    def __init__(self, access_token: str, size: int = MAX_PAGE_SIZE, prefetch: bool = True):
+        self.access_token = access_token
+        self.size = _checked_page_size(size)
+        self.prefetch = prefetch
+        self.pages = 0
+        self.items = 0
+
+    def _request(self, next_activation_id: str | None) -> Callable[[], requests.Response]:
+        return lambda: get_all_activations(self.access_token, size=self.size, next_activation_id=next_activation_id)
+
+    def __iter__(self) -> Iterator[dict]:
+        executor = ThreadPoolExecutor(max_workers=1) if self.prefetch else None
+        try:
+            response = _fetch_page(self._request(None))
+            while response is not None:
+                self.pages += 1
+                # A cursor past the last activation is answered with an empty body
+                has_body = bool(response.content.strip())
+                next_activation_id = extract_next_activation_id(response) if has_body else None
+                upcoming: Future | None = None
+                if next_activation_id and executor:
+                    upcoming = executor.submit(_fetch_page, self._request(next_activation_id))
+
+                for activation in (response.json().get("activations") if has_body else None) or []:
+                    self.items += 1
+                    yield activation
+
+                if upcoming is not None:
+                    response = upcoming.result()
+                elif next_activation_id:
+                    response = _fetch_page(self._request(next_activation_id))
+                else:
+                    response = None
+        finally:
+            # An abandoned stream must not leave a page request running
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_activations(access_token: str, size: int = MAX_PAGE_SIZE, prefetch: bool = True) -> ActivationStream:
+    """Return a lazy stream of every activation, see `ActivationStream`.
+
+    Example:
+        stream = iter_activations(token, size=64)
+        fiscal_codes = [activation["payer"]["fiscalCode"] for activation in stream]
+        print(stream.pages, stream.items)
+    """
+    return ActivationStream(access_token, size=size, prefetch=prefetch)
+
+
+class PagedStream:
+    """Iterable over every item of a page-number listing (page 0, 1, ...), in page order.
+
+    The first page is fetched alone; when its `page`/`metadata` object reports `totalPages`, up to
+    `parallel_pages` of the following pages are kept in flight at once. Without a total, pages are
+    read one ahead until a page comes back shorter than the first one.
+
+    Args:
+        fetch_page: Callable returning the response for a 0-based page number.
+        items_key: Body field holding the page items; None takes the first list-valued field.
+        parallel_pages: Pages requested concurrently; 1 only prefetches the next page.
+
+    Attributes:
+        pages: Pages fetched so far.
+        items: Items yielded so far.
+        total_pages: `totalPages` reported by the first page, if any.
+    """
+
+    def __init__(
+        self, fetch_page: Callable[[int], requests.Response], items_key: str | None = None, parallel_pages: int = 1
+    ):
+        self.fetch_page = fetch_page
+        self.items_key = items_key
+        self.parallel_pages = max(parallel_pages, 1)
+        self.pages = 0
+        self.items = 0
+        self.total_pages: int | None = None
+
+    def _page_items(self, body: dict) -> list:
+        if self.items_key is not None:
+            return body.get(self.items_key) or []
+        return next((value for value in body.values() if isinstance(value, list)), [])
+
+    def _yield_page(self, response: requests.Response) -> Iterator[dict]:
+        self.pages += 1
+        for item in self._page_items(response.json()):
+            self.items += 1
+            yield item
+
+    def __iter__(self) -> Iterator[dict]:
+        first = _fetch_page(lambda: self.fetch_page(0))
+        body = first.json()
+        self.total_pages = (body.get("page") or body.get("metadata") or {}).get("totalPages")
+        first_size = len(self._page_items(body))
+
+        executor = ThreadPoolExecutor(max_workers=self.parallel_pages)
+        try:
+            if self.total_pages is not None:
+                yield from self._iter_known_total(first, executor)
+            else:
+                yield from self._iter_until_short(first, first_size, executor)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_known_total(self, first: requests.Response, executor: ThreadPoolExecutor) -> Iterator[dict]:
+        upcoming_pages = iter(range(1, self.total_pages))
+        in_flight: deque[Future] = deque()
+
+        def refill() -> None:
+            while len(in_flight) < self.parallel_pages:
+                page = next(upcoming_pages, None)
+                if page is None:
+                    return
+                in_flight.append(executor.submit(_fetch_page, lambda page=page: self.fetch_page(page)))
+
+        refill()
+        yield from self._yield_page(first)
+        while in_flight:
+            response = in_flight.popleft().result()
+            refill()
+            yield from self._yield_page(response)
+
+    def _iter_until_short(
+        self, first: requests.Response, first_size: int, executor: ThreadPoolExecutor
+    ) -> Iterator[dict]:
+        response, page = first, 0
+        while True:
+            page_size = len(self._page_items(response.json()))
+            upcoming = None
+            if first_size and page_size == first_size:
+                upcoming = executor.submit(_fetch_page, lambda next_page=page + 1: self.fetch_page(next_page))
+            yield from self._yield_page(response)
+            if upcoming is None:
+                return
+            response, page = upcoming.result(), page + 1
+
+
+class WindowedStream:
+    """Iterable chaining one stream per date window, fetching up to `parallel_windows` windows at once.
+
+    Windows are yielded in date order; each window is read in full by its worker before being yielded.
+    At most `parallel_windows` windows are in flight, the next one being submitted as one is consumed,
+    and closing the stream early cancels the pending windows and stops the running ones.
+
+    Attributes:
+        pages: Pages fetched so far, over all windows.
+        items: Items yielded so far, over all windows.
+    """
+
+    def __init__(self, streams: list[PagedStream], parallel_windows: int = 4):
+        self.streams = streams
+        self.parallel_windows = max(parallel_windows, 1)
+
+    @property
+    def pages(self) -> int:
+        return sum(stream.pages for stream in self.streams)
+
+    @property
+    def items(self) -> int:
+        return sum(stream.items for stream in self.streams)
+
+    @staticmethod
+    def _read_window(stream: PagedStream, closed: threading.Event) -> list[dict]:
+        window_items = []
+        for item in stream:
+            if closed.is_set():
+                break
+            window_items.append(item)
+        return window_items
+
+    def __iter__(self) -> Iterator[dict]:
+        upcoming_streams = iter(self.streams)
+        in_flight: deque[Future] = deque()
+        closed = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.parallel_windows)
+
+        def refill() -> None:
+            while len(in_flight) < self.parallel_windows:
+                stream = next(upcoming_streams, None)
+                if stream is None:
+                    return
+                in_flight.append(executor.submit(self._read_window, stream, closed))
+
+        try:
+            refill()
+            while in_flight:
+                window_items = in_flight.popleft().result()
+                refill()
+                yield from window_items
+        finally:
+            # An abandoned stream must not keep reading windows nobody will consume
+            closed.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def split_date_range(from_date: str, to_date: str, window_days: int) -> list[tuple[str, str]]:
+    """Split the inclusive range [from_date, to_date] (YYYY-MM-DD) into consecutive, non-overlapping windows.
+
+    Args:
+        from_date: First day of the range.
+        to_date: Last day of the range.
+        window_days: Days per window; the last window may be shorter.
+
+    Returns:
+        (fromDate, toDate) pairs, both inclusive.
+    """
+    if window_days <= 0:
+        raise ValueError(f"window_days must be positive, got {window_days}")
+    start, end = date.fromisoformat(from_date), date.fromisoformat(to_date)
+    windows = []
+    while start <= end:
+        window_end = min(start + timedelta(days=window_days - 1), end)
+        windows.append((start.isoformat(), window_end.isoformat()))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def iter_payee_registry(access_token: str, size: int = 20, parallel_pages: int = 1) -> PagedStream:
+    """Return a lazy stream of every payee of the registry, see `PagedStream`.
+
+    Example:
+        stream = iter_payee_registry(token, size=100, parallel_pages=4)
+        payee_ids = {payee["payeeId"] for payee in stream}
+    """
+    return PagedStream(
+        lambda page: get_payee_registry(access_token, page=page, size=size),
+        items_key="payees",
+        parallel_pages=parallel_pages,
+    )
+
+
+def iter_payees_consents(
+    access_token: str,
+    page_size: int = CONSENTS_DEFAULT_PAGE_SIZE,
+    consent: str | None = CONSENTS_DEFAULT_VALUE,
+    from_date: str | None = None,
+    to_date: str | None = None,
+    parallel_pages: int = 1,
+    window_days: int | None = None,
+    parallel_windows: int = 4,
+) -> PagedStream | WindowedStream:
+    """Return a lazy stream of every payee consent in the date range.
+
+    With `window_days` and `from_date` set, the range is split into inclusive sub-windows of that
+    many days, each paged separately, and up to `parallel_windows` windows are fetched at once.
+
+    Args:
+        access_token: Bearer token of the consents client.
+        page_size: Page size of every request.
+        consent: Consent value filter, None for any.
+        from_date: First day (YYYY-MM-DD), None for no lower bound.
+        to_date: Last day (YYYY-MM-DD), today when None.
+        parallel_pages: Pages requested concurrently within a window.
+        window_days: Days per sub-window; None reads the whole range as one listing.
+        parallel_windows: Sub-windows fetched concurrently.
+    """
+
+    def consents_stream(window_from: str | None, window_to: str | None) -> PagedStream:
+        return PagedStream(
+            lambda page: get_payees_consents(
+                access_token,
+                page_number=page,
+                page_size=page_size,
+                consent=consent,
+                from_date=window_from,
+                to_date=window_to,
+            ),
+            parallel_pages=parallel_pages,
+        )
+
+    if not window_days or from_date is None:
+        return consents_stream(from_date, to_date)
+    windows = split_date_range(from_date, get_date_or_default_today(to_date), window_days)
+    return WindowedStream([consents_stream(*window) for window in windows], parallel_windows=parallel_windows)
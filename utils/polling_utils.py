@@ -0,0 +1,92 @@
+"""Polling helper for eventually-consistent platform state.
+
+``wait_until`` repeats an action with exponential backoff and jitter until a predicate over its
+result holds or a deadline passes, and attaches the observed convergence latency to the Allure
+report, so propagation delays can be compared across runs.
+"""
+
+import random
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+import allure
+
+from config.configuration import config
+from utils import json_codec
+
+T = TypeVar("T")
+
+DEFAULT_TIMEOUT_S = config.get("polling_timeout_sec", 30)
+
+
+def _holds(predicate: Callable[[T], bool], value: T) -> bool:
+    try:
+        return bool(predicate(value))
+    except (KeyError, IndexError, TypeError, ValueError):
+        # e.g. a body that is not JSON yet or lacks the awaited field
+        return False
+
+
+def wait_until(
+    action: Callable[[], T],
+    predicate: Callable[[T], bool],
+    description: str,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+    initial_delay_s: float = 0.25,
+    max_delay_s: float = 2.0,
+    backoff_factor: float = 2.0,
+    jitter_ratio: float = 0.2,
+    attach: bool = True,
+) -> T:
+    """Call `action` until `predicate(result)` is true or `timeout_s` elapses.
+
+    Args:
+        action: Zero-argument callable, typically an API call returning a response.
+        predicate: Condition over the action result; exceptions from missing fields count as False.
+        description: Short label of the awaited state, used as the Allure attachment name.
+        timeout_s: Deadline in seconds, measured from the first call.
+        initial_delay_s: Delay before the second attempt.
+        max_delay_s: Upper bound of the delay between attempts.
+        backoff_factor: Multiplier applied to the delay after every attempt.
+        jitter_ratio: Random +/- fraction applied to each delay.
+        attach: When False the convergence summary is not attached to the Allure report, for
+            callers polling many times per test that report an aggregate themselves.
+
+    Returns:
+        The first result satisfying `predicate`, or the last observed result when the deadline
+        passes, so the caller's own assertions report the final state.
+    """
+    started = time.monotonic()
+    deadline = started + timeout_s
+    delay = initial_delay_s
+    attempts = 0
+
+    while True:
+        attempts += 1
+        result = action()
+        converged = _holds(predicate, result)
+        now = time.monotonic()
+        if converged or now >= deadline:
+            break
+        jittered = delay * random.uniform(1 - jitter_ratio, 1 + jitter_ratio)
+        time.sleep(min(jittered, deadline - now))
+        delay = min(delay * backoff_factor, max_delay_s)
+
+    if not attach:
+        return result
+
+    allure.attach(
+        json_codec.dumps_str(
+            {
+                "description": description,
+                "converged": converged,
+                "attempts": attempts,
+                "latencyMs": round((now - started) * 1000, 1),
+                "timeoutS": timeout_s,
+            }
+        ),
+        name=f"Convergence: {description}",
+        attachment_type=allure.attachment_type.JSON,
+    )
+    return result
@@ -0,0 +1,312 @@
+"""Per-hop latency profiler for the RTP send lifecycle.
+
+Runs the same flow as `utils/rtp_send_helpers.py` (token, activation, send via GPD message or
+REST v1/v2, first-visible GET, status settled by the EPC mock callback) N times with a
+configurable concurrency, timestamps every hop and reports p50/p95/p99 per stage, so it is
+possible to tell whether activation, the EPC mock round-trip or read-after-write dominates the
+end-to-end latency.
+
+Run from the repository root:
+
+    python -m utils.rtp_lifecycle_profiler --runs 50 --concurrency 5 --channel rest_v2 --output lifecycle.json
+"""
+
+import argparse
+import math
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import allure
+import requests
+
+from api.auth_api import get_keycloak_access_token, get_valid_access_token
+from api.debtor_activation_api import activate
+from api.RTP_get_api import get_rtp
+from api.RTP_process_sender import send_gpd_message
+from api.RTP_send_api import send_rtp, send_rtp_v2
+from config.configuration import secrets
+from utils.dataset_gpd_message import generate_gpd_message_payload
+from utils.dataset_RTP_data import generate_rtp_data
+from utils.fiscal_code_utils import fake_fc
+from utils.json_codec import dumps_str
+from utils.polling_utils import DEFAULT_TIMEOUT_S, wait_until
+
+STAGES = ("token", "activation", "send", "firstVisible", "terminalStatus", "endToEnd")
+PERCENTILES = (50, 95, 99)
+
+# Statuses reached once the EPC mock has answered, synchronously or through the callback
+TERMINAL_STATUSES = frozenset(
+    {"ACCEPTED", "REJECTED", "USER_ACCEPTED", "USER_REJECTED", "PAID", "EXPIRED", "CANCELLED", "ERROR_SEND"}
+)
+
+
+@dataclass(frozen=True)
+class _Channel:
+    debtor: Callable[[], object]
+    sender: Callable[[], object]
+    service_provider_id: Callable[[], str]
+    payer_id: Callable[[], str]
+
+
+CHANNELS = {
+    "gpd": _Channel(
+        debtor=lambda: secrets.debtor_service_provider,
+        sender=lambda: secrets.rtp_consumer,
+        service_provider_id=lambda: secrets.debtor_service_provider.service_provider_id,
+        payer_id=lambda: secrets.mock_actc_fiscal_code,
+    ),
+    "rest_v1": _Channel(
+        debtor=lambda: secrets.debtor_service_provider,
+        sender=lambda: secrets.creditor_service_provider,
+        service_provider_id=lambda: secrets.debtor_service_provider.service_provider_id,
+        payer_id=lambda: secrets.mock_actc_fiscal_code,
+    ),
+    "rest_v2": _Channel(
+        debtor=lambda: secrets.debtor_service_provider_C,
+        sender=lambda: secrets.creditor_service_provider,
+        service_provider_id=lambda: secrets.debtor_service_provider_C.service_provider_id,
+        payer_id=lambda: secrets.mock_actc_fiscal_code_v2,
+    ),
+}
+
+
+@dataclass
+class LifecycleRun:
+    """Timings of a single lifecycle run, in milliseconds per stage."""
+
+    index: int
+    stages: dict[str, float] = field(default_factory=dict)
+    status: str | None = None
+    failed_stage: str | None = None
+    error: str | None = None
+
+
+def _token(client, fresh: bool) -> str:
+    if not fresh:
+        return get_valid_access_token(
+            client_id=client.client_id,
+            client_secret=client.client_secret,
+            access_token_function=get_keycloak_access_token,
+        )
+    token_response = get_keycloak_access_token(client_id=client.client_id, client_secret=client.client_secret)
+    token_response.raise_for_status()
+    return f"Bearer {token_response.json()['access_token']}"
+
+
+def _send(channel: str, sender_token: str, payer_id: str) -> requests.Response:
+    if channel == "gpd":
+        message_payload = generate_gpd_message_payload(fiscal_code=payer_id, operation="CREATE", status="VALID")
+        return send_gpd_message(access_token=sender_token, message_payload=message_payload)
+    rtp_data = generate_rtp_data(payer_id=payer_id)
+    send_fn = send_rtp_v2 if channel == "rest_v2" else send_rtp
+    return send_fn(access_token=sender_token, rtp_payload=rtp_data)
+
+
+def _resource_id(channel: str, send_response: requests.Response) -> str:
+    if channel == "gpd":
+        return send_response.json()["resourceId"]
+    return send_response.headers["Location"].split("/")[-1]
+
+
+def run_lifecycle(
+    index: int,
+    channel: str = "gpd",
+    random_payer: bool = False,
+    fresh_tokens: bool = False,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+) -> LifecycleRun:
+    """Run one activation -> send -> read lifecycle and time each hop.
+
+    Every stage is measured from the end of the previous one, so the stages add up to `endToEnd`:
+    `firstVisible` is the read-after-write delay of the new RTP and `terminalStatus` the extra time
+    until the EPC mock answer has been applied.
+
+    Args:
+        index: Run number, reported back in the result.
+        channel: "gpd" (GPD message), "rest_v1" or "rest_v2" (REST /rtps).
+        random_payer: Activate a new random fiscal code instead of the channel's ACTC mock payer;
+            the mock then takes its default path, which may never settle.
+        fresh_tokens: Request new tokens from Keycloak instead of using the shared token cache,
+            to include the identity provider round-trip in the `token` stage.
+        timeout_s: Deadline of each polling stage.
+
+    Returns:
+        The run timings; a failing stage is recorded in `failed_stage`/`error` instead of raised.
+    """
+    spec = CHANNELS[channel]
+    run = LifecycleRun(index=index)
+    payer_id = fake_fc() if random_payer else spec.payer_id()
+    started = last = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal last
+        now = time.perf_counter()
+        run.stages[stage] = round((now - last) * 1000, 1)
+        last = now
+
+    stage = "token"
+    try:
+        debtor_token = _token(spec.debtor(), fresh_tokens)
+        sender_token = _token(spec.sender(), fresh_tokens)
+        reader_token = _token(secrets.rtp_reader, fresh_tokens)
+        lap(stage)
+
+        stage = "activation"
+        activation_response = activate(debtor_token, payer_id, spec.service_provider_id())
+        if activation_response.status_code not in (201, 409):
+            raise AssertionError(f"activation returned {activation_response.status_code}")
+        lap(stage)
+
+        stage = "send"
+        send_response = _send(channel, sender_token, payer_id)
+        if send_response.status_code not in (200, 201):
+            raise AssertionError(f"send returned {send_response.status_code}")
+        resource_id = _resource_id(channel, send_response)
+        lap(stage)
+
+        stage = "firstVisible"
+        get_response = wait_until(
+            action=lambda: get_rtp(access_token=reader_token, rtp_id=resource_id),
+            predicate=lambda response: response.status_code == 200,
+            description="RTP visible",
+            timeout_s=timeout_s,
+            attach=False,
+        )
+        if get_response.status_code != 200:
+            raise AssertionError(f"RTP not visible after {timeout_s}s (last GET {get_response.status_code})")
+        lap(stage)
+
+        stage = "terminalStatus"
+        get_response = wait_until(
+            action=lambda: get_rtp(access_token=reader_token, rtp_id=resource_id),
+            predicate=lambda response: response.json()["status"] in TERMINAL_STATUSES,
+            description="RTP settled",
+            timeout_s=timeout_s,
+            attach=False,
+        )
+        run.status = get_response.json().get("status")
+        if run.status not in TERMINAL_STATUSES:
+            raise AssertionError(f"RTP still {run.status} after {timeout_s}s")
+        lap(stage)
+    except (AssertionError, KeyError, ValueError, requests.RequestException) as error:
+        run.failed_stage = stage
+        run.error = f"{type(error).__name__}: {error}"
+        return run
+
+    run.stages["endToEnd"] = round((time.perf_counter() - started) * 1000, 1)
+    return run
+
+
+def percentile(sorted_values: list[float], rank: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    return sorted_values[max(math.ceil(rank / 100 * len(sorted_values)) - 1, 0)]
+
+
+def summarize(runs: list[LifecycleRun]) -> dict:
+    """Aggregate run timings into per-stage count/min/mean/max and p50/p95/p99, in milliseconds."""
+    stages = {}
+    for stage in STAGES:
+        samples = sorted(run.stages[stage] for run in runs if stage in run.stages)
+        if not samples:
+            continue
+        stages[stage] = {
+            "count": len(samples),
+            "min": samples[0],
+            "mean": round(sum(samples) / len(samples), 1),
+            "max": samples[-1],
+            **{f"p{rank}": percentile(samples, rank) for rank in PERCENTILES},
+        }
+
+    failures = [run for run in runs if run.failed_stage]
+    statuses: dict[str, int] = {}
+    for run in runs:
+        if run.status:
+            statuses[run.status] = statuses.get(run.status, 0) + 1
+    return {
+        "runs": len(runs),
+        "failures": len(failures),
+        "statuses": statuses,
+        "stagesMs": stages,
+        "errors": [{"run": run.index, "stage": run.failed_stage, "error": run.error} for run in failures],
+    }
+
+
+def profile_lifecycle(
+    runs: int = 20,
+    concurrency: int = 1,
+    channel: str = "gpd",
+    random_payer: bool = False,
+    fresh_tokens: bool = False,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+    output_path: str | None = None,
+) -> dict:
+    """Repeat the RTP lifecycle `runs` times on `concurrency` threads and report stage percentiles.
+
+    The report is attached to the Allure results as JSON and, when `output_path` is given,
+    written to that file.
+
+    Args:
+        runs: Number of lifecycles to run.
+        concurrency: Number of lifecycles in flight at the same time.
+        channel: "gpd", "rest_v1" or "rest_v2".
+        random_payer: See `run_lifecycle`.
+        fresh_tokens: See `run_lifecycle`.
+        timeout_s: Deadline of each polling stage.
+        output_path: Optional path of the JSON report.
+
+    Returns:
+        The report produced by `summarize`, plus the profiling parameters and wall-clock time.
+    """
+    if channel not in CHANNELS:
+        raise ValueError(f"Unknown channel {channel!r}, expected one of {sorted(CHANNELS)}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        results = list(
+            executor.map(
+                lambda index: run_lifecycle(index, channel, random_payer, fresh_tokens, timeout_s),
+                range(runs),
+            )
+        )
+
+    report = {
+        "channel": channel,
+        "concurrency": concurrency,
+        "wallClockMs": round((time.perf_counter() - started) * 1000, 1),
+        **summarize(results),
+    }
+    body = dumps_str(report, indent=True)
+    allure.attach(body, name=f"RTP lifecycle latency ({channel})", attachment_type=allure.attachment_type.JSON)
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as file:
+            file.write(body)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile per-stage latency of the RTP send lifecycle.")
+    parser.add_argument("--runs", type=int, default=20, help="Number of lifecycles to run")
+    parser.add_argument("--concurrency", type=int, default=1, help="Lifecycles in flight at the same time")
+    parser.add_argument("--channel", choices=sorted(CHANNELS), default="gpd", help="Send channel")
+    parser.add_argument("--random-payer", action="store_true", help="Activate a random payer on every run")
+    parser.add_argument("--fresh-tokens", action="store_true", help="Bypass the token cache")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="Polling deadline per stage (s)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = profile_lifecycle(
+        runs=args.runs,
+        concurrency=args.concurrency,
+        channel=args.channel,
+        random_payer=args.random_payer,
+        fresh_tokens=args.fresh_tokens,
+        timeout_s=args.timeout,
+        output_path=args.output,
+    )
+    print(dumps_str(report, indent=True))
+
+
+if __name__ == "__main__":
+    main()
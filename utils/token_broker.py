@@ -0,0 +1,101 @@
+"""File-locked on-disk token cache shared by every process of the same user.
+
+pytest-xdist workers, behave runs and scripts started in parallel all ask the broker for a token:
+the first process to take the per-token lock fetches it and writes it to disk, the others wait on
+the lock and read it back, so N processes cost one token request per client per expiry window.
+Token files are created with 0600 permissions inside a 0700 directory.
+"""
+
+import hashlib
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from utils import json_codec
+from utils.token_cache import DEFAULT_EXPIRES_IN_S, TokenFetcher, TokenKey
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, tokens are cached per process only
+    fcntl = None
+
+
+class TokenBroker:
+    """Cross-process token store backed by one JSON file and one lock file per token key.
+
+    Args:
+        directory: Directory holding the token and lock files.
+        refresh_margin_s: Tokens expiring within this many seconds are fetched again.
+        enabled: When False, or when file locking is unavailable, fetchers are called directly.
+    """
+
+    def __init__(self, directory: Path, refresh_margin_s: float = 60, enabled: bool = True):
+        self.directory = directory
+        self.refresh_margin_s = refresh_margin_s
+        self.enabled = enabled and fcntl is not None
+        self.disk_hits = 0
+        self.fetches = 0
+
+    def _paths(self, key: TokenKey) -> tuple[Path, Path]:
+        name = hashlib.sha256("\0".join(key).encode()).hexdigest()[:32]
+        return self.directory / f"{name}.json", self.directory / f"{name}.lock"
+
+    @contextmanager
+    def _locked(self, lock_path: Path) -> Iterator[None]:
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        descriptor = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(descriptor, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(descriptor)
+
+    def _read(self, token_path: Path, fingerprint: str) -> tuple[str, float] | None:
+        try:
+            entry = json_codec.loads(token_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        remaining = entry.get("expiresAt", 0) - time.time()
+        if entry.get("fingerprint") != fingerprint or remaining <= self.refresh_margin_s:
+            return None
+        return entry["accessToken"], remaining
+
+    def _write(self, token_path: Path, fingerprint: str, token: str, expires_in: float) -> None:
+        entry = {"fingerprint": fingerprint, "accessToken": token, "expiresAt": time.time() + expires_in}
+        tmp_path = token_path.with_name(f"{token_path.name}.{os.getpid()}.tmp")
+        descriptor = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(json_codec.dumps(entry))
+        os.replace(tmp_path, token_path)
+
+    def get(self, key: TokenKey, fingerprint: str, fetch: TokenFetcher) -> tuple[str, float]:
+        """Return (access_token, remaining lifetime in seconds) from disk, fetching it under the lock if stale.
+
+        Args:
+            key: (client_id, grant_type, realm) identifying the token.
+            fingerprint: Fingerprint of the credential used by `fetch`; entries written with another
+                credential are ignored.
+            fetch: Callable returning (access_token, expires_in) from the identity provider.
+        """
+        if not self.enabled:
+            return fetch()
+
+        token_path, lock_path = self._paths(key)
+        with self._locked(lock_path):
+            cached = self._read(token_path, fingerprint)
+            if cached is not None:
+                self.disk_hits += 1
+                return cached
+            self.fetches += 1
+            token, expires_in = fetch()
+            self._write(token_path, fingerprint, token, float(expires_in or DEFAULT_EXPIRES_IN_S))
+            return token, float(expires_in or DEFAULT_EXPIRES_IN_S)
+
+    def fetcher(self, key: TokenKey, fingerprint: str, fetch: TokenFetcher) -> TokenFetcher:
+        """Wrap `fetch` so that a TokenCache miss or refresh goes through the broker first."""
+        return lambda: self.get(key, fingerprint, fetch)
+
+    def stats(self) -> dict:
+        return {"diskHits": self.disk_hits, "fetches": self.fetches}
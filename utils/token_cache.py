@@ -0,0 +1,162 @@
+"""Process-wide cache of OAuth access tokens with proactive background refresh."""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+TokenKey = tuple[str, str, str]
+# A fetcher returns the raw access token and its lifetime in seconds (`expires_in`)
+TokenFetcher = Callable[[], tuple[str, float]]
+
+DEFAULT_EXPIRES_IN_S = 300
+
+
+def secret_fingerprint(secret: str) -> str:
+    """Return a short, non-reversible fingerprint of a client secret.
+
+    Args:
+        secret: The client secret (or any credential) the token was obtained with.
+
+    Returns:
+        The first 16 hex characters of the secret's SHA-256 digest.
+    """
+    return hashlib.sha256(secret.encode()).hexdigest()[:16]
+
+
+@dataclass
+class _CachedToken:
+    value: str
+    expires_at: float
+    fingerprint: str
+    fetch: TokenFetcher
+    timer: threading.Timer | None = None
+
+
+class TokenCache:
+    """Thread-safe token cache keyed by (client_id, grant_type, realm).
+
+    Tokens are kept until `expires_in - refresh_margin_s` and re-fetched in a background thread at
+    that point, so callers keep getting a valid token without waiting for the identity provider.
+    A token whose refresh failed is still served until it really expires, then fetched again on
+    the next call. Concurrent misses for the same key trigger a single request.
+
+    Args:
+        refresh_margin_s: Seconds before expiry at which the token is refreshed.
+        enabled: When False every call goes straight to the fetcher.
+    """
+
+    def __init__(self, refresh_margin_s: float = 60, enabled: bool = True):
+        self.refresh_margin_s = refresh_margin_s
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self._tokens: dict[TokenKey, _CachedToken] = {}
+        self._key_locks: dict[TokenKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _valid_token(self, key: TokenKey, fingerprint: str) -> str | None:
+        cached = self._tokens.get(key)
+        if cached and cached.fingerprint == fingerprint and time.monotonic() < cached.expires_at:
+            return cached.value
+        return None
+
+    def get(self, key: TokenKey, fingerprint: str, fetch: TokenFetcher) -> str:
+        """Return the cached token for `key`, fetching it on a miss.
+
+        Args:
+            key: (client_id, grant_type, realm) identifying the token.
+            fingerprint: Fingerprint of the credential used by `fetch`; a different credential
+                for the same key is a miss, so a wrong secret never receives a cached token.
+            fetch: Callable returning (access_token, expires_in) from the identity provider.
+
+        Returns:
+            The raw access token.
+        """
+        if not self.enabled:
+            return fetch()[0]
+
+        with self._lock:
+            token = self._valid_token(key, fingerprint)
+            if token is not None:
+                self.hits += 1
+                return token
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                token = self._valid_token(key, fingerprint)
+                if token is not None:
+                    self.hits += 1
+                    return token
+                self.misses += 1
+            token, expires_in = fetch()
+            self._store(key, fingerprint, fetch, token, expires_in)
+            return token
+
+    async def aget(self, key: TokenKey, fingerprint: str, fetch: TokenFetcher) -> str:
+        """Asyncio variant of `get`; a miss runs the blocking fetch in a worker thread."""
+        with self._lock:
+            token = self._valid_token(key, fingerprint) if self.enabled else None
+            if token is not None:
+                self.hits += 1
+                return token
+        return await asyncio.to_thread(self.get, key, fingerprint, fetch)
+
+    def _store(self, key: TokenKey, fingerprint: str, fetch: TokenFetcher, token: str, expires_in: float) -> None:
+        lifetime = float(expires_in or DEFAULT_EXPIRES_IN_S)
+        refresh_in = max(lifetime - self.refresh_margin_s, lifetime / 2)
+        timer = threading.Timer(refresh_in, self._refresh, args=(key,))
+        timer.daemon = True
+        with self._lock:
+            previous = self._tokens.get(key)
+            if previous and previous.timer:
+                previous.timer.cancel()
+            self._tokens[key] = _CachedToken(token, time.monotonic() + lifetime, fingerprint, fetch, timer)
+        timer.start()
+
+    def _refresh(self, key: TokenKey) -> None:
+        with self._lock:
+            cached = self._tokens.get(key)
+        if cached is None:
+            return
+        try:
+            token, expires_in = cached.fetch()
+        except Exception:
+            with self._lock:
+                self.refresh_failures += 1
+            return
+        with self._lock:
+            self.refreshes += 1
+        self._store(key, cached.fingerprint, cached.fetch, token, expires_in)
+
+    def invalidate(self, key: TokenKey) -> None:
+        with self._lock:
+            cached = self._tokens.pop(key, None)
+        if cached and cached.timer:
+            cached.timer.cancel()
+
+    def clear(self) -> None:
+        with self._lock:
+            tokens = list(self._tokens.values())
+            self._tokens.clear()
+        for cached in tokens:
+            if cached.timer:
+                cached.timer.cancel()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the number of cached tokens."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "refreshFailures": self.refresh_failures,
+                "cachedTokens": len(self._tokens),
+            }